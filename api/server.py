@@ -0,0 +1,369 @@
+"""
+Headless HTTP API - employee search, prepopulation, batched plan saves and deck generation for
+other internal tools, on asyncio streams from the standard library (no web framework)
+
+Endpoints (JSON unless noted):
+  GET  /health
+  GET  /employees?q=<term>               search (same routing as the app's search box)
+  GET  /employees/<id>
+  GET  /prepopulate/incumbent/<id>       latest saved plan details, or null
+  GET  /prepopulate/successor/<id>       latest saved assessment, or null
+  POST /plans     {"plans": [{"incumbent_id", "plan_details", "successors": [{"employee_id", "assessment"}]}]}
+                  every valid plan goes to the group-commit writer at once; returns RECORD_IDs and an
+                  unchanged flag, errors, or pending (still committing after result_timeout) per plan
+                  (status 400 when any plan was not saved, 202 when some are only pending)
+  POST /decks     {"incumbent": {"employee_id", "plan_details"}, "successors": [...]} -> PPTX, streamed chunked
+
+Connections are HTTP/1.1 keep-alive. Blocking work runs on a bounded thread pool; a semaphore caps
+requests in flight and a smaller one caps deck builds, and a request that cannot get a slot within
+api.queue_timeout_seconds gets 503 with Retry-After.
+
+CLI: python -m api.server [--host HOST] [--port PORT]
+"""
+
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit, parse_qs
+from config.loader import CONFIG
+from database.operations import (
+    search_employees, get_employee, get_latest_incumbent_values, get_latest_successor_values,
+    get_plan_writer, insert_plan, ensure_database_schema
+)
+from database.records import employee_to_dict
+from database.recommendations import refresh_successor_features
+from database.writer import WriterBusyError
+from utils.validation import validate_plan_details, validate_assessment
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+           500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class Request:
+    def __init__(self, method, target, headers, body):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path.rstrip('/') or '/'
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        """The body as a JSON object (400 for anything else)"""
+        try:
+            body = json.loads(self.body or b'{}')
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON body: {e}")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "JSON body must be an object")
+        return body
+
+    @property
+    def keep_alive(self):
+        return self.headers.get('connection', '').lower() != 'close'
+
+async def read_request(reader, max_body):
+    """Parse one HTTP/1.1 request; returns None when the client closed the connection"""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length') or 0)
+    except ValueError:
+        raise HTTPError(400, f"Invalid Content-Length: {headers['content-length']!r}")
+    if length < 0:
+        raise HTTPError(400, f"Invalid Content-Length: {length}")
+    if length > max_body:
+        raise HTTPError(413, f"Request body over {max_body} bytes")
+    body = await reader.readexactly(length) if length else b''
+    return Request(method.upper(), target, headers, body)
+
+def _head(status, headers):
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"] + [f"{name}: {value}" for name, value in headers.items()]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+async def send_json(writer, status, payload, keep_alive=True, headers=None):
+    body = json.dumps(payload, default=str).encode('utf-8')
+    writer.write(_head(status, {
+        'Content-Type': 'application/json', 'Content-Length': len(body),
+        'Connection': 'keep-alive' if keep_alive else 'close', **(headers or {}),
+    }) + body)
+    await writer.drain()
+
+async def send_stream(writer, content_type, chunks, filename=None, keep_alive=True):
+    """Chunked transfer encoding: each chunk is written and drained as it comes"""
+    headers = {'Content-Type': content_type, 'Transfer-Encoding': 'chunked',
+               'Connection': 'keep-alive' if keep_alive else 'close'}
+    if filename:
+        headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    writer.write(_head(200, headers))
+    for chunk in chunks:
+        if chunk:
+            writer.write(f"{len(chunk):X}\r\n".encode('ascii') + chunk + b'\r\n')
+            await writer.drain()
+    writer.write(b'0\r\n\r\n')
+    await writer.drain()
+
+def _employee_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"Invalid employee id: {value!r}")
+
+class PlanAPI:
+    def __init__(self, settings=None):
+        self.settings = settings or CONFIG['api']
+        self.executor = ThreadPoolExecutor(max_workers=self.settings['worker_threads'], thread_name_prefix="api")
+        self.requests = asyncio.Semaphore(self.settings['max_concurrent_requests'])
+        self.decks = asyncio.Semaphore(self.settings['max_concurrent_decks'])
+        self.routes = [
+            ('GET', ('health',), self.health),
+            ('GET', ('employees',), self.search),
+            ('GET', ('employees', None), self.employee),
+            ('GET', ('prepopulate', 'incumbent', None), self.prepopulate_incumbent),
+            ('GET', ('prepopulate', 'successor', None), self.prepopulate_successor),
+            ('POST', ('plans',), self.save_plans),
+            ('POST', ('decks',), self.deck),
+        ]
+
+    def run_blocking(self, function, *args, **kwargs):
+        return asyncio.get_running_loop().run_in_executor(self.executor, partial(function, *args, **kwargs))
+
+    async def _acquire(self, semaphore):
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.settings['queue_timeout_seconds'])
+        except asyncio.TimeoutError:
+            raise HTTPError(503, "Server busy - retry shortly", {'Retry-After': '1'})
+
+    def _route(self, request):
+        parts = tuple(part for part in request.path.split('/') if part)
+        allowed = False
+        for method, pattern, handler in self.routes:
+            if len(pattern) == len(parts) and all(p is None or p == part for p, part in zip(pattern, parts)):
+                if method == request.method:
+                    return handler, [part for p, part in zip(pattern, parts) if p is None]
+                allowed = True
+        raise HTTPError(405 if allowed else 404, f"{request.method} {request.path} is not supported")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        read_request(reader, self.settings['max_body_bytes']), timeout=self.settings['keep_alive_seconds']
+                    )
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HTTPError as e:
+                    await send_json(writer, e.status, {'error': str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                await self.dispatch(request, writer)
+                if not request.keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def dispatch(self, request, writer):
+        try:
+            handler, args = self._route(request)
+            await self._acquire(self.requests)
+            try:
+                await handler(request, writer, *args)
+            finally:
+                self.requests.release()
+        except HTTPError as e:
+            await send_json(writer, e.status, {'error': str(e)}, request.keep_alive, e.headers)
+        except ConnectionError:
+            pass
+        except Exception as e:
+            print(f"❌ API error on {request.method} {request.path}: {e}")
+            await send_json(writer, 500, {'error': str(e)}, request.keep_alive)
+
+    async def health(self, request, writer):
+        await send_json(writer, 200, {'status': 'ok'}, request.keep_alive)
+
+    async def search(self, request, writer):
+        term = request.query.get('q', '').strip()
+        if len(term) < CONFIG['validation']['min_search_length']:
+            raise HTTPError(400, f"q must be at least {CONFIG['validation']['min_search_length']} characters")
+        employees = await self.run_blocking(search_employees, term)
+        await send_json(writer, 200, {'employees': [employee_to_dict(e) for e in employees]}, request.keep_alive)
+
+    async def employee(self, request, writer, employee_id):
+        employee = await self.run_blocking(get_employee, _employee_id(employee_id))
+        if employee is None:
+            raise HTTPError(404, f"No employee {employee_id}")
+        await send_json(writer, 200, employee_to_dict(employee), request.keep_alive)
+
+    async def prepopulate_incumbent(self, request, writer, employee_id):
+        values = await self.run_blocking(get_latest_incumbent_values, _employee_id(employee_id))
+        await send_json(writer, 200, {'plan_details': values}, request.keep_alive)
+
+    async def prepopulate_successor(self, request, writer, employee_id):
+        values = await self.run_blocking(get_latest_successor_values, _employee_id(employee_id))
+        await send_json(writer, 200, {'assessment': values}, request.keep_alive)
+
+    def _resolve_plan(self, plan):
+        """(incumbent, plan_details, [(successor, assessment)]) or a list of errors"""
+        if not isinstance(plan, dict):
+            return ["Plan must be an object."]
+        plan_details = plan.get('plan_details') or {}
+        successors = plan.get('successors') or []
+        errors = [f"Incumbent: {error}" for error in validate_plan_details(plan_details)]
+        incumbent = get_employee(plan.get('incumbent_id')) if str(plan.get('incumbent_id', '')).isdigit() else None
+        if incumbent is None:
+            errors.append(f"Unknown incumbent_id: {plan.get('incumbent_id')!r}")
+        if not successors:
+            errors.append("At least one successor is required.")
+        resolved = []
+        for position, successor in enumerate(successors, 1):
+            successor = successor if isinstance(successor, dict) else {}
+            assessment = successor.get('assessment') or {}
+            errors += [f"Successor {position}: {error}" for error in validate_assessment(assessment)]
+            employee = get_employee(successor.get('employee_id')) if str(successor.get('employee_id', '')).isdigit() else None
+            if employee is None:
+                errors.append(f"Successor {position}: unknown employee_id {successor.get('employee_id')!r}")
+            resolved.append((employee, assessment))
+        return errors or (incumbent, plan_details, resolved)
+
+    async def save_plans(self, request, writer):
+        plans = request.json().get('plans')
+        if not isinstance(plans, list) or not plans:
+            raise HTTPError(400, "Body must be {\"plans\": [...]}")
+        if len(plans) > self.settings['max_plans_per_request']:
+            raise HTTPError(413, f"At most {self.settings['max_plans_per_request']} plans per request")
+
+        resolved = await self.run_blocking(lambda: [self._resolve_plan(plan) for plan in plans])
+        results = [{'errors': r} if isinstance(r, list) else None for r in resolved]
+        plan_writer = get_plan_writer()
+        timeout = CONFIG['database']['writer']['submit_timeout']
+        # Submit every valid plan before waiting so they share the writer's group commits
+        pending = []
+        for position, plan in enumerate(resolved):
+            if isinstance(plan, list):
+                continue
+            incumbent, plan_details, successors = plan
+            job = partial(insert_plan, incumbent_data=incumbent, plan_details=plan_details, successors=successors)
+            try:
+                future = await self.run_blocking(plan_writer.submit, job, timeout)
+            except WriterBusyError as e:
+                results[position] = {'errors': [str(e)]}
+                continue
+            pending.append((position, future))
+        for position, future in pending:
+            try:
+                saved = await asyncio.wait_for(
+                    asyncio.wrap_future(future), timeout=CONFIG['database']['writer']['result_timeout'])
+            except asyncio.TimeoutError:
+                # wait_for cancels the job if the writer has not started it; otherwise it still commits
+                results[position] = (
+                    {'errors': ["Save timed out before it started - nothing was saved"]} if future.cancelled()
+                    else {'pending': True}
+                )
+                continue
+            except Exception as e:
+                results[position] = {'errors': [f"Save failed: {e}"]}
+                continue
+            results[position] = {'record_ids': saved.record_ids, 'unchanged': saved.unchanged}
+            if saved.unchanged:
+                continue
+            # Keep the recommendation features current, as the app's save does
+            await self.run_blocking(refresh_successor_features, [
+                (successor.EMPLOYEE_ID, assessment['top_skills'], assessment['top_ple'])
+                for successor, assessment in resolved[position][2]
+            ])
+        if all('record_ids' in result for result in results):
+            status = 200
+        else:
+            status = 400 if any('errors' in result for result in results) else 202
+        await send_json(writer, status, {'results': results}, request.keep_alive)
+
+    async def deck(self, request, writer):
+        from pptx_gen.simple_text_generator import create_succession_plan_from_template
+
+        body = request.json()
+        incumbent, successors = body.get('incumbent'), body.get('successors')
+        if not isinstance(incumbent, dict) or not isinstance(successors, list) or not successors:
+            raise HTTPError(400, "Body must have an incumbent and a non-empty successors list")
+        if not all(isinstance(successor, dict) for successor in successors):
+            raise HTTPError(400, "Each successor must be an object")
+        people = [incumbent] + successors
+        unknown = await self.run_blocking(lambda: [
+            person.get('employee_id') for person in people
+            if not str(person.get('employee_id', '')).isdigit() or get_employee(person['employee_id']) is None
+        ])
+        if unknown:
+            raise HTTPError(400, f"Unknown employee_id(s): {', '.join(map(repr, unknown))}")
+        # Same rules as saving, so the generator only ever sees complete plans
+        errors = [f"Incumbent: {error}" for error in validate_plan_details(incumbent.get('plan_details'))]
+        for position, successor in enumerate(successors, 1):
+            errors += [f"Successor {position}: {error}" for error in validate_assessment(successor.get('assessment'))]
+        if errors:
+            await send_json(writer, 400, {'error': "Invalid plan", 'errors': errors}, request.keep_alive)
+            return
+        await self._acquire(self.decks)
+        try:
+            buffer = await self.run_blocking(create_succession_plan_from_template, incumbent, successors)
+        finally:
+            self.decks.release()
+        chunk_size = self.settings['stream_chunk_bytes']
+        buffer.seek(0)
+        await send_stream(
+            writer, 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+            iter(partial(buffer.read, chunk_size), b''), f"succession_plan_{incumbent.get('employee_id')}.pptx",
+            request.keep_alive
+        )
+
+async def start_server(host=None, port=None):
+    """Listening asyncio server for the API (port 0 picks a free port)"""
+    settings = CONFIG['api']
+    api = PlanAPI(settings)
+    return await asyncio.start_server(
+        api.handle_connection, host or settings['host'], settings['port'] if port is None else port
+    )
+
+async def serve(host=None, port=None):
+    server = await start_server(host, port)
+    addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"✅ Succession plan API listening on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    """CLI: python -m api.server [--host HOST] [--port PORT]"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    options = {}
+    for flag in ('--host', '--port'):
+        if flag in argv:
+            position = argv.index(flag)
+            options[flag] = argv[position + 1]
+            del argv[position:position + 2]
+    ensure_database_schema()
+    try:
+        asyncio.run(serve(options.get('--host'), int(options['--port']) if '--port' in options else None))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,26 @@
 """
 Configuration loader for YAML config file
+
+CONFIG is a read-only mapping over the current, validated config.yaml. Queries are formatted with
+the table names and limits once per load (CONFIG.query(name)). The file's mtime is polled at most
+every hot_reload.poll_seconds; an edited file is loaded, validated and swapped in as a whole, and a
+file that fails to load or validate is reported and the running config kept.
 """
 
-import yaml
+import copy
 import os
+import threading
+import time
+from collections.abc import Mapping
+import yaml
 
-def load_config():
-    """Load configuration from YAML file"""
-    config_path = os.path.join(os.path.dirname(__file__), 'config.yaml')
-    
-    try:
-        with open(config_path, 'r', encoding='utf-8') as file:
-            config = yaml.safe_load(file)
-        return config
-    except Exception as e:
-        print(f"Error loading config: {e}")
-        # Return default config if file can't be loaded
-        return get_default_config()
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.yaml')
+
+class ConfigError(Exception):
+    """config.yaml could not be loaded or is missing required settings"""
 
 def get_default_config():
-    """Fallback default configuration"""
+    """Fallback values for settings config.yaml leaves out (queries and tool sections have none)"""
     return {
         'skills': [
             "Thinks Strategically", "Plans and Prioritizes", "Ensures Accountability",
@@ -35,22 +36,208 @@ def get_default_config():
             "Demonstrate Care and Compassion",
             "Create an Environment Where Disney Values are Experienced"
         ],
+        'form_options': {},
         'database': {
             'employee_db': 'succession_db.sqlite',
-            'succession_plans_db': 'succession_plans.sqlite'
+            'succession_plans_db': 'succession_plans.sqlite',
+            'limits': {'employee_search': 50, 'fuzzy_candidates': 200, 'fuzzy_max_distance': 2},
         },
         'ui': {
             'page_title': 'Succession Planning Tool',
             'layout': 'wide',
             'logo_path': 'people_insights_logo.png',
             'logo_width': 100
-        }
+        },
+        'avatar': {
+            'default_width': 50,
+            'url_template': "https://rostr.disney.com/api/v2/people/{employee_id}/avatars/thumbnail_large",
+        },
+        'powerpoint': {
+            'template_file': 'succession_profile_template.pptx',
+            'successors_per_slide': 3,
+            'auto_repair': True,
+            'repair_method': 'standard',
+            'font_family': 'Calibri',
+            'fallback_font': 'DejaVuSans.ttf',
+            'content_font_size': 12,
+            'min_font_size': 8,
+            'preview_width_px': 1280,
+            'packaging': {
+                'enabled': True, 'compress_level': 6, 'strip_unused': True,
+                'store_extensions': ['png', 'jpg', 'jpeg', 'gif', 'tif', 'tiff', 'wdp', 'mp3', 'm4a', 'mp4', 'mov', 'wmv', 'zip'],
+            },
+        },
+        'validation': {'min_search_length': 2, 'max_search_results': 50, 'max_skills_selection': 3},
+        'hot_reload': {'enabled': True, 'poll_seconds': 2},
     }
 
-# Load config once when module is imported
-CONFIG = load_config()
+# Settings every load must end up with (after defaults): dotted path -> type
+REQUIRED_SETTINGS = {
+    'skills': list,
+    'ple_options': list,
+    'form_options': dict,
+    'database.employee_db': str,
+    'database.succession_plans_db': str,
+    'database.tables': dict,
+    'database.limits.employee_search': int,
+    'database.limits.fuzzy_candidates': int,
+    'database.limits.fuzzy_max_distance': int,
+    'database.writer': dict,
+    'queries': dict,
+    'ui.page_title': str,
+    'ui.logo_width': int,
+    'avatar.url_template': str,
+    'powerpoint.template_file': str,
+    'powerpoint.successors_per_slide': int,
+    'validation.max_skills_selection': int,
+    'hot_reload.poll_seconds': (int, float),
+}
+
+def _merge(defaults, values):
+    """defaults overlaid with values, recursively for nested dicts"""
+    merged = copy.deepcopy(defaults)
+    for key, value in (values or {}).items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+def validate_config(data):
+    """Error messages for missing or mistyped required settings (empty list when valid)"""
+    errors = []
+    for path, expected in REQUIRED_SETTINGS.items():
+        value = data
+        for key in path.split('.'):
+            value = value.get(key) if isinstance(value, dict) else None
+        if value is None:
+            errors.append(f"{path} is missing")
+        elif not isinstance(value, expected) or isinstance(value, bool) and expected is int:
+            errors.append(f"{path} should be {getattr(expected, '__name__', 'a number')}, got {type(value).__name__}")
+    for key, name in (data.get('database', {}).get('tables') or {}).items():
+        if not isinstance(name, str) or not name.isidentifier():
+            errors.append(f"database.tables.{key} is not a valid table name: {name!r}")
+    return errors
+
+def compile_queries(data):
+    """Every configured query with {<key>_table}, {search_limit} and {candidate_limit} filled in"""
+    tables = data['database']['tables']
+    limits = data['database']['limits']
+    values = {f"{key}_table": name for key, name in tables.items()}
+    values.update(search_limit=int(limits['employee_search']), candidate_limit=int(limits['fuzzy_candidates']))
+    queries, errors = {}, []
+    for name, text in data['queries'].items():
+        try:
+            queries[name] = text.format(**values)
+        except (KeyError, IndexError, ValueError, AttributeError) as e:
+            errors.append(f"queries.{name}: cannot fill placeholder {e}")
+    if errors:
+        raise ConfigError('; '.join(errors))
+    return queries
+
+class Config(Mapping):
+    """One validated version of config.yaml - read like the parsed dict, plus pre-formatted queries"""
+
+    def __init__(self, data, mtime=None):
+        self._data = data
+        self.mtime = mtime
+        self.queries = compile_queries(data)
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def query(self, name):
+        """Pre-formatted SQL for a configured query"""
+        return self.queries[name]
+
+def load_config(path=CONFIG_PATH):
+    """Load, default and validate config.yaml; raises ConfigError instead of returning a partial config"""
+    try:
+        mtime = os.path.getmtime(path)
+        with open(path, 'r', encoding='utf-8') as file:
+            loaded = yaml.safe_load(file) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise ConfigError(f"Cannot read {path}: {e}")
+    if not isinstance(loaded, dict):
+        raise ConfigError(f"{path} does not contain a mapping")
+    data = _merge(get_default_config(), loaded)
+    errors = validate_config(data)
+    if errors:
+        raise ConfigError(f"Invalid {path}: {'; '.join(errors)}")
+    return Config(data, mtime)
+
+class ReloadingConfig(Mapping):
+    """The current Config, replaced atomically when config.yaml changes on disk
+
+    Lookups poll the file's mtime at most every hot_reload.poll_seconds. Take current() once
+    when several settings must come from the same version.
+    """
+
+    def __init__(self, path=CONFIG_PATH):
+        self.path = path
+        self._current = load_config(path)
+        self._failed_mtime = None
+        self._next_check = time.monotonic() + self._current['hot_reload']['poll_seconds']
+        self._lock = threading.Lock()
+
+    def current(self):
+        if time.monotonic() >= self._next_check and self._current['hot_reload'].get('enabled', True):
+            self._maybe_reload()
+        return self._current
+
+    def _maybe_reload(self):
+        if not self._lock.acquire(blocking=False):
+            return  # another thread is already checking
+        try:
+            self._next_check = time.monotonic() + self._current['hot_reload']['poll_seconds']
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                return
+            if mtime in (self._current.mtime, self._failed_mtime):
+                return
+            try:
+                self._current = load_config(self.path)
+                print(f"✅ Reloaded configuration from {self.path}")
+            except ConfigError as e:
+                self._failed_mtime = mtime
+                print(f"❌ Keeping the running configuration: {e}")
+        finally:
+            self._lock.release()
+
+    def reload(self):
+        """Load the file now (raises ConfigError and keeps the running config if it is invalid)"""
+        with self._lock:
+            self._current = load_config(self.path)
+        return self._current
+
+    def __getitem__(self, key):
+        return self.current()[key]
+
+    def __iter__(self):
+        return iter(self.current())
+
+    def __len__(self):
+        return len(self.current())
+
+    def query(self, name):
+        return self.current().query(name)
+
+# Load config once when module is imported; later edits are picked up by polling
+CONFIG = ReloadingConfig()
+
+# Commonly used option lists, read from the current config on every call so edits show up live
+def skills_list():
+    return CONFIG['skills']
+
+def ple_list():
+    return CONFIG['ple_options']
 
-# Export commonly used values for easy access
-SKILLS_LIST = CONFIG['skills']
-PLE_LIST = CONFIG['ple_options']
-FORM_OPTIONS = CONFIG.get('form_options', {})
+def form_options():
+    return CONFIG['form_options']
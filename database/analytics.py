@@ -0,0 +1,73 @@
+"""
+Plan analytics - reads the rollups in plan_attribute_counts (never the raw plans), which count each
+incumbent's latest plan
+"""
+
+import sqlite3
+import pandas as pd
+from config.loader import CONFIG, skills_list, ple_list
+from database.operations import format_query
+
+ROLLUP_COLUMNS = ['VALUE', 'SEGMENT', 'READINESS', 'READINESS_TIMING', 'PLAN_COUNT']
+
+def load_attribute_counts(role, attribute):
+    """Rollup rows for role 'incumbent'/'successor' and attribute 'total'/'skill'/'ple' as a DataFrame"""
+    conn = sqlite3.connect(CONFIG['database']['succession_plans_db'])
+    try:
+        rows = conn.execute(format_query('get_plan_attribute_counts'), (role, attribute)).fetchall()
+    finally:
+        conn.close()
+    return pd.DataFrame(rows, columns=ROLLUP_COLUMNS)
+
+def filter_counts(counts, segments=None, readiness=None):
+    """Restrict rollup rows to the selected segments / readiness levels (None or empty = all)"""
+    if segments:
+        counts = counts[counts['SEGMENT'].isin(segments)]
+    if readiness:
+        counts = counts[counts['READINESS'].isin(readiness)]
+    return counts
+
+def counts_by_value(counts, values, by=None):
+    """Sum PLAN_COUNT per value, listing every configured value (zero when never chosen)
+
+    With by='READINESS' (or another rollup column) the result has one column per group.
+    """
+    if by is None:
+        totals = counts.groupby('VALUE')['PLAN_COUNT'].sum()
+        return totals.reindex(values, fill_value=0).rename('Count').to_frame()
+    pivot = counts.pivot_table(index='VALUE', columns=by, values='PLAN_COUNT', aggfunc='sum', fill_value=0)
+    return pivot.reindex(values, fill_value=0)
+
+def skill_counts(role, segments=None, readiness=None, by=None):
+    """How often each configured skill was listed for incumbents or successors"""
+    return counts_by_value(filter_counts(load_attribute_counts(role, 'skill'), segments, readiness), skills_list(), by)
+
+def ple_counts(role, segments=None, readiness=None, by=None):
+    """How often each configured PLE option was chosen for incumbents or successors"""
+    return counts_by_value(filter_counts(load_attribute_counts(role, 'ple'), segments, readiness), ple_list()[1:], by)
+
+def readiness_by_segment(segments=None):
+    """Successor lines per segment and readiness level"""
+    counts = filter_counts(load_attribute_counts('successor', 'total'), segments)
+    return counts.pivot_table(index='SEGMENT', columns='READINESS', values='PLAN_COUNT', aggfunc='sum', fill_value=0)
+
+def readiness_timing_counts(segments=None):
+    """'Ready Future' successor lines per readiness timing"""
+    counts = filter_counts(load_attribute_counts('successor', 'total'), segments, ['Ready Future'])
+    return counts.groupby('READINESS_TIMING')['PLAN_COUNT'].sum().rename('Count').to_frame()
+
+def segment_options():
+    """Segments that appear in any saved plan"""
+    return sorted(value for value in load_attribute_counts('incumbent', 'total')['SEGMENT'].unique() if value)
+
+def load_bench_strength():
+    """Bench strength rollup rows (latest plan per incumbent) as a DataFrame"""
+    conn = sqlite3.connect(CONFIG['database']['succession_plans_db'])
+    try:
+        cursor = conn.execute(format_query('get_bench_strength'))
+        columns = [column[0] for column in cursor.description]
+        frame = pd.DataFrame(cursor.fetchall(), columns=columns)
+    finally:
+        conn.close()
+    frame['CRITICAL_ROLE'] = frame['CRITICAL_ROLE'].astype(bool)
+    return frame
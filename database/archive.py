@@ -0,0 +1,217 @@
+"""
+Plan archival - moves old and superseded plans out of succession_plans.sqlite into one SQLite file
+per fiscal year, so the hot file, its indexes and its backups only carry current data
+
+A plan is archived when a newer version of it exists and it was created before the cutoff (or, with
+archive.superseded, at any time). An incumbent's latest plan always stays in the hot file: saves
+number the next version from it and prepopulation reads it. Candidates are paged by (CREATED_AT,
+rowid), so each batch resumes where the last one stopped instead of rescanning. Each batch is one short BEGIN IMMEDIATE transaction: rows are copied into
+the attached archive, then deleted from the hot tables children first, with an 'archived' change feed entry per plan and a bench refresh per incumbent. Copies
+are idempotent, so a batch interrupted between the two files is simply repeated on the next run.
+
+Historical queries use connect_with_archives(), which attaches every archive file and creates
+temp views <table>_all (e.g. succession_plans_all) over the hot and archived rows.
+
+CLI: python -m database.archive [--before "2023-01-01"] [--max-batches N]
+"""
+
+import glob
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from config.loader import CONFIG
+from database.bench import refresh_incumbent_bench
+from database.change_feed import record_plan_change
+from database.migrations import create_plan_schema, create_plan_compat_view
+from database.queries import format_query
+
+# Copy order: parents before children; deletes run in reverse
+ARCHIVE_TABLES = ('plan', 'plan_skill', 'plan_sourcing', 'plan_successor', 'plan_successor_skill')
+UNION_TABLES = ('succession_plans', 'plan', 'plan_successor')
+
+def fiscal_year(created_at, start_month=None):
+    """Fiscal year of a CREATED_AT timestamp, named for the calendar year it ends in"""
+    start_month = start_month or CONFIG['archive']['fiscal_year_start_month']
+    year, month = int(created_at[:4]), int(created_at[5:7])
+    return year + 1 if start_month > 1 and month >= start_month else year
+
+def archive_path(year):
+    settings = CONFIG['archive']
+    return os.path.join(settings['directory'], settings['file_pattern'].format(fiscal_year=year))
+
+def archive_files():
+    """{fiscal year: path} of the archive files that exist"""
+    settings = CONFIG['archive']
+    pattern = re.escape(settings['file_pattern']).replace(re.escape('{fiscal_year}'), r'(\d{4})')
+    files = {}
+    for path in glob.glob(os.path.join(settings['directory'], '*')):
+        match = re.fullmatch(pattern, os.path.basename(path))
+        if match:
+            files[int(match.group(1))] = path
+    return dict(sorted(files.items()))
+
+def _prepare_archive(path, tables, plan_columns):
+    """Create the plan tables and compatibility view in a new archive file
+
+    Versions are indexed but not unique here: archives written before latest plans were kept hot
+    can hold a version chain that restarted at 1.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (tables['plan'],)).fetchone():
+            return
+        create_plan_schema(conn, tables)
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({tables['plan']})")}
+        for column, column_type in plan_columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {tables['plan']} ADD COLUMN {column} {column_type}")
+        conn.execute(f"CREATE INDEX IDX_PLAN_INCUMBENT_VERSION ON {tables['plan']}(INCUMBENT_EMPLOYEE_ID, PLAN_VERSION)")
+        create_plan_compat_view(conn, tables)
+        conn.commit()
+    finally:
+        conn.close()
+
+def _copy_and_delete(conn, tables, alias, columns):
+    """Copy the batch rows of one fiscal year into alias, then delete them from main (children first)"""
+    batch_plans = "SELECT PLAN_ID FROM temp.archive_batch WHERE FISCAL_YEAR = ?"
+    batch_lines = f"SELECT RECORD_ID FROM main.{tables['plan_successor']} WHERE PLAN_ID IN ({batch_plans})"
+    filters = {key: f"PLAN_ID IN ({batch_plans})" for key in ARCHIVE_TABLES}
+    filters['plan_successor_skill'] = f"RECORD_ID IN ({batch_lines})"
+    year = int(alias[2:])
+
+    for key in ARCHIVE_TABLES:
+        column_list = ', '.join(columns[key])
+        conn.execute(
+            f"INSERT INTO {alias}.{tables[key]} ({column_list}) SELECT {column_list} FROM main.{tables[key]} "
+            f"WHERE {filters[key]} ON CONFLICT DO NOTHING", (year,)
+        )
+    copied = conn.execute(f"SELECT COUNT(*) FROM {alias}.{tables['plan']} WHERE {filters['plan']}", (year,)).fetchone()[0]
+    expected = conn.execute("SELECT COUNT(*) FROM temp.archive_batch WHERE FISCAL_YEAR = ?", (year,)).fetchone()[0]
+    if copied != expected:
+        raise RuntimeError(f"Archive mismatch for FY{year}: {expected} plans selected, {copied} in archive")
+
+    for key in reversed(ARCHIVE_TABLES):
+        conn.execute(f"DELETE FROM main.{tables[key]} WHERE {filters[key]}", (year,))
+
+def archive_plans(before=None, superseded=None, batch_size=None, max_batches=None, db_path=None):
+    """Move plans created before `before` (and superseded versions) into the fiscal-year archives
+
+    Returns {'plans', 'successor_rows', 'batches', 'fiscal_years', 'seconds'}.
+    """
+    settings = CONFIG['archive']
+    tables = CONFIG['database']['tables']
+    if before is None:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings['cutoff_days'])
+        before = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+    superseded = settings['superseded'] if superseded is None else superseded
+    batch_size = batch_size or settings['batch_size']
+    started = time.time()
+    stats = {'plans': 0, 'successor_rows': 0, 'batches': 0, 'fiscal_years': set()}
+
+    conn = sqlite3.connect(db_path or CONFIG['database']['succession_plans_db'], isolation_level=None)
+    try:
+        conn.execute(f"PRAGMA busy_timeout = {int(CONFIG['database']['writer']['busy_timeout_ms'])}")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (PLAN_ID TEXT PRIMARY KEY, FISCAL_YEAR INTEGER)")
+        columns = {key: [row[1] for row in conn.execute(f"PRAGMA main.table_info({tables[key]})")] for key in ARCHIVE_TABLES}
+        plan_columns = [(row[1], row[2]) for row in conn.execute(f"PRAGMA main.table_info({tables['plan']})")]
+        attached = set()
+        # Keyset cursor: (CREATED_AT, rowid) of the last candidate seen
+        cursor = ('', 0)
+
+        while max_batches is None or stats['batches'] < max_batches:
+            candidates = conn.execute(
+                format_query('get_archive_candidates'), (*cursor, before, int(bool(superseded)), batch_size)
+            ).fetchall()
+            if not candidates:
+                break
+            cursor = candidates[-1][2:]
+            batch = [(plan_id, incumbent_id, fiscal_year(created_at)) for plan_id, incumbent_id, created_at, _ in candidates]
+            # ATTACH is not allowed inside a transaction
+            for year in {year for _, _, year in batch} - attached:
+                _prepare_archive(archive_path(year), tables, plan_columns)
+                conn.execute("ATTACH DATABASE ? AS ?", (archive_path(year), f"fy{year}"))
+                attached.add(year)
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM temp.archive_batch")
+                conn.executemany("INSERT INTO temp.archive_batch (PLAN_ID, FISCAL_YEAR) VALUES (?, ?)",
+                                 [(plan_id, year) for plan_id, _, year in batch])
+                record_ids = {}
+                for plan_id, line_id in conn.execute(
+                        f"SELECT PLAN_ID, RECORD_ID FROM main.{tables['plan_successor']} "
+                        "WHERE PLAN_ID IN (SELECT PLAN_ID FROM temp.archive_batch) ORDER BY PLAN_ID, LINE_NO"):
+                    record_ids.setdefault(plan_id, []).append(line_id)
+
+                for year in sorted({year for _, _, year in batch}):
+                    _copy_and_delete(conn, tables, f"fy{year}", columns)
+                for plan_id, incumbent_id, _ in batch:
+                    record_plan_change(conn, tables, 'archived', plan_id, incumbent_id, record_ids.get(plan_id, []))
+                for incumbent_id in {incumbent_id for _, incumbent_id, _ in batch}:
+                    refresh_incumbent_bench(conn, tables, incumbent_id)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            stats['plans'] += len(batch)
+            stats['successor_rows'] += sum(len(ids) for ids in record_ids.values())
+            stats['batches'] += 1
+            stats['fiscal_years'].update(year for _, _, year in batch)
+            # Give queued writers the lock between batches
+            time.sleep(settings['pause_ms'] / 1000)
+    finally:
+        conn.close()
+
+    stats['fiscal_years'] = sorted(stats['fiscal_years'])
+    stats['seconds'] = round(time.time() - started, 2)
+    return stats
+
+def connect_with_archives(db_path=None, years=None):
+    """Plans connection with the archives attached and temp union views <table>_all
+
+    years limits which fiscal years are attached (SQLite attaches at most 10 databases by default).
+    The caller closes the connection.
+    """
+    tables = CONFIG['database']['tables']
+    conn = sqlite3.connect(db_path or CONFIG['database']['succession_plans_db'])
+    aliases = ['main']
+    for year, path in archive_files().items():
+        if years is None or year in years:
+            conn.execute("ATTACH DATABASE ? AS ?", (path, f"fy{year}"))
+            aliases.append(f"fy{year}")
+    for key in UNION_TABLES:
+        union = ' UNION ALL '.join(f"SELECT * FROM {alias}.{tables[key]}" for alias in aliases)
+        conn.execute(f"CREATE TEMP VIEW {tables[key]}_all AS {union}")
+    return conn
+
+def main(argv=None):
+    """CLI: python -m database.archive [--before TS] [--max-batches N]"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    options = {}
+    for flag in ('--before', '--max-batches'):
+        if flag in argv:
+            position = argv.index(flag)
+            options[flag] = argv[position + 1]
+            del argv[position:position + 2]
+    if argv:
+        print("Usage: python -m database.archive [--before TS] [--max-batches N]")
+        return 2
+
+    max_batches = int(options['--max-batches']) if '--max-batches' in options else None
+    try:
+        stats = archive_plans(before=options.get('--before'), max_batches=max_batches)
+    except (RuntimeError, OSError, sqlite3.Error) as e:
+        print(f"❌ Archival failed: {e}")
+        return 1
+    years = ', '.join(f"FY{year}" for year in stats['fiscal_years']) or "none"
+    print(f"✅ Archived {stats['plans']} plans ({stats['successor_rows']} successor rows) "
+          f"in {stats['batches']} batches, {stats['seconds']}s - fiscal years: {years}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
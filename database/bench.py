@@ -0,0 +1,102 @@
+"""
+Bench strength rollups - latest plan per incumbent, summed per segment / management level / critical role
+
+incumbent_bench keeps one row per incumbent (their latest plan and its Ready Now / Ready Future counts);
+bench_strength keeps the bucket totals. Both are adjusted in the same transaction as each save.
+"""
+
+BENCH_KEY_COLUMNS = ('SEGMENT', 'MANAGEMENT_LEVEL', 'CRITICAL_ROLE')
+BENCH_BUCKETS = ('ROLES', 'READY_NOW_NONE', 'READY_NOW_ONE', 'READY_NOW_MULTIPLE', 'READY_FUTURE_ONLY')
+
+def bench_buckets(ready_now, ready_future):
+    """Bucket flags for one plan, in BENCH_BUCKETS order"""
+    return (
+        1,
+        int(ready_now == 0),
+        int(ready_now == 1),
+        int(ready_now > 1),
+        int(ready_now == 0 and ready_future > 0),
+    )
+
+def create_bench_tables(conn, tables):
+    bench, incumbents = tables['bench_strength'], tables['incumbent_bench']
+    keys = ', '.join(BENCH_KEY_COLUMNS)
+    buckets = ',\n            '.join(f"{bucket} INTEGER NOT NULL DEFAULT 0" for bucket in BENCH_BUCKETS)
+    conn.execute(f"""
+        CREATE TABLE {incumbents} (
+            INCUMBENT_EMPLOYEE_ID TEXT PRIMARY KEY,
+            PLAN_ID TEXT NOT NULL,
+            SEGMENT TEXT NOT NULL,
+            MANAGEMENT_LEVEL TEXT NOT NULL,
+            CRITICAL_ROLE INTEGER NOT NULL,
+            READY_NOW INTEGER NOT NULL,
+            READY_FUTURE INTEGER NOT NULL
+        )""")
+    conn.execute(f"""
+        CREATE TABLE {bench} (
+            SEGMENT TEXT NOT NULL,
+            MANAGEMENT_LEVEL TEXT NOT NULL,
+            CRITICAL_ROLE INTEGER NOT NULL,
+            {buckets},
+            PRIMARY KEY ({keys})
+        ) WITHOUT ROWID""")
+
+def _latest_plan(conn, tables, incumbent_id):
+    """(PLAN_ID, segment, management level, critical role, ready now, ready future) of the newest plan"""
+    return conn.execute(f"""
+        SELECT p.PLAN_ID, COALESCE(p.INCUMBENT_SEGMENT, ''), COALESCE(p.INCUMBENT_MANAGEMENT_LEVEL, ''),
+               COALESCE(p.CRITICAL_ROLE, 0),
+               (SELECT COUNT(*) FROM {tables['plan_successor']} s
+                WHERE s.PLAN_ID = p.PLAN_ID AND s.SUCCESSOR_READINESS = 'Ready Now'),
+               (SELECT COUNT(*) FROM {tables['plan_successor']} s
+                WHERE s.PLAN_ID = p.PLAN_ID AND s.SUCCESSOR_READINESS = 'Ready Future')
+        FROM {tables['plan']} p
+        WHERE p.INCUMBENT_EMPLOYEE_ID = ?
+        ORDER BY p.PLAN_VERSION DESC
+        LIMIT 1""", (str(incumbent_id),)).fetchone()
+
+def _apply_bench(conn, tables, key, ready_now, ready_future, sign):
+    """Add (sign=1) or remove (sign=-1) one plan's contribution to its bench_strength row"""
+    keys = ', '.join(BENCH_KEY_COLUMNS)
+    columns = ', '.join(BENCH_BUCKETS)
+    values = [sign * flag for flag in bench_buckets(ready_now, ready_future)]
+    updates = ', '.join(f"{bucket} = {bucket} + excluded.{bucket}" for bucket in BENCH_BUCKETS)
+    conn.execute(
+        f"INSERT INTO {tables['bench_strength']} ({keys}, {columns}) VALUES ({', '.join('?' * (len(key) + len(values)))}) "
+        f"ON CONFLICT ({keys}) DO UPDATE SET {updates}",
+        (*key, *values)
+    )
+
+def refresh_incumbent_bench(conn, tables, incumbent_id):
+    """Re-point an incumbent at their latest plan and move the bench totals accordingly
+
+    Call inside the transaction that saved (or removed) the incumbent's plans. Cost is a few
+    indexed lookups regardless of how much plan history exists.
+    """
+    incumbents = tables['incumbent_bench']
+    previous = conn.execute(
+        f"SELECT SEGMENT, MANAGEMENT_LEVEL, CRITICAL_ROLE, READY_NOW, READY_FUTURE FROM {incumbents} "
+        "WHERE INCUMBENT_EMPLOYEE_ID = ?", (str(incumbent_id),)
+    ).fetchone()
+    if previous:
+        _apply_bench(conn, tables, previous[:3], previous[3], previous[4], -1)
+        conn.execute(f"DELETE FROM {incumbents} WHERE INCUMBENT_EMPLOYEE_ID = ?", (str(incumbent_id),))
+
+    latest = _latest_plan(conn, tables, incumbent_id)
+    if latest:
+        plan_id, segment, level, critical, ready_now, ready_future = latest
+        conn.execute(
+            f"INSERT INTO {incumbents} (INCUMBENT_EMPLOYEE_ID, PLAN_ID, SEGMENT, MANAGEMENT_LEVEL, CRITICAL_ROLE, "
+            "READY_NOW, READY_FUTURE) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (str(incumbent_id), plan_id, segment, level, int(bool(critical)), ready_now, ready_future)
+        )
+        _apply_bench(conn, tables, (segment, level, int(bool(critical))), ready_now, ready_future, 1)
+
+def rebuild_bench_strength(conn, tables):
+    """Recompute both bench tables from every incumbent's latest plan"""
+    conn.execute(f"DELETE FROM {tables['incumbent_bench']}")
+    conn.execute(f"DELETE FROM {tables['bench_strength']}")
+    incumbent_ids = [row[0] for row in conn.execute(f"SELECT DISTINCT INCUMBENT_EMPLOYEE_ID FROM {tables['plan']}")]
+    for incumbent_id in incumbent_ids:
+        refresh_incumbent_bench(conn, tables, incumbent_id)
+    return len(incumbent_ids)
@@ -0,0 +1,78 @@
+"""
+Plan change feed - append-only plan_changes log written in the same transaction as each save
+
+SEQ is an AUTOINCREMENT key, so it only ever grows and is never reused. Consumers remember the last
+SEQ they processed and ask for what came after it; the cost follows new activity, not history.
+"""
+
+import json
+import sqlite3
+from config.loader import CONFIG
+from database.queries import format_query
+
+CHANGE_COLUMNS = ('SEQ', 'CHANGED_AT', 'CHANGE_TYPE', 'PLAN_ID', 'INCUMBENT_EMPLOYEE_ID', 'RECORD_IDS')
+
+def create_change_feed(conn, tables):
+    """Create plan_changes and seed one 'saved' entry per existing plan (oldest first); returns True if created"""
+    changes = tables['plan_changes']
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (changes,)).fetchone():
+        return False
+    conn.execute(f"""
+        CREATE TABLE {changes} (
+            SEQ INTEGER PRIMARY KEY AUTOINCREMENT,
+            CHANGED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CHANGE_TYPE TEXT NOT NULL,
+            PLAN_ID TEXT NOT NULL,
+            INCUMBENT_EMPLOYEE_ID TEXT,
+            RECORD_IDS TEXT
+        )""")
+    conn.execute(f"""
+        INSERT INTO {changes} (CHANGED_AT, CHANGE_TYPE, PLAN_ID, INCUMBENT_EMPLOYEE_ID, RECORD_IDS)
+        SELECT p.CREATED_AT, 'saved', p.PLAN_ID, p.INCUMBENT_EMPLOYEE_ID,
+               (SELECT json_group_array(RECORD_ID) FROM
+                   (SELECT RECORD_ID FROM {tables['plan_successor']} WHERE PLAN_ID = p.PLAN_ID ORDER BY LINE_NO))
+        FROM {tables['plan']} p
+        ORDER BY p.CREATED_AT, p.rowid""")
+    return True
+
+def record_plan_change(conn, tables, change_type, plan_id, incumbent_id, record_ids=()):
+    """Append one change on conn (inside the caller's transaction); returns its SEQ"""
+    return conn.execute(
+        f"INSERT INTO {tables['plan_changes']} (CHANGE_TYPE, PLAN_ID, INCUMBENT_EMPLOYEE_ID, RECORD_IDS) "
+        "VALUES (?, ?, ?, ?) RETURNING SEQ",
+        (change_type, plan_id, None if incumbent_id is None else str(incumbent_id), json.dumps(list(record_ids)))
+    ).fetchone()[0]
+
+def get_plan_changes(after_seq=0, limit=None, db_path=None):
+    """Changes with SEQ > after_seq, oldest first, at most `limit` (default change_feed.batch_size)
+
+    Returns a list of dicts; pass the last SEQ back in as after_seq for the next batch.
+    """
+    limit = limit or CONFIG['change_feed']['batch_size']
+    conn = sqlite3.connect(db_path or CONFIG['database']['succession_plans_db'])
+    try:
+        rows = conn.execute(format_query('get_plan_changes'), (after_seq, limit)).fetchall()
+    finally:
+        conn.close()
+    changes = [dict(zip(CHANGE_COLUMNS, row)) for row in rows]
+    for change in changes:
+        change['RECORD_IDS'] = json.loads(change['RECORD_IDS']) if change['RECORD_IDS'] else []
+    return changes
+
+def iter_plan_changes(after_seq=0, batch_size=None, db_path=None):
+    """Yield batches of changes after after_seq until the feed is drained"""
+    while True:
+        changes = get_plan_changes(after_seq, batch_size, db_path)
+        if not changes:
+            return
+        yield changes
+        after_seq = changes[-1]['SEQ']
+
+def latest_change_seq(db_path=None):
+    """Current head of the feed (0 when empty) - a cheap version stamp for plan data"""
+    conn = sqlite3.connect(db_path or CONFIG['database']['succession_plans_db'])
+    try:
+        row = conn.execute(f"SELECT MAX(SEQ) FROM {CONFIG['database']['tables']['plan_changes']}").fetchone()
+    finally:
+        conn.close()
+    return row[0] or 0
@@ -0,0 +1,265 @@
+"""
+Process-wide employee directory - column-oriented NumPy arrays with vectorized filters
+"""
+
+import os
+import sqlite3
+import numpy as np
+import streamlit as st
+from config.loader import CONFIG
+from database.records import Employee, EMPLOYEE_FIELDS
+
+# Low-cardinality text columns stored as integer codes into a category list
+CATEGORY_COLUMNS = ('SEGMENT_HIER_LEVEL_2_NAME', 'MANAGEMENT_LEVEL', 'JOB_LEVEL', 'MGMT_LEVEL_GROUP')
+# Free text columns stored as UTF-8 buffers with offsets (empty string means NULL)
+TEXT_COLUMNS = ('PREFERRED_NAME_FIRST_NAME', 'PREFERRED_NAME_LAST_NAME', 'POSITION_REFERENCE_ID',
+                'POSITION_NBR_DESCRIPTION', 'EMAIL_PRIMARY_WORK')
+
+MISSING_DAYS = -1
+
+class StringColumn:
+    """Variable-length strings as one UTF-8 byte buffer plus int64 offsets (Arrow-style layout)"""
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return bytes(self.data[start:end]).decode('utf-8') or None
+
+    @classmethod
+    def from_values(cls, values):
+        encoded = [(v or '').encode('utf-8') for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(offsets, data)
+
+def build_arrays(columns):
+    """Turn per-column lists into the flat arrays and category tables a directory is made of"""
+    arrays = {}
+    categories = {}
+
+    arrays['employee_id'] = np.asarray(columns['EMPLOYEE_ID'], dtype=np.int64)
+    days = [MISSING_DAYS if d is None else d for d in columns['DAYS_IN_MGMT_LEVEL']]
+    arrays['days_in_mgmt_level'] = np.asarray(days, dtype=np.int32)
+
+    # Categorical columns: codes index into the per-column category list
+    for name in CATEGORY_COLUMNS:
+        values = ['' if v is None else v for v in columns[name]]
+        uniques, codes = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+        categories[name] = [str(v) for v in uniques]
+        arrays[f'codes.{name}'] = codes.astype(np.int16 if len(uniques) < 2**15 else np.int32)
+
+    for name in TEXT_COLUMNS:
+        column = StringColumn.from_values(columns[name])
+        arrays[f'offsets.{name}'] = column.offsets
+        arrays[f'data.{name}'] = column.data
+    arrays['last_name_lower'] = np.asarray(
+        [(v or '').lower() for v in columns['PREFERRED_NAME_LAST_NAME']], dtype=str
+    )
+
+    # Sorted id index for O(log n) lookups
+    arrays['id_order'] = np.argsort(arrays['employee_id'], kind='stable')
+    arrays['sorted_ids'] = arrays['employee_id'][arrays['id_order']]
+
+    # Rows ordered by (segment, management level, days in level) so a shortlist is one contiguous slice
+    level_count = max(len(categories['MANAGEMENT_LEVEL']), 1)
+    group_key = (arrays['codes.SEGMENT_HIER_LEVEL_2_NAME'].astype(np.int64) * level_count
+                 + arrays['codes.MANAGEMENT_LEVEL'])
+    arrays['group_order'] = np.lexsort((arrays['days_in_mgmt_level'], group_key))
+    arrays['sorted_group_key'] = group_key[arrays['group_order']]
+    arrays['sorted_group_days'] = arrays['days_in_mgmt_level'][arrays['group_order']]
+    return arrays, categories
+
+class EmployeeDirectory:
+    """Read-only columnar snapshot of the employee table
+
+    Built from in-memory arrays or from memory-mapped snapshot files (see database/snapshot.py);
+    nothing here copies or parses the column data.
+    """
+
+    def __init__(self, arrays, categories, version=None):
+        self.version = version
+        self.arrays = arrays
+        self.size = len(arrays['employee_id'])
+
+        self.employee_id = arrays['employee_id']
+        self.days_in_mgmt_level = arrays['days_in_mgmt_level']
+        self.categories = {name: tuple(values) for name, values in categories.items()}
+        self.codes = {name: arrays[f'codes.{name}'] for name in CATEGORY_COLUMNS}
+        self.text = {name: StringColumn(arrays[f'offsets.{name}'], arrays[f'data.{name}']) for name in TEXT_COLUMNS}
+        self.last_name_lower = arrays['last_name_lower']
+
+        self._id_order = arrays['id_order']
+        self._sorted_ids = arrays['sorted_ids']
+        self._level_count = max(len(self.categories['MANAGEMENT_LEVEL']), 1)
+        self._group_order = arrays['group_order']
+        self._sorted_group_key = arrays['sorted_group_key']
+        self._sorted_group_days = arrays['sorted_group_days']
+
+    @classmethod
+    def from_columns(cls, columns, version=None):
+        arrays, categories = build_arrays(columns)
+        return cls(arrays, categories, version=version)
+
+    def _category_mask(self, name, value):
+        """Mask for rows whose categorical column equals value (or any of a list of values)"""
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        categories = self.categories[name]
+        wanted = [categories.index('' if v is None else v) for v in values if ('' if v is None else v) in categories]
+        if not wanted:
+            return np.zeros(self.size, dtype=bool)
+        if len(wanted) == 1:
+            return self.codes[name] == wanted[0]
+        return np.isin(self.codes[name], wanted)
+
+    def filter(self, segment=None, management_level=None, job_level=None, mgmt_level_group=None,
+               min_days_in_level=None, max_days_in_level=None):
+        """Return row indices matching every given criterion; each categorical filter takes a value or list"""
+        mask = np.ones(self.size, dtype=bool)
+        for name, value in (('SEGMENT_HIER_LEVEL_2_NAME', segment), ('MANAGEMENT_LEVEL', management_level),
+                            ('JOB_LEVEL', job_level), ('MGMT_LEVEL_GROUP', mgmt_level_group)):
+            if value is not None:
+                mask &= self._category_mask(name, value)
+        if min_days_in_level is not None:
+            mask &= self.days_in_mgmt_level >= min_days_in_level
+        if max_days_in_level is not None:
+            mask &= (self.days_in_mgmt_level <= max_days_in_level) & (self.days_in_mgmt_level != MISSING_DAYS)
+        return np.flatnonzero(mask)
+
+    def shortlist(self, segment, management_level, min_years_in_level=0):
+        """Successor shortlist, e.g. all Vice Presidents in a segment with 2+ years in level
+
+        Two binary searches over the presorted group order; returns a read-only view of row indices.
+        """
+        segments = self.categories['SEGMENT_HIER_LEVEL_2_NAME']
+        levels = self.categories['MANAGEMENT_LEVEL']
+        segment, management_level = segment or '', management_level or ''
+        if segment not in segments or management_level not in levels:
+            return np.empty(0, dtype=np.intp)
+        key = segments.index(segment) * self._level_count + levels.index(management_level)
+        start = np.searchsorted(self._sorted_group_key, key, side='left')
+        end = np.searchsorted(self._sorted_group_key, key, side='right')
+        min_days = int(min_years_in_level * 365)
+        start += np.searchsorted(self._sorted_group_days[start:end], min_days, side='left')
+        view = self._group_order[start:end]
+        view.flags.writeable = False
+        return view
+
+    def index_of(self, employee_id):
+        """Row index for an employee id, or None"""
+        pos = np.searchsorted(self._sorted_ids, int(employee_id))
+        if pos < self.size and self._sorted_ids[pos] == int(employee_id):
+            return int(self._id_order[pos])
+        return None
+
+    def indices_of(self, employee_ids):
+        """Row indices for many ids at once; unknown ids map to -1"""
+        ids = np.asarray(employee_ids, dtype=np.int64)
+        if not self.size:
+            return np.full(len(ids), -1, dtype=np.intp)
+        pos = np.clip(np.searchsorted(self._sorted_ids, ids), 0, self.size - 1)
+        return np.where(self._sorted_ids[pos] == ids, self._id_order[pos], -1)
+
+    def get(self, employee_id):
+        """Employee record for an id, or None"""
+        index = self.index_of(employee_id)
+        return self.record(index) if index is not None else None
+
+    def search_name(self, term, limit=None):
+        """Case-insensitive substring match on last name, like the SQL LIKE search"""
+        term = (term or '').lower()
+        if not term:
+            return np.empty(0, dtype=np.intp)
+        matches = np.flatnonzero(np.char.find(self.last_name_lower, term) >= 0)
+        return matches[:limit] if limit else matches
+
+    def record(self, index):
+        """Materialize one row as an Employee"""
+        values = {name: self.categories[name][self.codes[name][index]] or None for name in CATEGORY_COLUMNS}
+        values.update({name: self.text[name][index] for name in TEXT_COLUMNS})
+        values['EMPLOYEE_ID'] = int(self.employee_id[index])
+        days = int(self.days_in_mgmt_level[index])
+        values['DAYS_IN_MGMT_LEVEL'] = None if days == MISSING_DAYS else days
+        return Employee(**values)
+
+    def records(self, indices):
+        """Materialize many rows as Employee records"""
+        return [self.record(i) for i in indices]
+
+def db_file_version(db_path):
+    """Cheap version stamp for a SQLite file: changes whenever the file is rewritten"""
+    try:
+        stat = os.stat(db_path)
+        return (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+# db_path -> (db_file_version, data version) so the version table is only read after a write
+_DATA_VERSIONS = {}
+
+def employee_data_version(db_path=None):
+    """Version of the employee data: the latest HR extract applied (0 before the first load)
+
+    Recorded by database.employee_import in the employee_data_version table, so migrations and
+    maintenance writes to the same file leave it unchanged. The file stamp only decides when the
+    table has to be read again.
+    """
+    db_path = db_path or CONFIG['database']['employee_db']
+    file_version = db_file_version(db_path)
+    cached = _DATA_VERSIONS.get(db_path)
+    if cached and cached[0] == file_version:
+        return cached[1]
+    version = 0
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            version = conn.execute(
+                f"SELECT COALESCE(MAX(VERSION), 0) FROM {CONFIG['database']['tables']['employee_data_version']}"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        # No extract loaded yet (or no database) - the data is still the original load
+        pass
+    _DATA_VERSIONS[db_path] = (file_version, version)
+    return version
+
+def load_employee_columns(db_path, table):
+    """Read the employee table into per-column lists in one pass"""
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(f"SELECT {', '.join(EMPLOYEE_FIELDS)} FROM {table}")
+        columns = {name: [] for name in EMPLOYEE_FIELDS}
+        appenders = [columns[name].append for name in EMPLOYEE_FIELDS]
+        while True:
+            rows = cursor.fetchmany(10000)
+            if not rows:
+                break
+            for row in rows:
+                for append, value in zip(appenders, row):
+                    append(value)
+        return columns
+    finally:
+        conn.close()
+
+@st.cache_resource(show_spinner="Loading employee directory...", max_entries=2)
+def _load_directory(db_path, table, version, file_version):
+    # Prefer the shared memory-mapped snapshot when it was exported from this exact file and data version
+    from database.snapshot import load_snapshot
+    directory = load_snapshot(CONFIG['database'].get('snapshot_dir'), version, db_path)
+    if directory is not None:
+        return directory
+    return EmployeeDirectory.from_columns(load_employee_columns(db_path, table), version=version)
+
+def get_directory():
+    """Shared directory for the current employee data (reloads after an extract load or any rewrite of the file)"""
+    db_path = CONFIG['database']['employee_db']
+    return _load_directory(
+        db_path, CONFIG['database']['tables']['employee'], employee_data_version(db_path), db_file_version(db_path)
+    )
@@ -0,0 +1,155 @@
+"""
+Draft journal - in-progress plans kept in a local SQLite file so a refresh, "Start Over" by
+accident or a worker restart does not lose them
+
+Each form commit appends one small delta (the changed fields only) under the user's draft key;
+loading replays the deltas into an app_data dict. Long journals are compacted into a single
+snapshot entry, and drafts untouched for ttl_hours are removed.
+
+Ops:
+  set_incumbent     {employee_id, plan_details}
+  update_incumbent  {changes}              changed plan_details keys
+  add_successor     {employee_id, assessment}
+  update_successor  {index, changes}       changed assessment keys
+  remove_successor  {index}
+  snapshot          {app_data}             written by compaction only
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+def empty_draft():
+    return {"incumbent": None, "successors": []}
+
+def changed_fields(old, new):
+    """Keys of new whose values differ from old"""
+    old = old or {}
+    return {key: value for key, value in new.items() if key not in old or old[key] != value}
+
+def apply_delta(app_data, op, payload):
+    """Apply one journal entry to app_data in place"""
+    if op == 'snapshot':
+        app_data.clear()
+        app_data.update(payload['app_data'])
+    elif op == 'set_incumbent':
+        app_data['incumbent'] = {"employee_id": payload['employee_id'], "plan_details": payload['plan_details']}
+    elif op == 'update_incumbent' and app_data['incumbent']:
+        app_data['incumbent']['plan_details'].update(payload['changes'])
+    elif op == 'add_successor':
+        app_data['successors'].append({"employee_id": payload['employee_id'], "assessment": payload['assessment']})
+    elif op == 'update_successor' and payload['index'] < len(app_data['successors']):
+        app_data['successors'][payload['index']]['assessment'].update(payload['changes'])
+    elif op == 'remove_successor' and payload['index'] < len(app_data['successors']):
+        app_data['successors'].pop(payload['index'])
+    return app_data
+
+class DraftJournal:
+    def __init__(self, db_path, ttl_hours=72, compact_after=50):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.compact_after = compact_after
+        self._lock = threading.Lock()
+        self._next_cleanup = 0
+        self._conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        # Every committed delta must survive a crash of the app or the machine
+        self._conn.execute("PRAGMA synchronous = FULL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS draft (
+                DRAFT_KEY TEXT PRIMARY KEY,
+                UPDATED_AT REAL NOT NULL,
+                ENTRIES INTEGER NOT NULL DEFAULT 0
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS IDX_DRAFT_UPDATED_AT ON draft(UPDATED_AT)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS draft_entry (
+                DRAFT_KEY TEXT NOT NULL,
+                SEQ INTEGER NOT NULL,
+                OP TEXT NOT NULL,
+                PAYLOAD TEXT NOT NULL,
+                PRIMARY KEY (DRAFT_KEY, SEQ)
+            ) WITHOUT ROWID""")
+        self.cleanup()
+
+    def append(self, draft_key, op, payload):
+        """Journal one delta in its own transaction; compacts the draft when it grows long"""
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                entries = conn.execute(
+                    "INSERT INTO draft (DRAFT_KEY, UPDATED_AT, ENTRIES) VALUES (?, ?, 1) "
+                    "ON CONFLICT (DRAFT_KEY) DO UPDATE SET UPDATED_AT = excluded.UPDATED_AT, ENTRIES = ENTRIES + 1 "
+                    "RETURNING ENTRIES", (draft_key, time.time())
+                ).fetchone()[0]
+                conn.execute(
+                    "INSERT INTO draft_entry (DRAFT_KEY, SEQ, OP, PAYLOAD) VALUES "
+                    "(?, (SELECT COALESCE(MAX(SEQ), 0) + 1 FROM draft_entry WHERE DRAFT_KEY = ?), ?, ?)",
+                    (draft_key, draft_key, op, json.dumps(payload, default=str))
+                )
+                if entries > self.compact_after:
+                    self._compact(draft_key)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        if time.time() >= self._next_cleanup:
+            self.cleanup()
+
+    def _replay(self, draft_key):
+        app_data = empty_draft()
+        rows = self._conn.execute(
+            "SELECT OP, PAYLOAD FROM draft_entry WHERE DRAFT_KEY = ? ORDER BY SEQ", (draft_key,)
+        ).fetchall()
+        for op, payload in rows:
+            apply_delta(app_data, op, json.loads(payload))
+        return app_data, len(rows)
+
+    def _compact(self, draft_key):
+        app_data, _ = self._replay(draft_key)
+        self._conn.execute("DELETE FROM draft_entry WHERE DRAFT_KEY = ?", (draft_key,))
+        self._conn.execute(
+            "INSERT INTO draft_entry (DRAFT_KEY, SEQ, OP, PAYLOAD) VALUES (?, 1, 'snapshot', ?)",
+            (draft_key, json.dumps({'app_data': app_data}, default=str))
+        )
+        self._conn.execute("UPDATE draft SET ENTRIES = 1 WHERE DRAFT_KEY = ?", (draft_key,))
+
+    def load(self, draft_key):
+        """The draft's app_data, or None when there is nothing (or nothing live) to restore"""
+        with self._lock:
+            row = self._conn.execute("SELECT UPDATED_AT FROM draft WHERE DRAFT_KEY = ?", (draft_key,)).fetchone()
+            if not row or row[0] < time.time() - self.ttl_seconds:
+                return None
+            app_data, entries = self._replay(draft_key)
+        return app_data if entries and (app_data['incumbent'] or app_data['successors']) else None
+
+    def discard(self, draft_key):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM draft_entry WHERE DRAFT_KEY = ?", (draft_key,))
+                self._conn.execute("DELETE FROM draft WHERE DRAFT_KEY = ?", (draft_key,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def cleanup(self):
+        """Remove drafts not touched within the TTL; returns how many were removed"""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "DELETE FROM draft_entry WHERE DRAFT_KEY IN (SELECT DRAFT_KEY FROM draft WHERE UPDATED_AT < ?)", (cutoff,)
+                )
+                removed = self._conn.execute("DELETE FROM draft WHERE UPDATED_AT < ?", (cutoff,)).rowcount
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            # Expired drafts are swept at most hourly, piggybacking on writes
+            self._next_cleanup = time.time() + 3600
+        return removed
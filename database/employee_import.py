@@ -0,0 +1,247 @@
+"""
+Monthly HR extract loader - diffs a CSV/Parquet extract against the employee table by EMPLOYEE_ID
+
+The extract is streamed in chunks into a temporary staging table, then inserts, per-column updates
+and deletes are applied in one transaction. Unchanged rows (and the indexes over unchanged columns)
+are never touched; FULL_NAME, the search key columns and the title FTS index follow the changes.
+The month end date and the DAYS_IN_MGMT_LEVEL tenure counter move for nearly everyone each month,
+so they are refreshed in one bulk UPDATE and do not make a row "updated" or open a history version.
+Each load is recorded in employee_data_version; the app's directory, search cache and employee
+records are keyed on that version, so they pick up the new data on the next lookup after commit.
+
+CLI: python -m database.employee_import <extract.csv|extract.parquet> [--allow-mass-delete]
+"""
+
+import csv
+import os
+import sqlite3
+import sys
+import time
+from config.loader import CONFIG
+from database.migrations import migrate_employee_db, backfill_employee_search_keys
+from database.history import create_employee_history, record_employee_changes
+
+EXTRACT_COLUMNS = (
+    'FISCAL_MONTH_END_DATE', 'SEGMENT_HIER_LEVEL_2_NAME', 'PREFERRED_NAME_FIRST_NAME', 'PREFERRED_NAME_LAST_NAME',
+    'EMPLOYEE_ID', 'POSITION_REFERENCE_ID', 'POSITION_NBR_DESCRIPTION', 'MANAGEMENT_LEVEL', 'JOB_LEVEL',
+    'DAYS_IN_MGMT_LEVEL', 'MGMT_LEVEL_GROUP', 'EMAIL_PRIMARY_WORK'
+)
+INTEGER_COLUMNS = ('EMPLOYEE_ID', 'DAYS_IN_MGMT_LEVEL')
+NAME_COLUMNS = ('PREFERRED_NAME_FIRST_NAME', 'PREFERRED_NAME_LAST_NAME')
+# Move for (almost) everyone every month: refreshed in one bulk UPDATE, never counted as changes
+PERIODIC_COLUMNS = ('FISCAL_MONTH_END_DATE', 'DAYS_IN_MGMT_LEVEL')
+# Compared per employee; a difference makes the row "updated" and reaches the history hook
+DIFF_COLUMNS = tuple(c for c in EXTRACT_COLUMNS if c != 'EMPLOYEE_ID' and c not in PERIODIC_COLUMNS)
+
+class ExtractError(Exception):
+    """The extract is malformed or would remove too much of the current population"""
+
+def _clean_value(column, value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value == '':
+            return None
+    if column in INTEGER_COLUMNS:
+        return int(float(value))
+    return value if isinstance(value, str) else str(value)
+
+def _check_columns(columns, source):
+    missing = [c for c in EXTRACT_COLUMNS if c not in columns]
+    if missing:
+        raise ExtractError(f"{source} is missing columns: {', '.join(missing)}")
+
+def read_csv_chunks(path, chunk_size):
+    """Yield lists of row tuples in EXTRACT_COLUMNS order"""
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        reader = csv.DictReader(file)
+        _check_columns(reader.fieldnames or [], path)
+        chunk = []
+        for record in reader:
+            chunk.append(tuple(_clean_value(c, record[c]) for c in EXTRACT_COLUMNS))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+def read_parquet_chunks(path, chunk_size):
+    """Yield lists of row tuples in EXTRACT_COLUMNS order (requires pyarrow)"""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExtractError("Reading Parquet extracts requires pyarrow (pip install pyarrow)")
+    parquet_file = pq.ParquetFile(path)
+    _check_columns(parquet_file.schema_arrow.names, path)
+    for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=list(EXTRACT_COLUMNS)):
+        columns = [batch.column(c).to_pylist() for c in EXTRACT_COLUMNS]
+        yield [tuple(_clean_value(c, v) for c, v in zip(EXTRACT_COLUMNS, values)) for values in zip(*columns)]
+
+def read_extract_chunks(path, chunk_size):
+    if os.path.splitext(path)[1].lower() in ('.parquet', '.pq'):
+        return read_parquet_chunks(path, chunk_size)
+    return read_csv_chunks(path, chunk_size)
+
+def _stage_extract(conn, chunks):
+    """Load the extract into a temp table keyed by EMPLOYEE_ID (last row wins on duplicates)"""
+    columns = ', '.join(EXTRACT_COLUMNS)
+    conn.execute("DROP TABLE IF EXISTS temp.employee_extract")
+    conn.execute(f"CREATE TEMP TABLE employee_extract ({columns}, PRIMARY KEY (EMPLOYEE_ID)) WITHOUT ROWID")
+    insert = f"INSERT OR REPLACE INTO temp.employee_extract ({columns}) VALUES ({', '.join('?' * len(EXTRACT_COLUMNS))})"
+    for chunk in chunks:
+        if any(row[EXTRACT_COLUMNS.index('EMPLOYEE_ID')] is None for row in chunk):
+            raise ExtractError("Extract contains rows without EMPLOYEE_ID")
+        conn.executemany(insert, chunk)
+    return conn.execute("SELECT COUNT(*) FROM temp.employee_extract").fetchone()[0]
+
+def ensure_data_version_table(conn, version_table):
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {version_table} (
+            VERSION INTEGER PRIMARY KEY AUTOINCREMENT,
+            FISCAL_MONTH_END_DATE TEXT,
+            SOURCE TEXT,
+            LOADED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            ROW_COUNT INTEGER NOT NULL,
+            INSERTED INTEGER NOT NULL,
+            UPDATED INTEGER NOT NULL,
+            DELETED INTEGER NOT NULL
+        )""")
+
+def apply_extract(conn, table, version_table, source, max_delete_fraction, on_changes=None):
+    """Diff temp.employee_extract against the employee table and apply the changes
+
+    on_changes(conn, changed_ids, deleted_ids, fiscal_month) runs in the same transaction before
+    the rows change, for dependent tables such as employee history.
+    """
+    staged = conn.execute("SELECT COUNT(*) FROM temp.employee_extract").fetchone()[0]
+    current = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    deleted_ids = [row[0] for row in conn.execute(
+        f"SELECT EMPLOYEE_ID FROM {table} e WHERE NOT EXISTS "
+        "(SELECT 1 FROM temp.employee_extract x WHERE x.EMPLOYEE_ID = e.EMPLOYEE_ID)"
+    )]
+    if current and len(deleted_ids) > current * max_delete_fraction:
+        raise ExtractError(
+            f"Extract would delete {len(deleted_ids)} of {current} employees - "
+            "check the file or rerun with --allow-mass-delete"
+        )
+
+    differs = ' OR '.join(f"e.{c} IS NOT x.{c}" for c in DIFF_COLUMNS)
+    updated_ids = [row[0] for row in conn.execute(
+        f"SELECT e.EMPLOYEE_ID FROM {table} e JOIN temp.employee_extract x ON x.EMPLOYEE_ID = e.EMPLOYEE_ID WHERE {differs}"
+    )]
+    inserted_ids = [row[0] for row in conn.execute(
+        f"SELECT x.EMPLOYEE_ID FROM temp.employee_extract x WHERE NOT EXISTS "
+        f"(SELECT 1 FROM {table} e WHERE e.EMPLOYEE_ID = x.EMPLOYEE_ID)"
+    )]
+    fiscal_month = conn.execute(
+        "SELECT FISCAL_MONTH_END_DATE FROM temp.employee_extract GROUP BY 1 ORDER BY COUNT(*) DESC LIMIT 1"
+    ).fetchone()
+    fiscal_month = fiscal_month[0] if fiscal_month else None
+
+    if on_changes:
+        on_changes(conn, updated_ids + inserted_ids, deleted_ids, fiscal_month)
+
+    conn.execute(
+        f"DELETE FROM {table} WHERE NOT EXISTS "
+        f"(SELECT 1 FROM temp.employee_extract x WHERE x.EMPLOYEE_ID = {table}.EMPLOYEE_ID)"
+    )
+
+    # One UPDATE per column so only indexes (and the FTS trigger) over changed columns are touched
+    for column in DIFF_COLUMNS:
+        reset_keys = ", LAST_NAME_SOUNDEX = NULL" if column in NAME_COLUMNS else ''
+        conn.execute(
+            f"UPDATE {table} SET {column} = x.{column}{reset_keys} FROM temp.employee_extract x "
+            f"WHERE {table}.EMPLOYEE_ID = x.EMPLOYEE_ID AND {table}.{column} IS NOT x.{column}"
+        )
+    # Month end and tenure counters: one pass, no history version (neither column is indexed)
+    conn.execute(
+        f"UPDATE {table} SET {', '.join(f'{c} = x.{c}' for c in PERIODIC_COLUMNS)} FROM temp.employee_extract x "
+        f"WHERE {table}.EMPLOYEE_ID = x.EMPLOYEE_ID AND ({' OR '.join(f'{table}.{c} IS NOT x.{c}' for c in PERIODIC_COLUMNS)})"
+    )
+
+    columns = ', '.join(EXTRACT_COLUMNS)
+    conn.execute(
+        f"INSERT INTO {table} ({columns}) SELECT {columns} FROM temp.employee_extract x "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {table} e WHERE e.EMPLOYEE_ID = x.EMPLOYEE_ID)"
+    )
+
+    # Derived columns for inserted and renamed rows
+    conn.execute(
+        f"UPDATE {table} SET FULL_NAME = PREFERRED_NAME_FIRST_NAME || ' ' || PREFERRED_NAME_LAST_NAME "
+        f"WHERE FULL_NAME IS NOT PREFERRED_NAME_FIRST_NAME || ' ' || PREFERRED_NAME_LAST_NAME"
+    )
+    backfill_employee_search_keys(conn, table)
+
+    version = conn.execute(
+        f"INSERT INTO {version_table} (FISCAL_MONTH_END_DATE, SOURCE, ROW_COUNT, INSERTED, UPDATED, DELETED) "
+        "VALUES (?, ?, ?, ?, ?, ?) RETURNING VERSION",
+        (fiscal_month, source, staged, len(inserted_ids), len(updated_ids), len(deleted_ids))
+    ).fetchone()[0]
+    return {
+        'version': version,
+        'fiscal_month_end_date': fiscal_month,
+        'rows': staged,
+        'inserted': len(inserted_ids),
+        'updated': len(updated_ids),
+        'deleted': len(deleted_ids),
+    }
+
+def import_extract(path, db_path=None, allow_mass_delete=False, on_changes=record_employee_changes):
+    """Stream an extract file into the employee database; returns the load summary
+
+    By default the employee history ranges are updated in the same transaction.
+    """
+    settings = CONFIG['database']['employee_import']
+    tables = CONFIG['database']['tables']
+    db_path = db_path or CONFIG['database']['employee_db']
+    started = time.time()
+
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout_ms'])}")
+        # Staging happens outside the write transaction so readers are only blocked for the apply step
+        staged = _stage_extract(conn, read_extract_chunks(path, settings['chunk_size']))
+        if not staged:
+            raise ExtractError(f"{path} contains no employees")
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            migrate_employee_db(conn, tables['employee'], tables['employee_fts'])
+            ensure_data_version_table(conn, tables['employee_data_version'])
+            create_employee_history(conn, tables['employee'], tables['employee_history'])
+            summary = apply_extract(
+                conn, tables['employee'], tables['employee_data_version'], os.path.basename(path),
+                1.0 if allow_mass_delete else settings['max_delete_fraction'], on_changes
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    summary['seconds'] = round(time.time() - started, 2)
+    return summary
+
+def main(argv=None):
+    """CLI: python -m database.employee_import <extract> [--allow-mass-delete]"""
+    argv = sys.argv[1:] if argv is None else argv
+    paths = [arg for arg in argv if not arg.startswith('--')]
+    if len(paths) != 1:
+        print("Usage: python -m database.employee_import <extract.csv|extract.parquet> [--allow-mass-delete]")
+        return 2
+    try:
+        summary = import_extract(paths[0], allow_mass_delete='--allow-mass-delete' in argv)
+    except (ExtractError, OSError, ValueError) as e:
+        print(f"❌ Import failed: {e}")
+        return 1
+    print(
+        f"✅ Data version {summary['version']} ({summary['fiscal_month_end_date']}): {summary['rows']} rows, "
+        f"{summary['inserted']} inserted, {summary['updated']} updated, {summary['deleted']} deleted "
+        f"in {summary['seconds']}s"
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Employee history - SCD type 2 validity ranges in the employee database
+
+One row per employee per distinct combination of tracked attributes: VALID_FROM is the fiscal month
+end date (ISO) the combination first appeared, VALID_TO the date it was replaced (NULL while current).
+DAYS_IN_MGMT_LEVEL is not tracked since it changes every month for everyone.
+"""
+
+import datetime
+from config.loader import CONFIG
+
+HISTORY_COLUMNS = (
+    'SEGMENT_HIER_LEVEL_2_NAME', 'PREFERRED_NAME_FIRST_NAME', 'PREFERRED_NAME_LAST_NAME', 'POSITION_REFERENCE_ID',
+    'POSITION_NBR_DESCRIPTION', 'MANAGEMENT_LEVEL', 'JOB_LEVEL', 'MGMT_LEVEL_GROUP', 'EMAIL_PRIMARY_WORK'
+)
+
+def fiscal_date_to_iso(value):
+    """'6/28/2025' (HR extract format) or '2025-06-28' -> '2025-06-28'"""
+    value = (value or '').strip()
+    for date_format in ('%m/%d/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.datetime.strptime(value[:10], date_format).date().isoformat()
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognised fiscal month end date: {value!r}")
+
+def create_employee_history(conn, employee_table, history_table):
+    """Create the history table and seed it with the current snapshot; returns True if created"""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (history_table,)).fetchone():
+        return False
+
+    columns = ', '.join(HISTORY_COLUMNS)
+    conn.execute(f"""
+        CREATE TABLE {history_table} (
+            EMPLOYEE_ID INTEGER NOT NULL,
+            VALID_FROM DATE NOT NULL,
+            VALID_TO DATE,
+            {', '.join(f'{column} TEXT' for column in HISTORY_COLUMNS)}
+        )""")
+    # As-of lookups are a single seek: latest VALID_FROM <= date for one employee
+    conn.execute(f"CREATE UNIQUE INDEX IDX_EMPLOYEE_HISTORY_VALID_FROM ON {history_table}(EMPLOYEE_ID, VALID_FROM)")
+
+    fiscal_dates = [row[0] for row in conn.execute(f"SELECT DISTINCT FISCAL_MONTH_END_DATE FROM {employee_table}")]
+    for fiscal_date in fiscal_dates:
+        conn.execute(
+            f"INSERT INTO {history_table} (EMPLOYEE_ID, VALID_FROM, {columns}) "
+            f"SELECT EMPLOYEE_ID, ?, {columns} FROM {employee_table} WHERE FISCAL_MONTH_END_DATE IS ?",
+            (fiscal_date_to_iso(fiscal_date), fiscal_date)
+        )
+    return True
+
+def record_employee_changes(conn, changed_ids, deleted_ids, fiscal_month):
+    """Extract loader hook: close and open validity ranges from temp.employee_extract
+
+    Only employees whose tracked attributes differ from their open range get a new row.
+    """
+    history = CONFIG['database']['tables']['employee_history']
+    valid_from = fiscal_date_to_iso(fiscal_month)
+    columns = ', '.join(HISTORY_COLUMNS)
+    differs = ' OR '.join(f"h.{c} IS NOT x.{c}" for c in HISTORY_COLUMNS)
+
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS history_changed (EMPLOYEE_ID INTEGER PRIMARY KEY)")
+    conn.execute("DELETE FROM temp.history_changed")
+    conn.executemany("INSERT OR IGNORE INTO temp.history_changed VALUES (?)", [(i,) for i in changed_ids])
+
+    # Employees with no open range, or whose open range no longer matches the extract
+    moved = [row[0] for row in conn.execute(f"""
+        SELECT c.EMPLOYEE_ID
+        FROM temp.history_changed c
+        JOIN temp.employee_extract x ON x.EMPLOYEE_ID = c.EMPLOYEE_ID
+        LEFT JOIN {history} h ON h.EMPLOYEE_ID = c.EMPLOYEE_ID AND h.VALID_TO IS NULL
+        WHERE h.EMPLOYEE_ID IS NULL OR {differs}""")]
+
+    for employee_id in [*moved, *deleted_ids]:
+        # A second load for the same month replaces that month's range instead of adding one
+        conn.execute(f"DELETE FROM {history} WHERE EMPLOYEE_ID = ? AND VALID_FROM = ? AND VALID_TO IS NULL",
+                     (employee_id, valid_from))
+        conn.execute(f"UPDATE {history} SET VALID_TO = ? WHERE EMPLOYEE_ID = ? AND VALID_TO IS NULL",
+                     (valid_from, employee_id))
+    conn.executemany(
+        f"INSERT INTO {history} (EMPLOYEE_ID, VALID_FROM, {columns}) "
+        f"SELECT EMPLOYEE_ID, ?, {columns} FROM temp.employee_extract WHERE EMPLOYEE_ID = ?",
+        [(valid_from, employee_id) for employee_id in moved]
+    )
+    return len(moved), len(deleted_ids)
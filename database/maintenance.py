@@ -0,0 +1,240 @@
+"""
+SQLite maintenance for both databases - planner statistics, WAL checkpoints, free-page
+reclamation and integrity checks, each run under a time budget
+
+Tasks per database, in order:
+  quick_check         PRAGMA quick_check, at most once per quick_check_hours
+  analyze / optimize  ANALYZE (bounded by analysis_limit) once analyze_after_writes new writes have
+                      landed since the last one, otherwise the cheap PRAGMA optimize
+  incremental_vacuum  return free pages to the OS when auto_vacuum is INCREMENTAL; a file still in
+                      auto_vacuum NONE is converted once, off-peak, if convert_auto_vacuum is set
+  checkpoint          PRAGMA wal_checkpoint(TRUNCATE), off-peak only
+
+Maintenance yields to the app: a short busy timeout makes it skip a task rather than queue behind
+a writer, and a progress handler interrupts any statement that runs past the run's deadline.
+Each task is logged with its timing and recorded in the maintenance_runs table of the plans
+database, keyed by database file - the employee database is only written to by the tasks
+themselves, and a pass where every task is skipped writes nothing.
+
+CLI: python -m database.maintenance [--force] [--budget SECONDS]
+In-process: MaintenanceScheduler(interval_minutes).start() - see get_maintenance_scheduler()
+"""
+
+import datetime
+import sqlite3
+import sys
+import threading
+import time
+from config.loader import CONFIG
+
+class BudgetExceeded(Exception):
+    """The run's time budget was used up before the task could start"""
+
+def _connect(db_path, settings):
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout_ms'])}")
+    return conn
+
+def _ensure_runs_table(log):
+    table = CONFIG['database']['tables']['maintenance_runs']
+    log.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            DB_FILE TEXT,
+            TASK TEXT NOT NULL,
+            RAN_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            SECONDS REAL,
+            STATUS TEXT NOT NULL,
+            WRITE_MARK INTEGER
+        )""")
+    # Tables created before runs were logged centrally have no DB_FILE
+    if 'DB_FILE' not in [row[1] for row in log.execute(f"PRAGMA table_info({table})")]:
+        log.execute(f"ALTER TABLE {table} ADD COLUMN DB_FILE TEXT")
+
+class RunLog:
+    """Maintenance history for one database, read and written through the plans database"""
+
+    def __init__(self, db_path, settings):
+        self.db_path = db_path
+        self.conn = _connect(CONFIG['database']['succession_plans_db'], settings)
+        self.table = CONFIG['database']['tables']['maintenance_runs']
+        self._ready = False
+
+    def last_run(self, task):
+        """(RAN_AT, WRITE_MARK) of the task's last successful run, or None"""
+        try:
+            return self.conn.execute(
+                f"SELECT RAN_AT, WRITE_MARK FROM {self.table} "
+                "WHERE DB_FILE = ? AND TASK = ? AND STATUS = 'ok' ORDER BY rowid DESC LIMIT 1", (self.db_path, task)
+            ).fetchone()
+        except sqlite3.OperationalError:
+            # No run logged yet (or a log table without DB_FILE)
+            return None
+
+    def record(self, task, seconds, status, mark):
+        if not self._ready:
+            _ensure_runs_table(self.conn)
+            self._ready = True
+        self.conn.execute(
+            f"INSERT INTO {self.table} (DB_FILE, TASK, SECONDS, STATUS, WRITE_MARK) VALUES (?, ?, ?, ?, ?)",
+            (self.db_path, task, seconds, status, mark)
+        )
+
+    def close(self):
+        self.conn.close()
+
+def write_mark(conn):
+    """Monotonic count of writes to the database: the change feed head for plans, the history
+    rowid for employees"""
+    tables = CONFIG['database']['tables']
+    for table, column in ((tables['plan_changes'], 'SEQ'), (tables['employee_history'], 'rowid')):
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone():
+            return conn.execute(f"SELECT COALESCE(MAX({column}), 0) FROM {table}").fetchone()[0]
+    return 0
+
+def is_off_peak(now=None):
+    now = now or datetime.datetime.now()
+    return now.hour in CONFIG['maintenance']['off_peak_hours']
+
+def _quick_check(conn, log, force):
+    last = log.last_run('quick_check')
+    hours = CONFIG['maintenance']['quick_check_hours']
+    if last and not force:
+        ran_at = datetime.datetime.fromisoformat(last[0])
+        if datetime.datetime.utcnow() - ran_at < datetime.timedelta(hours=hours):
+            return 'skipped', None
+    problems = [row[0] for row in conn.execute("PRAGMA quick_check")]
+    if problems != ['ok']:
+        print(f"❌ quick_check found problems: {'; '.join(problems[:10])}")
+        return 'corrupt', None
+    return 'ok', None
+
+def _analyze(conn, log, force):
+    settings = CONFIG['maintenance']
+    mark = write_mark(conn)
+    last = log.last_run('analyze')
+    has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+    if force or not last or not has_stats or mark - (last[1] or 0) >= settings['analyze_after_writes']:
+        conn.execute(f"PRAGMA analysis_limit = {int(settings['analysis_limit'])}")
+        conn.execute("ANALYZE")
+        return 'ok', mark
+    conn.execute("PRAGMA optimize")
+    return 'optimized', None
+
+def _incremental_vacuum(conn, log, force):
+    settings = CONFIG['maintenance']
+    auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    if auto_vacuum == 2:
+        if not free_pages:
+            return 'skipped', None
+        conn.execute(f"PRAGMA incremental_vacuum({int(settings['vacuum_pages'])})").fetchall()
+        return 'ok', None
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    wasted = free_pages / page_count if page_count else 0
+    if settings['convert_auto_vacuum'] and (force or is_off_peak()) and wasted >= settings['vacuum_free_fraction']:
+        # auto_vacuum only changes on a full VACUUM; after this every later run is incremental
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return 'converted', None
+    return 'skipped', None
+
+def _checkpoint(conn, log, force):
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] != 'wal':
+        return 'skipped', None
+    if not (force or is_off_peak()):
+        return 'skipped', None
+    busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    return ('busy', None) if busy else ('ok', None)
+
+TASKS = (
+    ('quick_check', _quick_check),
+    ('analyze', _analyze),
+    ('incremental_vacuum', _incremental_vacuum),
+    ('checkpoint', _checkpoint),
+)
+
+def maintain_database(db_path, deadline, force=False):
+    """Run the tasks on one database until the deadline; returns [(task, status, seconds)]"""
+    settings = CONFIG['maintenance']
+    results = []
+    conn = _connect(db_path, settings)
+    log = RunLog(db_path, settings)
+    try:
+        # Interrupt whatever statement is running once the budget is spent
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+        for task, run_task in TASKS:
+            started = time.monotonic()
+            try:
+                if started >= deadline:
+                    raise BudgetExceeded()
+                status, mark = run_task(conn, log, force)
+            except BudgetExceeded:
+                status, mark = 'deferred', None
+            except sqlite3.OperationalError as e:
+                message = str(e)
+                status, mark = ('deferred' if 'interrupted' in message else 'busy' if 'locked' in message else 'failed'), None
+                if status == 'failed':
+                    print(f"❌ Maintenance {task} on {db_path} failed: {message}")
+            seconds = round(time.monotonic() - started, 3)
+            results.append((task, status, seconds))
+            print(f"🧹 {db_path} {task}: {status} ({seconds * 1000:.0f} ms)")
+            # Only tasks that did work are recorded; a plain PRAGMA optimize must not reset the analyze mark
+            if status not in ('skipped', 'deferred', 'optimized'):
+                try:
+                    log.record(task, seconds, 'ok' if status == 'converted' else status, mark)
+                except sqlite3.OperationalError:
+                    pass
+    finally:
+        log.close()
+        conn.close()
+    return results
+
+def run_maintenance(budget_seconds=None, force=False):
+    """One maintenance pass over both databases within budget_seconds; returns {db_path: results}"""
+    budget_seconds = budget_seconds or CONFIG['maintenance']['time_budget_seconds']
+    deadline = time.monotonic() + budget_seconds
+    started = time.monotonic()
+    report = {}
+    for db_path in (CONFIG['database']['succession_plans_db'], CONFIG['database']['employee_db']):
+        report[db_path] = maintain_database(db_path, deadline, force)
+    print(f"🧹 Maintenance pass finished in {time.monotonic() - started:.2f}s (budget {budget_seconds}s)")
+    return report
+
+class MaintenanceScheduler:
+    """Daemon thread running run_maintenance every interval_minutes"""
+
+    def __init__(self, interval_minutes=None, budget_seconds=None):
+        settings = CONFIG['maintenance']
+        self.interval = (interval_minutes or settings['interval_minutes']) * 60
+        self.budget_seconds = budget_seconds or settings['time_budget_seconds']
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sqlite-maintenance", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                run_maintenance(self.budget_seconds)
+            except Exception as e:
+                print(f"❌ Maintenance pass failed: {e}")
+
+def main(argv=None):
+    """CLI: python -m database.maintenance [--force] [--budget SECONDS]"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    budget = None
+    if '--budget' in argv:
+        position = argv.index('--budget')
+        budget = float(argv[position + 1])
+        del argv[position:position + 2]
+    report = run_maintenance(budget, force='--force' in argv)
+    failed = [task for results in report.values() for task, status, _ in results if status in ('failed', 'corrupt')]
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,484 @@
+"""
+Schema migrations - idempotent, safe to run at every startup
+"""
+
+import json
+import sqlite3
+import uuid
+from config.loader import CONFIG
+from database.bench import create_bench_tables, rebuild_bench_strength
+from database.history import create_employee_history
+from database.change_feed import create_change_feed
+from database.plan_content import stored_plan_hashes
+from database.queries import format_query
+from utils.text_match import normalize_name, soundex
+
+# Database-side UUIDv4, same expression the original succession_plans table used for RECORD_ID
+UUID_DEFAULT = (
+    "(lower(hex(randomblob(4))) || '-' || lower(hex(randomblob(2))) || '-4' || "
+    "substr(lower(hex(randomblob(2))),2) || '-' || substr('89ab',abs(random()) % 4 + 1, 1) || "
+    "substr(lower(hex(randomblob(2))),2) || '-' || lower(hex(randomblob(6))))"
+)
+
+INCUMBENT_IDENTITY_COLUMNS = (
+    'INCUMBENT_EMPLOYEE_ID', 'INCUMBENT_FIRST_NAME', 'INCUMBENT_LAST_NAME', 'INCUMBENT_EMAIL',
+    'INCUMBENT_POSITION', 'INCUMBENT_MANAGEMENT_LEVEL', 'INCUMBENT_JOB_LEVEL', 'INCUMBENT_SEGMENT'
+)
+PLAN_DETAIL_COLUMNS = (
+    'CRITICAL_ROLE', 'RESPONSIBILITIES', 'INCUMBENT_TOP_PLE', 'INCUMBENT_CONTRACT_END_DATE',
+    'ROLE_TYPE', 'SCENARIO_PLAN', 'NEW_POSITION_TITLE'
+)
+SUCCESSOR_COLUMNS = (
+    'SUCCESSOR_EMPLOYEE_ID', 'SUCCESSOR_FIRST_NAME', 'SUCCESSOR_LAST_NAME', 'SUCCESSOR_EMAIL',
+    'SUCCESSOR_POSITION', 'SUCCESSOR_MANAGEMENT_LEVEL', 'SUCCESSOR_JOB_LEVEL', 'SUCCESSOR_SEGMENT',
+    'SUCCESSOR_READINESS', 'SUCCESSOR_FUTURE_READINESS_TIMING', 'SUCCESSOR_CONTRACT_END_DATE',
+    'SUCCESSOR_STRENGTHS', 'SUCCESSOR_TOP_PLE', 'SUCCESSOR_DEVELOPMENT_FOCUS', 'SUCCESSOR_TALENT_ACTIONS'
+)
+
+# Derived search columns on the employee table
+EMPLOYEE_SEARCH_COLUMNS = {
+    'LAST_NAME_NORM': 'TEXT',
+    'FIRST_NAME_NORM': 'TEXT',
+    'LAST_NAME_SOUNDEX': 'TEXT',
+    'FIRST_NAME_SOUNDEX': 'TEXT',
+}
+
+# Index name -> indexed column expression; one per search route
+EMPLOYEE_SEARCH_INDEXES = {
+    'IDX_EMPLOYEE_LAST_NAME_NORM': 'LAST_NAME_NORM, FIRST_NAME_NORM',
+    'IDX_EMPLOYEE_LAST_NAME_SOUNDEX': 'LAST_NAME_SOUNDEX',
+    'IDX_EMPLOYEE_ID': 'EMPLOYEE_ID',
+    'IDX_EMPLOYEE_EMAIL': 'LOWER(EMAIL_PRIMARY_WORK)',
+}
+
+# Full-text index over position titles, kept in sync with the employee table by triggers
+EMPLOYEE_FTS_COLUMNS = ('POSITION_NBR_DESCRIPTION',)
+
+def _table_columns(conn, table):
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+def _existing_indexes(conn):
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+def employee_search_keys(first_name, last_name):
+    """Derived (LAST_NAME_NORM, FIRST_NAME_NORM, LAST_NAME_SOUNDEX, FIRST_NAME_SOUNDEX) for one employee"""
+    return normalize_name(last_name), normalize_name(first_name), soundex(last_name), soundex(first_name)
+
+def backfill_employee_search_keys(conn, table, where="LAST_NAME_SOUNDEX IS NULL"):
+    """Compute search keys for rows that do not have them yet; returns the number of rows updated"""
+    rows = conn.execute(
+        f"SELECT rowid, PREFERRED_NAME_FIRST_NAME, PREFERRED_NAME_LAST_NAME FROM {table} WHERE {where}"
+    ).fetchall()
+    conn.executemany(
+        f"""UPDATE {table}
+            SET LAST_NAME_NORM = ?, FIRST_NAME_NORM = ?, LAST_NAME_SOUNDEX = ?, FIRST_NAME_SOUNDEX = ?
+            WHERE rowid = ?""",
+        [(*employee_search_keys(first, last), rowid) for rowid, first, last in rows]
+    )
+    return len(rows)
+
+def migrate_employee_fts(conn, table, fts_table):
+    """Create the external-content FTS5 table over titles plus sync triggers; returns True if created"""
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (fts_table,)).fetchone():
+        return False
+    
+    columns = ', '.join(EMPLOYEE_FTS_COLUMNS)
+    new_values = ', '.join(f"new.{c}" for c in EMPLOYEE_FTS_COLUMNS)
+    old_values = ', '.join(f"old.{c}" for c in EMPLOYEE_FTS_COLUMNS)
+    conn.execute(
+        f"CREATE VIRTUAL TABLE {fts_table} USING fts5({columns}, content='{table}', content_rowid='rowid')"
+    )
+    # Individual statements (not executescript) so the caller's transaction stays open
+    triggers = {
+        f"{fts_table}_ai": f"""AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts_table}(rowid, {columns}) VALUES (new.rowid, {new_values});
+        END""",
+        f"{fts_table}_ad": f"""AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+        END""",
+        f"{fts_table}_au": f"""AFTER UPDATE OF {columns} ON {table} BEGIN
+            INSERT INTO {fts_table}({fts_table}, rowid, {columns}) VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO {fts_table}(rowid, {columns}) VALUES (new.rowid, {new_values});
+        END""",
+    }
+    for name, body in triggers.items():
+        conn.execute(f"CREATE TRIGGER {name} {body}")
+    conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+    return True
+
+def migrate_employee_db(conn, table, fts_table=None):
+    """Add normalized/phonetic name columns and their indexes; only writes when something is missing"""
+    changed = False
+    columns = _table_columns(conn, table)
+    for name, column_type in EMPLOYEE_SEARCH_COLUMNS.items():
+        if name not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+            changed = True
+
+    indexes = _existing_indexes(conn)
+    for index_name, column in EMPLOYEE_SEARCH_INDEXES.items():
+        if index_name not in indexes:
+            conn.execute(f"CREATE INDEX {index_name} ON {table}({column})")
+            changed = True
+
+    if backfill_employee_search_keys(conn, table):
+        changed = True
+    if fts_table and migrate_employee_fts(conn, table, fts_table):
+        changed = True
+    return changed
+
+def _table_exists(conn, name, kind='table'):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = ? AND name = ?", (kind, name)).fetchone() is not None
+
+def decode_text_list(value):
+    """JSON array text -> list; tolerates the old single-string SOURCING_STRATEGY values"""
+    if not value:
+        return []
+    try:
+        decoded = json.loads(value)
+    except (TypeError, ValueError):
+        return [value] if value != "-- Select an Option --" else []
+    if isinstance(decoded, list):
+        return decoded
+    return [decoded] if decoded else []
+
+def create_plan_schema(conn, tables):
+    """Normalized plan tables: one header row per saved plan, one line per successor, junction tables for lists"""
+    plan, successor = tables['plan'], tables['plan_successor']
+    conn.execute(f"""
+        CREATE TABLE {plan} (
+            PLAN_ID TEXT PRIMARY KEY DEFAULT {UUID_DEFAULT},
+            CREATED_AT TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INCUMBENT_EMPLOYEE_ID TEXT NOT NULL,
+            INCUMBENT_FIRST_NAME TEXT NOT NULL,
+            INCUMBENT_LAST_NAME TEXT NOT NULL,
+            INCUMBENT_EMAIL TEXT,
+            INCUMBENT_POSITION TEXT,
+            INCUMBENT_MANAGEMENT_LEVEL TEXT,
+            INCUMBENT_JOB_LEVEL TEXT,
+            INCUMBENT_SEGMENT TEXT,
+            CRITICAL_ROLE BOOLEAN NOT NULL,
+            RESPONSIBILITIES TEXT NOT NULL,
+            INCUMBENT_TOP_PLE TEXT NOT NULL,
+            INCUMBENT_CONTRACT_END_DATE DATE,
+            ROLE_TYPE TEXT,
+            SCENARIO_PLAN TEXT NOT NULL,
+            NEW_POSITION_TITLE TEXT
+        )""")
+    conn.execute(f"""
+        CREATE TABLE {successor} (
+            RECORD_ID TEXT PRIMARY KEY DEFAULT {UUID_DEFAULT},
+            PLAN_ID TEXT NOT NULL REFERENCES {plan}(PLAN_ID) ON DELETE CASCADE,
+            LINE_NO INTEGER NOT NULL,
+            SUCCESSOR_EMPLOYEE_ID TEXT NOT NULL,
+            SUCCESSOR_FIRST_NAME TEXT NOT NULL,
+            SUCCESSOR_LAST_NAME TEXT NOT NULL,
+            SUCCESSOR_EMAIL TEXT,
+            SUCCESSOR_POSITION TEXT,
+            SUCCESSOR_MANAGEMENT_LEVEL TEXT,
+            SUCCESSOR_JOB_LEVEL TEXT,
+            SUCCESSOR_SEGMENT TEXT,
+            SUCCESSOR_READINESS TEXT NOT NULL,
+            SUCCESSOR_FUTURE_READINESS_TIMING TEXT,
+            SUCCESSOR_CONTRACT_END_DATE DATE,
+            SUCCESSOR_STRENGTHS TEXT NOT NULL,
+            SUCCESSOR_TOP_PLE TEXT NOT NULL,
+            SUCCESSOR_DEVELOPMENT_FOCUS TEXT NOT NULL,
+            SUCCESSOR_TALENT_ACTIONS TEXT NOT NULL
+        )""")
+    conn.execute(f"""
+        CREATE TABLE {tables['plan_skill']} (
+            PLAN_ID TEXT NOT NULL REFERENCES {plan}(PLAN_ID) ON DELETE CASCADE,
+            POSITION INTEGER NOT NULL,
+            SKILL TEXT NOT NULL,
+            PRIMARY KEY (PLAN_ID, POSITION)
+        ) WITHOUT ROWID""")
+    conn.execute(f"""
+        CREATE TABLE {tables['plan_sourcing']} (
+            PLAN_ID TEXT NOT NULL REFERENCES {plan}(PLAN_ID) ON DELETE CASCADE,
+            POSITION INTEGER NOT NULL,
+            STRATEGY TEXT NOT NULL,
+            PRIMARY KEY (PLAN_ID, POSITION)
+        ) WITHOUT ROWID""")
+    conn.execute(f"""
+        CREATE TABLE {tables['plan_successor_skill']} (
+            RECORD_ID TEXT NOT NULL REFERENCES {successor}(RECORD_ID) ON DELETE CASCADE,
+            POSITION INTEGER NOT NULL,
+            SKILL TEXT NOT NULL,
+            PRIMARY KEY (RECORD_ID, POSITION)
+        ) WITHOUT ROWID""")
+
+    # Same index names as the original table so existing tooling keeps recognising them
+    conn.execute(f"CREATE INDEX IDX_INCUMBENT_EMPLOYEE_ID ON {plan}(INCUMBENT_EMPLOYEE_ID, CREATED_AT)")
+    conn.execute(f"CREATE INDEX IDX_CREATED_AT ON {plan}(CREATED_AT)")
+    conn.execute(f"CREATE INDEX IDX_SUCCESSOR_EMPLOYEE_ID ON {successor}(SUCCESSOR_EMPLOYEE_ID)")
+    conn.execute(f"CREATE INDEX IDX_PLAN_SUCCESSOR_PLAN_ID ON {successor}(PLAN_ID, LINE_NO)")
+    conn.execute(f"CREATE INDEX IDX_PLAN_SKILL_SKILL ON {tables['plan_skill']}(SKILL, PLAN_ID)")
+    conn.execute(f"CREATE INDEX IDX_PLAN_SOURCING_STRATEGY ON {tables['plan_sourcing']}(STRATEGY, PLAN_ID)")
+    conn.execute(f"CREATE INDEX IDX_PLAN_SUCCESSOR_SKILL_SKILL ON {tables['plan_successor_skill']}(SKILL, RECORD_ID)")
+
+def create_plan_compat_view(conn, tables):
+    """Read-only view exposing the normalized tables under the original succession_plans columns"""
+    def json_list(table, value_column, key_column, key):
+        return (f"(SELECT json_group_array({value_column}) FROM "
+                f"(SELECT {value_column} FROM {table} WHERE {key_column} = {key} ORDER BY POSITION))")
+
+    incumbent_columns = ', '.join(f"p.{c}" for c in INCUMBENT_IDENTITY_COLUMNS)
+    successor_identity = ', '.join(f"s.{c}" for c in SUCCESSOR_COLUMNS[:11])
+    conn.execute(f"""
+        CREATE VIEW {tables['succession_plans']} AS
+        SELECT
+            s.RECORD_ID, p.CREATED_AT, {incumbent_columns},
+            p.CRITICAL_ROLE, p.RESPONSIBILITIES,
+            {json_list(tables['plan_skill'], 'SKILL', 'PLAN_ID', 'p.PLAN_ID')} AS INCUMBENT_TOP_SKILLS,
+            p.INCUMBENT_TOP_PLE, p.INCUMBENT_CONTRACT_END_DATE,
+            {json_list(tables['plan_sourcing'], 'STRATEGY', 'PLAN_ID', 'p.PLAN_ID')} AS SOURCING_STRATEGY,
+            p.ROLE_TYPE, p.SCENARIO_PLAN, p.NEW_POSITION_TITLE,
+            {successor_identity},
+            s.SUCCESSOR_STRENGTHS,
+            {json_list(tables['plan_successor_skill'], 'SKILL', 'RECORD_ID', 's.RECORD_ID')} AS SUCCESSOR_TOP_SKILLS,
+            s.SUCCESSOR_TOP_PLE, s.SUCCESSOR_DEVELOPMENT_FOCUS, s.SUCCESSOR_TALENT_ACTIONS,
+            p.PLAN_ID
+        FROM {tables['plan_successor']} s
+        JOIN {tables['plan']} p ON p.PLAN_ID = s.PLAN_ID""")
+
+def insert_plan_lists(conn, tables, plan_id, top_skills, sourcing_strategy):
+    conn.executemany(
+        f"INSERT INTO {tables['plan_skill']} (PLAN_ID, POSITION, SKILL) VALUES (?, ?, ?)",
+        [(plan_id, i, skill) for i, skill in enumerate(top_skills)]
+    )
+    conn.executemany(
+        f"INSERT INTO {tables['plan_sourcing']} (PLAN_ID, POSITION, STRATEGY) VALUES (?, ?, ?)",
+        [(plan_id, i, strategy) for i, strategy in enumerate(sourcing_strategy)]
+    )
+
+def insert_successor_skills(conn, tables, record_id, top_skills):
+    conn.executemany(
+        f"INSERT INTO {tables['plan_successor_skill']} (RECORD_ID, POSITION, SKILL) VALUES (?, ?, ?)",
+        [(record_id, i, skill) for i, skill in enumerate(top_skills)]
+    )
+
+def _copy_legacy_plans(conn, tables, legacy):
+    """Group legacy incumbent x successor rows into plans (same incumbent block and CREATED_AT)"""
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute(f"SELECT * FROM {legacy} ORDER BY CREATED_AT, rowid").fetchall()
+    conn.row_factory = None
+
+    plan_columns = ('PLAN_ID', 'CREATED_AT', *INCUMBENT_IDENTITY_COLUMNS, *PLAN_DETAIL_COLUMNS)
+    successor_columns = ('RECORD_ID', 'PLAN_ID', 'LINE_NO', *SUCCESSOR_COLUMNS)
+    plan_ids = {}
+    line_numbers = {}
+    for row in rows:
+        key = (row['CREATED_AT'], *(row[c] for c in INCUMBENT_IDENTITY_COLUMNS[:1]),
+               *(row[c] for c in PLAN_DETAIL_COLUMNS), row['INCUMBENT_TOP_SKILLS'], row['SOURCING_STRATEGY'])
+        plan_id = plan_ids.get(key)
+        if plan_id is None:
+            plan_id = plan_ids[key] = str(uuid.uuid4())
+            values = (plan_id, row['CREATED_AT'], *(row[c] for c in INCUMBENT_IDENTITY_COLUMNS),
+                      *(row[c] for c in PLAN_DETAIL_COLUMNS))
+            conn.execute(
+                f"INSERT INTO {tables['plan']} ({', '.join(plan_columns)}) VALUES ({', '.join('?' * len(plan_columns))})",
+                values
+            )
+            insert_plan_lists(conn, tables, plan_id, decode_text_list(row['INCUMBENT_TOP_SKILLS']),
+                              decode_text_list(row['SOURCING_STRATEGY']))
+        line_numbers[plan_id] = line_numbers.get(plan_id, -1) + 1
+        values = (row['RECORD_ID'], plan_id, line_numbers[plan_id], *(row[c] for c in SUCCESSOR_COLUMNS))
+        conn.execute(
+            f"INSERT INTO {tables['plan_successor']} ({', '.join(successor_columns)}) "
+            f"VALUES ({', '.join('?' * len(successor_columns))})",
+            values
+        )
+        insert_successor_skills(conn, tables, row['RECORD_ID'], decode_text_list(row['SUCCESSOR_TOP_SKILLS']))
+    return len(rows), len(plan_ids)
+
+def migrate_plans_db(conn, tables):
+    """Move the flat succession_plans table into the normalized schema behind a compatibility view"""
+    if _table_exists(conn, tables['plan']):
+        return False
+
+    legacy = None
+    if _table_exists(conn, tables['succession_plans']):
+        legacy = f"{tables['succession_plans']}_legacy"
+        conn.execute(f"ALTER TABLE {tables['succession_plans']} RENAME TO {legacy}")
+        for index_name in ('IDX_INCUMBENT_EMPLOYEE_ID', 'IDX_SUCCESSOR_EMPLOYEE_ID', 'IDX_CREATED_AT'):
+            conn.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+    create_plan_schema(conn, tables)
+    create_plan_compat_view(conn, tables)
+
+    if legacy:
+        row_count, plan_count = _copy_legacy_plans(conn, tables, legacy)
+        migrated = conn.execute(f"SELECT COUNT(*) FROM {tables['succession_plans']}").fetchone()[0]
+        if migrated != row_count:
+            raise RuntimeError(f"Plan migration mismatch: {row_count} legacy rows, {migrated} migrated")
+        conn.execute(f"DROP TABLE {legacy}")
+        print(f"✅ Migrated {row_count} succession plan rows into {plan_count} plans")
+    return True
+
+def migrate_plan_versions(conn, tables):
+    """Add CONTENT_HASH / PLAN_VERSION / PREVIOUS_PLAN_ID to plan and backfill them; returns True if added
+
+    Existing plans become versions 1..n per incumbent in save order. The unique indexes keep each
+    incumbent's history a single chain: one plan per version number, and no plan superseded twice.
+    """
+    plan = tables['plan']
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({plan})")}
+    if 'CONTENT_HASH' in columns:
+        return False
+
+    conn.execute(f"ALTER TABLE {plan} ADD COLUMN CONTENT_HASH TEXT")
+    conn.execute(f"ALTER TABLE {plan} ADD COLUMN PLAN_VERSION INTEGER")
+    conn.execute(f"ALTER TABLE {plan} ADD COLUMN PREVIOUS_PLAN_ID TEXT REFERENCES {plan}(PLAN_ID)")
+    hashes = list(stored_plan_hashes(conn.execute(format_query('get_plan_contents'))))
+    conn.executemany(f"UPDATE {plan} SET CONTENT_HASH = ? WHERE PLAN_ID = ?", [(h, plan_id) for plan_id, h in hashes])
+    conn.execute(f"""
+        UPDATE {plan} SET PLAN_VERSION = v.VERSION, PREVIOUS_PLAN_ID = v.PREVIOUS_PLAN_ID
+        FROM (
+            SELECT PLAN_ID,
+                   ROW_NUMBER() OVER incumbent_plans AS VERSION,
+                   LAG(PLAN_ID) OVER incumbent_plans AS PREVIOUS_PLAN_ID
+            FROM {plan}
+            WINDOW incumbent_plans AS (PARTITION BY INCUMBENT_EMPLOYEE_ID ORDER BY CREATED_AT, rowid)
+        ) v
+        WHERE {plan}.PLAN_ID = v.PLAN_ID""")
+    conn.execute(f"CREATE UNIQUE INDEX IDX_PLAN_INCUMBENT_VERSION ON {plan}(INCUMBENT_EMPLOYEE_ID, PLAN_VERSION)")
+    conn.execute(f"CREATE UNIQUE INDEX IDX_PLAN_PREVIOUS_PLAN_ID ON {plan}(PREVIOUS_PLAN_ID)")
+    conn.execute(f"CREATE INDEX IDX_PLAN_CONTENT_HASH ON {plan}(CONTENT_HASH)")
+    return True
+
+ANALYTICS_KEY_COLUMNS = ('ROLE', 'ATTRIBUTE', 'VALUE', 'SEGMENT', 'READINESS', 'READINESS_TIMING')
+
+def plan_analytics_sources(tables):
+    """Rollup contributions per plan table: (table, key expressions, joins, join condition, plan id column)
+
+    Expressions use {row} for the contributing row. ROLE is 'incumbent' or 'successor'; ATTRIBUTE is
+    'total' (one per plan / successor line), 'skill' or 'ple'.
+    """
+    plan = tables['plan']
+    segment = "COALESCE(p.INCUMBENT_SEGMENT, '')"
+    successor_readiness = "COALESCE(s.SUCCESSOR_READINESS, ''), COALESCE(s.SUCCESSOR_FUTURE_READINESS_TIMING, '')"
+    return [
+        (plan, "'incumbent', 'total', '', COALESCE({row}.INCUMBENT_SEGMENT, ''), '', ''", None, None, "{row}.PLAN_ID"),
+        (plan, "'incumbent', 'ple', COALESCE({row}.INCUMBENT_TOP_PLE, ''), COALESCE({row}.INCUMBENT_SEGMENT, ''), '', ''", None, None,
+         "{row}.PLAN_ID"),
+        (tables['plan_skill'], f"'incumbent', 'skill', {{row}}.SKILL, {segment}, '', ''",
+         f"{plan} p", "p.PLAN_ID = {row}.PLAN_ID", "{row}.PLAN_ID"),
+        (tables['plan_successor'], f"'successor', 'total', '', {segment}, {successor_readiness.replace('s.', '{row}.')}",
+         f"{plan} p", "p.PLAN_ID = {row}.PLAN_ID", "{row}.PLAN_ID"),
+        (tables['plan_successor'], f"'successor', 'ple', COALESCE({{row}}.SUCCESSOR_TOP_PLE, ''), {segment}, {successor_readiness.replace('s.', '{row}.')}",
+         f"{plan} p", "p.PLAN_ID = {row}.PLAN_ID", "{row}.PLAN_ID"),
+        (tables['plan_successor_skill'], f"'successor', 'skill', {{row}}.SKILL, {segment}, {successor_readiness}",
+         f"{tables['plan_successor']} s, {plan} p", "s.RECORD_ID = {row}.RECORD_ID AND p.PLAN_ID = s.PLAN_ID", "s.PLAN_ID"),
+    ]
+
+def _apply_plan_analytics(conn, tables, plan_filter, params, sign):
+    """Add (sign=1) or remove (sign=-1) the contributions of the plans matching `<plan id> {plan_filter}`"""
+    counts = tables['plan_attribute_counts']
+    keys = ', '.join(ANALYTICS_KEY_COLUMNS)
+    for table, key_expressions, joins, condition, plan_column in plan_analytics_sources(tables):
+        source = f"{table} r" + (f", {joins}" if joins else '')
+        conn.execute(f"""
+            INSERT INTO {counts} ({keys}, PLAN_COUNT)
+            SELECT {key_expressions.format(row='r')}, {sign} * COUNT(*)
+            FROM {source}
+            WHERE {(condition or 'true').format(row='r')} AND {plan_column.format(row='r')} {plan_filter}
+            GROUP BY 1, 2, 3, 4, 5, 6
+            ON CONFLICT ({keys}) DO UPDATE SET PLAN_COUNT = PLAN_COUNT + excluded.PLAN_COUNT""", params)
+
+def move_plan_analytics(conn, tables, previous_plan_id, plan_id):
+    """Swap an incumbent's counted plan from their previous latest version to the new one
+
+    Call in the transaction that saved plan_id. Only each incumbent's latest plan is counted, so
+    archiving superseded versions leaves the rollups unchanged.
+    """
+    if previous_plan_id is not None:
+        _apply_plan_analytics(conn, tables, "= ?", (previous_plan_id,), -1)
+    _apply_plan_analytics(conn, tables, "= ?", (plan_id,), 1)
+
+def rebuild_plan_analytics(conn, tables):
+    """Recompute the rollup table from every incumbent's latest plan"""
+    plan = tables['plan']
+    conn.execute(f"DELETE FROM {tables['plan_attribute_counts']}")
+    _apply_plan_analytics(conn, tables, f"""IN (
+                SELECT l.PLAN_ID FROM {plan} l
+                WHERE NOT EXISTS (SELECT 1 FROM {plan} n
+                                  WHERE n.INCUMBENT_EMPLOYEE_ID = l.INCUMBENT_EMPLOYEE_ID AND n.PLAN_VERSION > l.PLAN_VERSION))""",
+        (), 1)
+
+def migrate_plan_analytics(conn, tables):
+    """Create the skill/PLE/readiness rollup table over each incumbent's latest plan; returns True if built
+
+    Saves keep it current through move_plan_analytics. Older databases maintained it with row
+    triggers that counted every plan version; those triggers are dropped and the table rebuilt.
+    """
+    counts = tables['plan_attribute_counts']
+    if _table_exists(conn, counts):
+        triggers = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name IN (?, ?, ?, ?)",
+            (tables['plan'], tables['plan_skill'], tables['plan_successor'], tables['plan_successor_skill'])
+        ) if row[0].startswith(f"{counts}_")]
+        if not triggers:
+            return False
+        for trigger in triggers:
+            conn.execute(f"DROP TRIGGER {trigger}")
+        rebuild_plan_analytics(conn, tables)
+        return True
+
+    keys = ', '.join(ANALYTICS_KEY_COLUMNS)
+    conn.execute(f"""
+        CREATE TABLE {counts} (
+            ROLE TEXT NOT NULL,
+            ATTRIBUTE TEXT NOT NULL,
+            VALUE TEXT NOT NULL,
+            SEGMENT TEXT NOT NULL,
+            READINESS TEXT NOT NULL,
+            READINESS_TIMING TEXT NOT NULL,
+            PLAN_COUNT INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY ({keys})
+        ) WITHOUT ROWID""")
+    rebuild_plan_analytics(conn, tables)
+    return True
+
+def migrate_bench_strength(conn, tables):
+    """Create the bench strength rollups and fill them from the latest plan per incumbent"""
+    if _table_exists(conn, tables['bench_strength']):
+        return False
+    create_bench_tables(conn, tables)
+    rebuild_bench_strength(conn, tables)
+    return True
+
+def migrate_plans_schema(conn, tables):
+    """All succession plans database migrations, in order"""
+    migrate_plans_db(conn, tables)
+    if migrate_plan_versions(conn, tables):
+        print("✅ Plan versions and content hashes backfilled")
+    if migrate_plan_analytics(conn, tables):
+        print("✅ Plan analytics rollups built")
+    if migrate_bench_strength(conn, tables):
+        print("✅ Bench strength rollups built")
+    if create_change_feed(conn, tables):
+        print("✅ Plan change feed created")
+
+def run_migrations():
+    """Bring both databases up to the current schema"""
+    tables = CONFIG['database']['tables']
+    conn = sqlite3.connect(CONFIG['database']['employee_db'])
+    try:
+        with conn:
+            if migrate_employee_db(conn, tables['employee'], tables['employee_fts']):
+                print("✅ Employee database migrated")
+            if create_employee_history(conn, tables['employee'], tables['employee_history']):
+                print("✅ Employee history seeded")
+    finally:
+        conn.close()
+
+    conn = sqlite3.connect(CONFIG['database']['succession_plans_db'])
+    try:
+        with conn:
+            migrate_plans_schema(conn, tables)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    run_migrations()
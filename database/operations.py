@@ -3,29 +3,181 @@ Database functions - Using fully configurable queries from config
 """
 
 import streamlit as st
-import pandas as pd
 import sqlite3
 import json
+from collections import namedtuple
+from functools import partial
 from config.loader import CONFIG
+from database.records import employee_row_factory, register_employees, lookup_employee
+from database.directory import get_directory, employee_data_version
+from database.migrations import run_migrations, insert_plan_lists, insert_successor_skills, move_plan_analytics
+from database.queries import format_query
+from database.query_check import startup_check
+from database.bench import refresh_incumbent_bench
+from database.change_feed import record_plan_change
+from database.plan_content import plan_content_hash
+from database.recommendations import refresh_successor_features
+from database.writer import GroupCommitWriter, WriterBusyError
+from database.maintenance import MaintenanceScheduler
+from database.drafts import DraftJournal
+from utils.text_match import normalize_name, soundex, bounded_edit_distance
 
-@st.cache_data(show_spinner="Searching database...")
-def search_employees(last_name):
-    """Queries the SQLite database for employees by last name."""
+@st.cache_resource(show_spinner="Preparing database...")
+def ensure_database_schema(data_version=None):
+    """Run idempotent migrations once per employee data version"""
     try:
-        conn = sqlite3.connect(CONFIG['database']['employee_db'])
-        
-        # Format query with table name and search limit
-        query = CONFIG['queries']['search_employees'].format(
-            employee_table=CONFIG['database']['tables']['employee'],
-            search_limit=CONFIG['database']['limits']['employee_search']
-        )
-        
-        df = pd.read_sql_query(query, conn, params=(f"%{last_name}%",))
+        run_migrations()
+    except Exception as e:
+        print(f"❌ Database migration failed: {e}")
+        return
+    if CONFIG.get('query_check', {}).get('on_startup'):
+        startup_check()
+
+def _query_employees(query_name, params):
+    """Run one of the configured employee queries and return Employee records"""
+    query = format_query(query_name)
+    conn = sqlite3.connect(CONFIG['database']['employee_db'])
+    try:
+        conn.row_factory = employee_row_factory
+        return conn.execute(query, params).fetchall()
+    finally:
         conn.close()
-        return df.to_dict('records')
+
+# SQLite integers are signed 64-bit; longer digit strings cannot be an EMPLOYEE_ID
+MAX_EMPLOYEE_ID = 2**63 - 1
+
+def detect_search_kind(term):
+    """Classify search input: 'id' (digits that fit an integer id), 'email' (contains @) or 'text'"""
+    term = term.strip()
+    if term.isdecimal() and term.isascii() and int(term) <= MAX_EMPLOYEE_ID:
+        return 'id'
+    if '@' in term:
+        return 'email'
+    return 'text'
+
+def _prefix_range(prefix):
+    """Bounds for an index range scan equivalent to prefix LIKE"""
+    return prefix, prefix + '\uffff'
+
+def search_employees_by_text(term):
+    """Name prefix search ("Last" or "First Last"), then position title full-text search"""
+    tokens = [normalize_name(token) for token in term.split()]
+    tokens = [token for token in tokens if token]
+    if not tokens:
+        return []
+    
+    if len(tokens) > 1:
+        rows = _query_employees('search_employees_full_name', (*_prefix_range(tokens[-1]), *_prefix_range(tokens[0])))
+    else:
+        rows = _query_employees('search_employees', _prefix_range(tokens[0]))
+    if rows:
+        return rows
+    
+    # Every word must match a title token (prefix match), e.g. "chief couns"
+    match_expression = ' '.join(f'"{token}"*' for token in tokens)
+    return _query_employees('search_employees_by_title', (match_expression,))
+
+def search_employees(term):
+    """Routes a search to the matching indexed query: employee id, work email, or name/title text."""
+    return _search_employees(term, employee_data_version())
+
+# Results are immutable Employee tuples, so they are shared across sessions instead of copied;
+# keyed on the data version so a newly loaded extract is searched right away
+@st.cache_resource(show_spinner="Searching database...", max_entries=256)
+def _search_employees(term, data_version):
+    try:
+        kind = detect_search_kind(term)
+        if kind == 'id':
+            rows = _query_employees('get_employee_by_id', (int(term.strip()),))
+        elif kind == 'email':
+            rows = _query_employees('search_employees_by_email', (term.strip(),))
+        else:
+            rows = search_employees_by_text(term)
+            if not rows:
+                rows = search_employees_fuzzy(term)
+        return tuple(register_employees(rows, data_version))
     except Exception as e:
         st.error(f"Database error: {e}")
+        return ()
+
+def search_employees_fuzzy(name):
+    """Misspelling-tolerant search: phonetic/prefix candidates ranked by bounded edit distance
+    
+    Accepts "Last" or "First Last". Only the candidate set narrowed by indexed keys is scored.
+    """
+    tokens = name.split()
+    if not tokens:
         return []
+    last_norm = normalize_name(tokens[-1])
+    first_norm = normalize_name(tokens[0]) if len(tokens) > 1 else None
+    if not last_norm:
+        return []
+    
+    limits = CONFIG['database']['limits']
+    max_distance = limits['fuzzy_max_distance']
+    last_key = soundex(tokens[-1])
+    try:
+        candidates = _query_employees(
+            'search_employees_fuzzy', (last_key, *_prefix_range(last_norm[:2]), last_norm, len(last_norm))
+        )
+    except sqlite3.OperationalError as e:
+        # Search key columns missing (database not migrated yet)
+        print(f"⚠️ Fuzzy search unavailable: {e}")
+        return []
+    
+    ranked = []
+    for employee in candidates:
+        distance = bounded_edit_distance(last_norm, normalize_name(employee.PREFERRED_NAME_LAST_NAME), max_distance)
+        phonetic = soundex(employee.PREFERRED_NAME_LAST_NAME) == last_key
+        if distance > max_distance and not phonetic:
+            continue
+        if first_norm:
+            first_distance = bounded_edit_distance(first_norm, normalize_name(employee.PREFERRED_NAME_FIRST_NAME), max_distance)
+            if first_distance > max_distance and soundex(employee.PREFERRED_NAME_FIRST_NAME) != soundex(tokens[0]):
+                continue
+            distance += first_distance
+        ranked.append((distance, employee.PREFERRED_NAME_LAST_NAME or '', employee))
+    
+    ranked.sort(key=lambda item: (item[0], item[1]))
+    return [employee for _, _, employee in ranked[:limits['employee_search']]]
+
+def get_employee(employee_id):
+    """Resolve an employee id to its Employee record via the shared directory"""
+    if employee_id is None:
+        return None
+    employee_id = int(employee_id)
+    data_version = employee_data_version()
+    employee = lookup_employee(employee_id, data_version)
+    if employee:
+        return employee
+    
+    # Process-wide columnar directory - no SQL round trip for known ids
+    employee = get_directory().get(employee_id)
+    if employee:
+        return register_employees([employee], data_version)[0]
+    
+    try:
+        rows = _query_employees('get_employee_by_id', (employee_id,))
+        return register_employees(rows, data_version)[0] if rows else None
+    except Exception as e:
+        st.error(f"Database error: {e}")
+        return None
+
+def get_employee_as_of(employee_id, as_of):
+    """Employee record as it was on a date (e.g. a plan's CREATED_AT), from the SCD2 history
+    
+    DAYS_IN_MGMT_LEVEL is not tracked historically and comes back as None. Returns None when the
+    employee has no history on or before that date.
+    """
+    if employee_id is None or not as_of:
+        return None
+    as_of = as_of.isoformat() if hasattr(as_of, 'isoformat') else str(as_of)
+    try:
+        rows = _query_employees('get_employee_as_of', (int(employee_id), as_of[:10]))
+        return rows[0] if rows else None
+    except Exception as e:
+        st.error(f"Database error: {e}")
+        return None
 
 def get_latest_incumbent_values(employee_id):
     """Get the latest incumbent plan values for prepopulation"""
@@ -33,10 +185,7 @@ def get_latest_incumbent_values(employee_id):
         conn = sqlite3.connect(CONFIG['database']['succession_plans_db'])
         cursor = conn.cursor()
         
-        # Format query with table name
-        query = CONFIG['queries']['get_latest_incumbent_values'].format(
-            succession_plans_table=CONFIG['database']['tables']['succession_plans']
-        )
+        query = format_query('get_latest_incumbent_values')
         
         cursor.execute(query, (employee_id,))
         
@@ -66,10 +215,7 @@ def get_latest_successor_values(employee_id):
         conn = sqlite3.connect(CONFIG['database']['succession_plans_db'])
         cursor = conn.cursor()
         
-        # Format query with table name
-        query = CONFIG['queries']['get_latest_successor_values'].format(
-            succession_plans_table=CONFIG['database']['tables']['succession_plans']
-        )
+        query = format_query('get_latest_successor_values')
         
         cursor.execute(query, (employee_id,))
         
@@ -92,60 +238,147 @@ def get_latest_successor_values(employee_id):
     except Exception as e:
         return None
 
-def save_succession_plan(incumbent_data, successor_data, plan_details, assessment_details):
-    """Save a succession plan record to the database with database-side UUID generation"""
+@st.cache_resource
+def get_plan_writer():
+    """Process-wide group-commit writer for the succession plans database"""
+    settings = CONFIG['database']['writer']
+    return GroupCommitWriter(
+        CONFIG['database']['succession_plans_db'],
+        queue_size=settings['queue_size'],
+        batch_window_ms=settings['batch_window_ms'],
+        max_batch=settings['max_batch'],
+        busy_timeout_ms=settings['busy_timeout_ms']
+    )
+
+@st.cache_resource
+def get_draft_journal():
+    """Process-wide journal of in-progress plans"""
+    settings = CONFIG['drafts']
+    return DraftJournal(settings['db'], ttl_hours=settings['ttl_hours'], compact_after=settings['compact_after'])
+
+@st.cache_resource
+def get_maintenance_scheduler():
+    """Process-wide background maintenance thread (None when maintenance.in_process is off)"""
+    settings = CONFIG['maintenance']
+    if not settings.get('in_process'):
+        return None
+    return MaintenanceScheduler(settings['interval_minutes'], settings['time_budget_seconds']).start()
+
+def plan_header_row(incumbent_data, plan_details):
+    """Parameters for the save_plan_header INSERT (incumbent_data is an Employee record)"""
+    return (
+        incumbent_data.EMPLOYEE_ID,
+        incumbent_data.PREFERRED_NAME_FIRST_NAME,
+        incumbent_data.PREFERRED_NAME_LAST_NAME,
+        incumbent_data.EMAIL_PRIMARY_WORK,
+        incumbent_data.POSITION_NBR_DESCRIPTION,
+        incumbent_data.MANAGEMENT_LEVEL,
+        incumbent_data.JOB_LEVEL,
+        incumbent_data.SEGMENT_HIER_LEVEL_2_NAME,
+        plan_details['critical_role'],
+        plan_details['responsibilities'],
+        plan_details['top_ple'],
+        plan_details.get('contract_end_date'),
+        plan_details.get('role_type'),
+        plan_details['scenario_plan'],
+        plan_details.get('new_position_title')
+    )
+
+def plan_successor_row(successor_data, assessment_details):
+    """Parameters for the save_plan_successor INSERT after PLAN_ID and LINE_NO"""
+    return (
+        successor_data.EMPLOYEE_ID,
+        successor_data.PREFERRED_NAME_FIRST_NAME,
+        successor_data.PREFERRED_NAME_LAST_NAME,
+        successor_data.EMAIL_PRIMARY_WORK,
+        successor_data.POSITION_NBR_DESCRIPTION,
+        successor_data.MANAGEMENT_LEVEL,
+        successor_data.JOB_LEVEL,
+        successor_data.SEGMENT_HIER_LEVEL_2_NAME,
+        assessment_details['readiness'],
+        assessment_details.get('future_readiness_timing'),
+        assessment_details.get('contract_end_date'),
+        assessment_details['strengths'],
+        assessment_details['top_ple'],
+        assessment_details['development_focus'],
+        assessment_details['talent_actions']
+    )
+
+# Outcome of a plan save: successor RECORD_IDs in order, whether the latest version already matched,
+# and whether the save was still being written when the caller stopped waiting
+PlanSaveResult = namedtuple('PlanSaveResult', ['record_ids', 'unchanged', 'pending'], defaults=(False,))
+
+def insert_plan(conn, incumbent_data, plan_details, successors):
+    """Save a plan as the incumbent's next version on conn; returns a PlanSaveResult
+    
+    A plan whose content hash matches the incumbent's latest version is not written again - the
+    existing RECORD_IDs are returned with unchanged=True. Used as the writer job for saves and by
+    the bulk importer.
+    """
+    tables = CONFIG['database']['tables']
+    content_hash = plan_content_hash(
+        incumbent_data.EMPLOYEE_ID, plan_details,
+        [(successor_data.EMPLOYEE_ID, assessment_details) for successor_data, assessment_details in successors]
+    )
+    latest = conn.execute(format_query('get_latest_plan_version'), (str(incumbent_data.EMPLOYEE_ID),)).fetchone()
+    if latest and latest[2] == content_hash:
+        return PlanSaveResult([row[0] for row in conn.execute(format_query('get_plan_record_ids'), (latest[0],))], True)
+    
+    previous_plan_id, version = (latest[0], latest[1] + 1) if latest else (None, 1)
+    header = (*plan_header_row(incumbent_data, plan_details), content_hash, version, previous_plan_id)
+    plan_id = conn.execute(format_query('save_plan_header'), header).fetchone()[0]
+    insert_plan_lists(conn, tables, plan_id, plan_details['top_skills'], plan_details['sourcing_strategy'])
+    
+    successor_query = format_query('save_plan_successor')
+    record_ids = []
+    for line_no, (successor_data, assessment_details) in enumerate(successors):
+        row = (plan_id, line_no, *plan_successor_row(successor_data, assessment_details))
+        record_id = conn.execute(successor_query, row).fetchone()[0]
+        insert_successor_skills(conn, tables, record_id, assessment_details['top_skills'])
+        record_ids.append(record_id)
+    
+    # Analytics and bench strength rollups and the change feed move in the same transaction as the plan
+    move_plan_analytics(conn, tables, previous_plan_id, plan_id)
+    refresh_incumbent_bench(conn, tables, incumbent_data.EMPLOYEE_ID)
+    record_plan_change(conn, tables, 'saved', plan_id, incumbent_data.EMPLOYEE_ID, record_ids)
+    return PlanSaveResult(record_ids, False)
+
+def save_succession_plans(incumbent_data, plan_details, successors):
+    """Save a full plan - successors is a list of (Employee, assessment) pairs - as one writer job
+    
+    Returns a PlanSaveResult - the stored RECORD_IDs with unchanged=True when nothing changed since
+    the last save, or no RECORD_IDs on failure. When the commit is not acknowledged in time the job
+    is cancelled if the writer has not started it (a failure); otherwise it will still commit and
+    the result has pending=True, so the caller must not report a failure.
+    """
+    settings = CONFIG['database']['writer']
     try:
-        conn = sqlite3.connect(CONFIG['database']['succession_plans_db'])
-        cursor = conn.cursor()
-        
-        # Format query with table name
-        query = CONFIG['queries']['save_succession_plan'].format(
-            succession_plans_table=CONFIG['database']['tables']['succession_plans']
-        )
+        job = partial(insert_plan, incumbent_data=incumbent_data, plan_details=plan_details, successors=list(successors))
+        future = get_plan_writer().submit(job, timeout=settings['submit_timeout'])
+        try:
+            result = future.result(timeout=settings['result_timeout'])
+        except TimeoutError:
+            if future.cancel():
+                st.error("The database did not get to this save in time - nothing was saved, please try again.")
+                return PlanSaveResult([], False)
+            return PlanSaveResult([], False, pending=True)
         
-        cursor.execute(query, (
-            incumbent_data['EMPLOYEE_ID'],
-            incumbent_data['PREFERRED_NAME_FIRST_NAME'],
-            incumbent_data['PREFERRED_NAME_LAST_NAME'],
-            incumbent_data['EMAIL_PRIMARY_WORK'],
-            incumbent_data['POSITION_NBR_DESCRIPTION'],
-            incumbent_data['MANAGEMENT_LEVEL'],
-            incumbent_data['JOB_LEVEL'],
-            incumbent_data['SEGMENT_HIER_LEVEL_2_NAME'],
-            plan_details['critical_role'],
-            plan_details['responsibilities'],
-            json.dumps(plan_details['top_skills']),
-            plan_details['top_ple'],
-            plan_details.get('contract_end_date'),
-            json.dumps(plan_details['sourcing_strategy']),
-            plan_details.get('role_type'),
-            plan_details['scenario_plan'],
-            plan_details.get('new_position_title'),
-            successor_data['EMPLOYEE_ID'],
-            successor_data['PREFERRED_NAME_FIRST_NAME'],
-            successor_data['PREFERRED_NAME_LAST_NAME'],
-            successor_data['EMAIL_PRIMARY_WORK'],
-            successor_data['POSITION_NBR_DESCRIPTION'],
-            successor_data['MANAGEMENT_LEVEL'],
-            successor_data['JOB_LEVEL'],
-            successor_data['SEGMENT_HIER_LEVEL_2_NAME'],
-            assessment_details['readiness'],
-            assessment_details.get('future_readiness_timing'),
-            assessment_details.get('contract_end_date'),
-            assessment_details['strengths'],
-            json.dumps(assessment_details['top_skills']),
-            assessment_details['top_ple'],
-            assessment_details['development_focus'],
-            assessment_details['talent_actions']
-        ))
-        
-        # Get the generated RECORD_ID
-        record_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        return str(record_id)  # Return as string for consistency
+        # Keep the recommendation features current without a full reload
+        if not result.unchanged:
+            refresh_successor_features([
+                (successor_data.EMPLOYEE_ID, assessment_details['top_skills'], assessment_details['top_ple'])
+                for successor_data, assessment_details in successors
+            ])
+        return result
         
+    except WriterBusyError as e:
+        st.error(str(e))
+        return PlanSaveResult([], False)
     except Exception as e:
         st.error(f"Database error: {e}")
-        return None
+        return PlanSaveResult([], False)
+
+def save_succession_plan(incumbent_data, successor_data, plan_details, assessment_details):
+    """Save a single-successor plan with database-side UUID generation; returns its RECORD_ID"""
+    record_ids = save_succession_plans(incumbent_data, plan_details, [(successor_data, assessment_details)]).record_ids
+    return record_ids[0] if record_ids else None
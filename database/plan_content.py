@@ -0,0 +1,68 @@
+"""
+Canonical plan content - a stable hash of an incumbent plan and its successor assessments
+"""
+
+import hashlib
+import json
+
+PLAN_DETAIL_KEYS = (
+    'critical_role', 'responsibilities', 'top_skills', 'top_ple', 'contract_end_date',
+    'sourcing_strategy', 'role_type', 'scenario_plan', 'new_position_title'
+)
+ASSESSMENT_KEYS = (
+    'readiness', 'future_readiness_timing', 'contract_end_date', 'strengths', 'top_skills',
+    'top_ple', 'development_focus', 'talent_actions'
+)
+
+def _decode_list(value):
+    try:
+        decoded = json.loads(value) if value else []
+    except (TypeError, ValueError):
+        return [value]
+    return decoded if isinstance(decoded, list) else [decoded]
+
+def _canonical_value(key, value):
+    if key == 'critical_role':
+        return None if value is None else bool(value)
+    if isinstance(value, (list, tuple)):
+        return [str(item) for item in value]
+    if isinstance(value, str):
+        value = value.strip()
+    return value if value not in ('', None) else None
+
+def canonical_plan(incumbent_id, plan_details, successors):
+    """Plain structure of everything a save writes; successors is a list of (employee_id, assessment)"""
+    return {
+        'incumbent': str(incumbent_id),
+        'plan': {key: _canonical_value(key, plan_details.get(key)) for key in PLAN_DETAIL_KEYS},
+        'successors': [
+            {'employee_id': str(employee_id), **{key: _canonical_value(key, assessment.get(key)) for key in ASSESSMENT_KEYS}}
+            for employee_id, assessment in successors
+        ],
+    }
+
+def plan_content_hash(incumbent_id, plan_details, successors):
+    """SHA-256 of the canonical plan - equal for plans that would store identical rows"""
+    payload = json.dumps(canonical_plan(incumbent_id, plan_details, successors), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def stored_plan_hashes(rows):
+    """Yield (PLAN_ID, content hash) from get_plan_contents rows (one row per successor line, plan order)"""
+    current_id, incumbent_id, plan_details, successors = None, None, None, []
+    for row in rows:
+        if row[0] != current_id:
+            if current_id is not None:
+                yield current_id, plan_content_hash(incumbent_id, plan_details, successors)
+            current_id, incumbent_id, successors = row[0], row[1], []
+            plan_details = {
+                'critical_role': row[2], 'responsibilities': row[3], 'top_skills': _decode_list(row[4]),
+                'top_ple': row[5], 'contract_end_date': row[6], 'sourcing_strategy': _decode_list(row[7]),
+                'role_type': row[8], 'scenario_plan': row[9], 'new_position_title': row[10],
+            }
+        successors.append((row[11], {
+            'readiness': row[12], 'future_readiness_timing': row[13], 'contract_end_date': row[14],
+            'strengths': row[15], 'top_skills': _decode_list(row[16]), 'top_ple': row[17],
+            'development_focus': row[18], 'talent_actions': row[19],
+        }))
+    if current_id is not None:
+        yield current_id, plan_content_hash(incumbent_id, plan_details, successors)
@@ -0,0 +1,164 @@
+"""
+Bulk export of succession plans to CSV or Parquet - streamed in fixed-size chunks, constant memory
+
+Rows come from the succession_plans view (original column names) in CREATED_AT order via
+IDX_CREATED_AT. Incremental exports pass the watermark returned by the previous run; only rows
+created after it, and before the current second, are exported so no late row in the same second
+is ever skipped.
+
+CLI: python -m database.plan_export <output.csv|output.parquet> [--since "2025-08-01 00:00:00"]
+                                    [--watermark-file export.watermark]
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import sys
+from config.loader import CONFIG
+from database.operations import format_query
+
+JSON_LIST_COLUMNS = ('INCUMBENT_TOP_SKILLS', 'SOURCING_STRATEGY', 'SUCCESSOR_TOP_SKILLS')
+
+def _decode_list(value):
+    if not value:
+        return []
+    try:
+        decoded = json.loads(value)
+    except (TypeError, ValueError):
+        return [value]
+    return decoded if isinstance(decoded, list) else [decoded]
+
+def iter_plan_chunks(since=None, chunk_size=None, db_path=None):
+    """Yield (columns, rows) chunks of at most chunk_size rows; list columns are decoded to lists"""
+    chunk_size = chunk_size or CONFIG['export']['chunk_size']
+    conn = sqlite3.connect(db_path or CONFIG['database']['succession_plans_db'])
+    try:
+        cursor = conn.execute(format_query('export_succession_plans'), (since or '',))
+        columns = [column[0] for column in cursor.description]
+        list_positions = [columns.index(c) for c in JSON_LIST_COLUMNS if c in columns]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            decoded = []
+            for row in rows:
+                row = list(row)
+                for position in list_positions:
+                    row[position] = _decode_list(row[position])
+                decoded.append(row)
+            yield columns, decoded
+    finally:
+        conn.close()
+
+def write_csv(chunks, output):
+    """Stream chunks to a CSV text file; list columns are joined with '; '"""
+    writer = None
+    for columns, rows in chunks:
+        if writer is None:
+            writer = csv.writer(output)
+            writer.writerow(columns)
+        for row in rows:
+            writer.writerow(['; '.join(map(str, value)) if isinstance(value, list) else value for value in row])
+
+def write_parquet(chunks, output, row_group_size=None):
+    """Stream chunks to Parquet, one row group per row_group_size rows (requires pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    row_group_size = row_group_size or CONFIG['export']['row_group_size']
+    # Everything else is written as text, as stored
+    parquet_types = {c: pa.list_(pa.string()) for c in JSON_LIST_COLUMNS}
+    parquet_types['CRITICAL_ROLE'] = pa.bool_()
+    writer = None
+    schema = None
+    pending = []
+
+    def flush():
+        nonlocal writer
+        if not pending:
+            return
+        table = pa.Table.from_pylist(pending, schema=schema)
+        if writer is None:
+            writer = pq.ParquetWriter(output, schema, compression=CONFIG['export']['parquet_compression'])
+        writer.write_table(table, row_group_size=row_group_size)
+        pending.clear()
+
+    try:
+        for columns, rows in chunks:
+            if schema is None:
+                schema = pa.schema([(c, parquet_types.get(c, pa.string())) for c in columns])
+            for row in rows:
+                record = {c: (v if c in parquet_types or v is None else str(v)) for c, v in zip(columns, row)}
+                if record.get('CRITICAL_ROLE') is not None:
+                    record['CRITICAL_ROLE'] = bool(record['CRITICAL_ROLE'])
+                pending.append(record)
+                if len(pending) >= row_group_size:
+                    flush()
+        flush()
+    finally:
+        if writer is not None:
+            writer.close()
+
+def export_plans(output, file_format='csv', since=None, chunk_size=None, row_group_size=None, db_path=None):
+    """Export plans created after `since` to a path or (text, for CSV) file object; returns {'rows', 'watermark'}
+
+    The watermark is the latest CREATED_AT exported (or `since` when nothing was new).
+    """
+    stats = {'rows': 0, 'watermark': since}
+
+    def tracked(chunks):
+        for columns, rows in chunks:
+            created_at = columns.index('CREATED_AT')
+            stats['rows'] += len(rows)
+            stats['watermark'] = rows[-1][created_at]
+            yield columns, rows
+
+    chunks = tracked(iter_plan_chunks(since, chunk_size, db_path))
+    if file_format == 'parquet':
+        write_parquet(chunks, output, row_group_size)
+    elif isinstance(output, (str, os.PathLike)):
+        with open(output, 'w', newline='', encoding='utf-8') as file:
+            write_csv(chunks, file)
+    else:
+        write_csv(chunks, output)
+    return stats
+
+def main(argv=None):
+    """CLI: python -m database.plan_export <output> [--since TS] [--watermark-file PATH]"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    options = {}
+    for flag in ('--since', '--watermark-file'):
+        if flag in argv:
+            position = argv.index(flag)
+            options[flag] = argv[position + 1]
+            del argv[position:position + 2]
+    if len(argv) != 1:
+        print("Usage: python -m database.plan_export <output.csv|output.parquet> [--since TS] [--watermark-file PATH]")
+        return 2
+
+    output = argv[0]
+    watermark_file = options.get('--watermark-file')
+    since = options.get('--since')
+    if since is None and watermark_file and os.path.exists(watermark_file):
+        with open(watermark_file, encoding='utf-8') as file:
+            since = file.read().strip() or None
+
+    file_format = 'parquet' if os.path.splitext(output)[1].lower() in ('.parquet', '.pq') else 'csv'
+    try:
+        stats = export_plans(output, file_format, since)
+    except (RuntimeError, OSError, sqlite3.Error) as e:
+        print(f"❌ Export failed: {e}")
+        return 1
+
+    if watermark_file and stats['watermark']:
+        with open(watermark_file, 'w', encoding='utf-8') as file:
+            file.write(stats['watermark'])
+    print(f"✅ Exported {stats['rows']} succession plan rows to {output} (watermark {stats['watermark']})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Bulk import of saved plan JSON files ("Download as JSON" exports from the app)
+
+Files are parsed and validated in parallel worker processes with the same rules as the entry forms
+(utils.validation). Valid plans are deduplicated by content hash - against every stored plan version
+and against each other - and inserted in batched transactions. A summary with throughput and rejects
+is printed and returned.
+
+CLI: python -m database.plan_import <folder or files...> [--dry-run] [--report report.json]
+"""
+
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config.loader import CONFIG
+from database.records import Employee, EMPLOYEE_FIELDS
+from database.plan_content import plan_content_hash
+from database.operations import format_query, insert_plan
+from database.migrations import migrate_plans_schema
+from utils.validation import validate_plan_details, validate_assessment
+
+REQUIRED_EMPLOYEE_FIELDS = ('EMPLOYEE_ID', 'PREFERRED_NAME_FIRST_NAME', 'PREFERRED_NAME_LAST_NAME')
+
+def _metadata_errors(metadata, label):
+    if not isinstance(metadata, dict):
+        return [f"{label}: missing employee metadata."]
+    return [f"{label}: missing {field}." for field in REQUIRED_EMPLOYEE_FIELDS if metadata.get(field) in (None, '')]
+
+def validate_plan_file(path):
+    """Worker: parse and validate one export file; returns a plain dict (picklable)"""
+    result = {'path': path, 'errors': []}
+    try:
+        with open(path, encoding='utf-8') as file:
+            data = json.load(file)
+    except (OSError, ValueError) as e:
+        result['errors'].append(f"Unreadable JSON: {e}")
+        return result
+
+    incumbent = (data or {}).get('incumbent') if isinstance(data, dict) else None
+    successors = (data or {}).get('successors') if isinstance(data, dict) else None
+    if not isinstance(incumbent, dict):
+        result['errors'].append("No incumbent in file.")
+        return result
+    if not successors or not isinstance(successors, list):
+        result['errors'].append("No successors in file.")
+        return result
+
+    plan_details = incumbent.get('plan_details') or {}
+    errors = _metadata_errors(incumbent.get('metadata'), "Incumbent")
+    errors += [f"Incumbent: {error}" for error in validate_plan_details(plan_details)]
+    for position, successor in enumerate(successors, 1):
+        successor = successor if isinstance(successor, dict) else {}
+        errors += _metadata_errors(successor.get('metadata'), f"Successor {position}")
+        errors += [f"Successor {position}: {error}" for error in validate_assessment(successor.get('assessment') or {})]
+    if errors:
+        result['errors'] = errors
+        return result
+
+    result.update({
+        'incumbent': incumbent['metadata'],
+        'plan_details': plan_details,
+        'successors': [(successor['metadata'], successor['assessment']) for successor in successors],
+        'hash': plan_content_hash(
+            incumbent['metadata']['EMPLOYEE_ID'], plan_details,
+            [(successor['metadata']['EMPLOYEE_ID'], successor['assessment']) for successor in successors]
+        ),
+    })
+    return result
+
+def _employee(metadata):
+    return Employee(**{field: metadata.get(field) for field in EMPLOYEE_FIELDS})
+
+def existing_plan_hashes(conn):
+    """Content hashes of every stored plan version (read from IDX_PLAN_CONTENT_HASH, no plan rows touched)"""
+    return {row[0] for row in conn.execute(format_query('get_plan_hashes'))}
+
+def collect_plan_files(paths):
+    """Expand folders into their *.json files (recursively); keep explicit file paths as given"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '**', '*.json'), recursive=True)))
+        else:
+            files.append(path)
+    return files
+
+def _insert_batch(conn, batch):
+    """Insert a batch in one transaction; returns (successor rows, [(plan, error)] for plans that failed)
+
+    Each plan runs under its own savepoint, so a malformed plan is rolled back alone and the rest of
+    the batch still commits.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        rows, failed = 0, []
+        for plan in batch:
+            conn.execute("SAVEPOINT import_plan")
+            try:
+                result = insert_plan(
+                    conn, _employee(plan['incumbent']), plan['plan_details'],
+                    [(_employee(metadata), assessment) for metadata, assessment in plan['successors']]
+                )
+            except Exception as e:
+                conn.execute("ROLLBACK TO import_plan")
+                conn.execute("RELEASE import_plan")
+                failed.append((plan, e))
+                continue
+            conn.execute("RELEASE import_plan")
+            if not result.unchanged:
+                rows += len(result.record_ids)
+        conn.execute("COMMIT")
+        return rows, failed
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+def import_plan_files(paths, db_path=None, dry_run=False, workers=None, batch_size=None):
+    """Validate, deduplicate and load plan export files; returns the summary dict"""
+    settings = CONFIG['plan_import']
+    workers = workers or settings['workers'] or os.cpu_count()
+    batch_size = batch_size or settings['batch_size']
+    started = time.time()
+    files = collect_plan_files(paths)
+    summary = {
+        'files': len(files), 'valid': 0, 'rejected': 0, 'duplicates_existing': 0, 'duplicates_in_import': 0,
+        'plans_inserted': 0, 'successor_rows_inserted': 0, 'failed_plans': 0, 'failed_batches': 0, 'rejects': [],
+    }
+
+    conn = sqlite3.connect(db_path or CONFIG['database']['succession_plans_db'], isolation_level=None)
+    try:
+        conn.execute(f"PRAGMA busy_timeout = {int(CONFIG['database']['writer']['busy_timeout_ms'])}")
+        conn.execute("BEGIN IMMEDIATE")
+        migrate_plans_schema(conn, CONFIG['database']['tables'])
+        conn.execute("COMMIT")
+        existing = existing_plan_hashes(conn)
+        imported = set()
+        hashes_loaded_at = time.time()
+
+        batch = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(validate_plan_file, files, chunksize=max(1, len(files) // (workers * 8))):
+                if result['errors']:
+                    summary['rejected'] += 1
+                    if len(summary['rejects']) < settings['max_reported_rejects']:
+                        summary['rejects'].append({'file': result['path'], 'errors': result['errors']})
+                    continue
+                summary['valid'] += 1
+                if result['hash'] in existing:
+                    summary['duplicates_existing'] += 1
+                    continue
+                if result['hash'] in imported:
+                    summary['duplicates_in_import'] += 1
+                    continue
+                imported.add(result['hash'])
+                batch.append(result)
+                if len(batch) >= batch_size:
+                    _flush(conn, batch, summary, dry_run)
+
+        _flush(conn, batch, summary, dry_run)
+    finally:
+        conn.close()
+
+    elapsed = time.time() - started
+    summary['seconds'] = round(elapsed, 2)
+    summary['hash_scan_seconds'] = round(hashes_loaded_at - started, 2)
+    summary['files_per_second'] = round(len(files) / elapsed, 1) if elapsed else None
+    summary['dry_run'] = dry_run
+    return summary
+
+def _flush(conn, batch, summary, dry_run):
+    if not batch:
+        return
+    try:
+        rows, failed = _insert_batch(conn, batch) if not dry_run else (0, [])
+        summary['successor_rows_inserted'] += rows
+        summary['plans_inserted'] += len(batch) - len(failed)
+        summary['failed_plans'] += len(failed)
+        for plan, error in failed:
+            if len(summary['rejects']) < CONFIG['plan_import']['max_reported_rejects']:
+                summary['rejects'].append({'file': plan['path'], 'errors': [f"Insert failed: {error!r}"]})
+    except sqlite3.Error as e:
+        summary['failed_batches'] += 1
+        summary['rejects'].append({'file': batch[0]['path'], 'errors': [f"Batch of {len(batch)} failed: {e}"]})
+    batch.clear()
+
+def main(argv=None):
+    """CLI: python -m database.plan_import <folder or files...> [--dry-run] [--report PATH]"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    report_path = None
+    if '--report' in argv:
+        position = argv.index('--report')
+        report_path = argv[position + 1]
+        del argv[position:position + 2]
+    dry_run = '--dry-run' in argv
+    paths = [arg for arg in argv if not arg.startswith('--')]
+    if not paths:
+        print("Usage: python -m database.plan_import <folder or files...> [--dry-run] [--report report.json]")
+        return 2
+
+    summary = import_plan_files(paths, dry_run=dry_run)
+    verb = "Would insert" if dry_run else "Inserted"
+    print(f"📂 {summary['files']} files in {summary['seconds']}s ({summary['files_per_second']} files/s)")
+    print(f"✅ {verb} {summary['plans_inserted']} plans ({summary['successor_rows_inserted']} successor rows)")
+    print(f"♻️ Skipped {summary['duplicates_existing']} already stored, {summary['duplicates_in_import']} repeated in import")
+    print(f"❌ Rejected {summary['rejected']} files, {summary['failed_plans']} failed plans, {summary['failed_batches']} failed batches")
+    for reject in summary['rejects']:
+        print(f"   {reject['file']}: {'; '.join(reject['errors'])}")
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as file:
+            json.dump(summary, file, indent=2)
+    return 0 if not (summary['rejected'] or summary['failed_plans'] or summary['failed_batches']) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Configured SQL - the queries from config.yaml with table names and limits already filled in
+"""
+
+from config.loader import CONFIG
+
+def format_query(query_name):
+    """SQL for a configured query, formatted once per config version ({<key>_table}, limits)"""
+    return CONFIG.query(query_name)
@@ -0,0 +1,292 @@
+"""
+Query-plan self-check - EXPLAIN QUERY PLAN for every configured query, checked against the
+indexes it is expected to use
+
+An edit to the SQL under queries: in config.yaml can quietly turn an index seek into a full scan.
+Each query is planned against the database it runs on; a query that stops using its expected
+index is a regression, and any other table scan is reported with the table's row count. Queries
+listed in FULL_READS read whole tables by design and are only reported.
+
+By default the CLI plans against synthetic databases built with the real migrations (a few
+thousand employees, a few hundred plans, ANALYZEd) so results do not depend on local row counts.
+Segments, levels and titles follow their distribution in the configured employee database, and
+plan values are drawn from the configured skills, PLE and form options, so ANALYZE sees the same
+value spread as live data.
+--live checks the configured databases instead; the app does the same at startup when
+query_check.on_startup is set.
+
+CLI: python -m database.query_check [--live] [--employees N] [--plans N]
+"""
+
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+from config.loader import CONFIG, skills_list, ple_list, form_options
+from database.queries import format_query
+from database.records import Employee
+from database.migrations import migrate_employee_db, migrate_plans_schema
+from database.history import create_employee_history
+from database.employee_import import EXTRACT_COLUMNS
+
+EMPLOYEE_QUERIES = (
+    'search_employees', 'search_employees_full_name', 'search_employees_by_email', 'search_employees_by_title',
+    'search_employees_fuzzy', 'get_employee_by_id', 'get_employee_as_of'
+)
+
+# Text that must appear in the plan of each query (index names, or the FTS / rowid access path)
+EXPECTED_INDEXES = {
+    'search_employees': ('IDX_EMPLOYEE_LAST_NAME_NORM',),
+    'search_employees_full_name': ('IDX_EMPLOYEE_LAST_NAME_NORM',),
+    'search_employees_by_email': ('IDX_EMPLOYEE_EMAIL',),
+    'search_employees_by_title': ('VIRTUAL TABLE INDEX', 'INTEGER PRIMARY KEY'),
+    'search_employees_fuzzy': ('IDX_EMPLOYEE_LAST_NAME_SOUNDEX', 'IDX_EMPLOYEE_LAST_NAME_NORM'),
+    'get_employee_by_id': ('IDX_EMPLOYEE_ID',),
+    'get_employee_as_of': ('IDX_EMPLOYEE_HISTORY_VALID_FROM',),
+    'get_latest_incumbent_values': ('IDX_PLAN_INCUMBENT_VERSION',),
+    'get_latest_successor_values': ('IDX_SUCCESSOR_EMPLOYEE_ID',),
+    'get_plan_attribute_counts': ('PRIMARY KEY',),
+    'export_succession_plans': ('IDX_CREATED_AT',),
+    'get_plan_changes': ('INTEGER PRIMARY KEY',),
+    'get_plan_hashes': ('IDX_PLAN_CONTENT_HASH',),
+    'get_latest_plan_version': ('IDX_PLAN_INCUMBENT_VERSION',),
+    'get_plan_record_ids': ('IDX_PLAN_SUCCESSOR_PLAN_ID',),
+    'get_archive_candidates': ('IDX_CREATED_AT', 'IDX_PLAN_INCUMBENT_VERSION'),
+}
+
+# Whole-table reads by design (history rebuilds, content hashing, small rollups)
+FULL_READS = ('get_assessment_history', 'get_bench_strength', 'get_plan_contents')
+
+# Single-row INSERTs have no plan to check
+WRITE_QUERIES = ('save_plan_header', 'save_plan_successor')
+
+def _table_aliases(query):
+    """{alias or table name: table name} for the FROM / JOIN clauses of a formatted query"""
+    aliases = {}
+    for table, alias in re.findall(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', query, re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.upper() not in ('WHERE', 'JOIN', 'ON', 'ORDER', 'GROUP', 'LIMIT', 'LEFT', 'INNER', 'WINDOW'):
+            aliases[alias] = table
+    return aliases
+
+def _table_rows(conn, table):
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    except sqlite3.Error:
+        return None
+
+def explain_query(conn, query_name):
+    """Plan one configured query on conn; returns a result dict with status ok / regression / scan / error"""
+    result = {'query': query_name, 'plan': [], 'missing': [], 'scans': [], 'status': 'ok'}
+    query = format_query(query_name).strip().rstrip(';')
+    try:
+        rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", (None,) * query.count('?')).fetchall()
+    except sqlite3.Error as e:
+        result.update(status='error', error=str(e))
+        return result
+
+    result['plan'] = [row[3] for row in rows]
+    plan_text = '\n'.join(result['plan'])
+    result['missing'] = [index for index in EXPECTED_INDEXES.get(query_name, ()) if index not in plan_text]
+    aliases = _table_aliases(query)
+    for detail in result['plan']:
+        match = re.match(r'SCAN (\w+)', detail)
+        if match and 'VIRTUAL TABLE' not in detail:
+            table = aliases.get(match.group(1), match.group(1))
+            result['scans'].append({'table': table, 'rows': _table_rows(conn, table), 'detail': detail})
+
+    if result['missing']:
+        result['status'] = 'regression'
+    elif result['scans'] and query_name not in FULL_READS:
+        result['status'] = 'scan'
+    return result
+
+def check_query_plans(employee_db=None, plans_db=None):
+    """Plan every configured read query against its database; returns the list of result dicts"""
+    results = []
+    connections = {
+        'employee': sqlite3.connect(employee_db or CONFIG['database']['employee_db']),
+        'plans': sqlite3.connect(plans_db or CONFIG['database']['succession_plans_db']),
+    }
+    try:
+        for query_name in CONFIG['queries']:
+            if query_name in WRITE_QUERIES:
+                continue
+            database = 'employee' if query_name in EMPLOYEE_QUERIES else 'plans'
+            results.append({'database': database, **explain_query(connections[database], query_name)})
+    finally:
+        for conn in connections.values():
+            conn.close()
+    return results
+
+# Employee columns sampled from the configured database's value distribution
+SAMPLED_COLUMNS = ('SEGMENT_HIER_LEVEL_2_NAME', 'MANAGEMENT_LEVEL', 'MGMT_LEVEL_GROUP', 'JOB_LEVEL', 'POSITION_NBR_DESCRIPTION')
+
+def employee_value_distributions(db_path=None):
+    """{column: ([values], [weights])} for SAMPLED_COLUMNS, read from the configured employee database
+
+    Columns that cannot be read (no database yet) get a single empty value.
+    """
+    db_path = db_path or CONFIG['database']['employee_db']
+    table = CONFIG['database']['tables']['employee']
+    distributions = {}
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            for column in SAMPLED_COLUMNS:
+                rows = conn.execute(f"SELECT {column}, COUNT(*) FROM {table} GROUP BY {column}").fetchall()
+                if rows:
+                    distributions[column] = ([value for value, _ in rows], [count for _, count in rows])
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        print(f"⚠️ Cannot read value distributions from {db_path}: {e}")
+    return {column: distributions.get(column, ([''], [1])) for column in SAMPLED_COLUMNS}
+
+def _options(name):
+    """Configured form options without the '-- Select an Option --' placeholder"""
+    return [option for option in form_options().get(name, []) if not option.startswith('--')]
+
+def build_synthetic_databases(directory, employees=3000, plans=300, seed=7):
+    """Employee and plans databases with the current schema and representative row counts
+
+    Returns (employee_db, plans_db) paths inside directory.
+    """
+    from database.operations import insert_plan
+
+    tables = CONFIG['database']['tables']
+    rng = random.Random(seed)
+    first_names = ['Alex', 'Maria', 'James', 'Priya', 'Chen', 'Fatima', 'Liam', 'Sofia', 'Noah', 'Aisha']
+    last_names = ['Smith', 'Nguyen', 'Garcia', 'Patel', 'Brown', 'Martin', 'Lee', 'Wilson', 'Khan', 'Tremblay']
+    distributions = employee_value_distributions()
+
+    def sample(column):
+        values, weights = distributions[column]
+        return rng.choices(values, weights)[0]
+
+    employee_db = os.path.join(directory, 'employee.sqlite')
+    conn = sqlite3.connect(employee_db)
+    try:
+        with conn:
+            integer_columns = ('EMPLOYEE_ID', 'DAYS_IN_MGMT_LEVEL')
+            columns = ', '.join(f"{c} {'INTEGER' if c in integer_columns else 'TEXT'}" for c in EXTRACT_COLUMNS)
+            conn.execute(f"CREATE TABLE {tables['employee']} ({columns}, FULL_NAME TEXT)")
+            rows = []
+            for employee_id in range(100000, 100000 + employees):
+                first, last = rng.choice(first_names), f"{rng.choice(last_names)}{rng.randint(0, 400)}"
+                rows.append({
+                    'FISCAL_MONTH_END_DATE': '6/28/2025', 'SEGMENT_HIER_LEVEL_2_NAME': sample('SEGMENT_HIER_LEVEL_2_NAME'),
+                    'PREFERRED_NAME_FIRST_NAME': first, 'PREFERRED_NAME_LAST_NAME': last, 'EMPLOYEE_ID': employee_id,
+                    'POSITION_REFERENCE_ID': f"P{employee_id}", 'POSITION_NBR_DESCRIPTION': sample('POSITION_NBR_DESCRIPTION'),
+                    'MANAGEMENT_LEVEL': sample('MANAGEMENT_LEVEL'), 'JOB_LEVEL': sample('JOB_LEVEL'),
+                    'DAYS_IN_MGMT_LEVEL': rng.randint(0, 3000), 'MGMT_LEVEL_GROUP': sample('MGMT_LEVEL_GROUP'),
+                    'EMAIL_PRIMARY_WORK': f"{first}.{last}@example.com".lower(),
+                })
+            conn.executemany(
+                f"INSERT INTO {tables['employee']} ({', '.join(EXTRACT_COLUMNS)}, FULL_NAME) "
+                f"VALUES ({', '.join('?' * len(EXTRACT_COLUMNS))}, ?)",
+                [(*(row[c] for c in EXTRACT_COLUMNS), f"{row['PREFERRED_NAME_FIRST_NAME']} {row['PREFERRED_NAME_LAST_NAME']}")
+                 for row in rows]
+            )
+            migrate_employee_db(conn, tables['employee'], tables['employee_fts'])
+            create_employee_history(conn, tables['employee'], tables['employee_history'])
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    def employee(row):
+        return Employee(**{field: row.get(field) for field in Employee._fields})
+
+    plans_db = os.path.join(directory, 'plans.sqlite')
+    conn = sqlite3.connect(plans_db, isolation_level=None)
+    try:
+        conn.execute("BEGIN")
+        migrate_plans_schema(conn, tables)
+        skills, ples = skills_list(), ple_list()[1:]
+        skill_count = CONFIG['validation']['max_skills_selection']
+        sourcing, scenarios, role_types = _options('sourcing_strategy'), _options('scenario_plan'), _options('role_type')
+        readiness_levels, timings = _options('readiness_level'), _options('future_readiness_timing')
+
+        def assessment():
+            readiness = rng.choice(readiness_levels)
+            return {
+                'readiness': readiness,
+                'future_readiness_timing': rng.choice(timings) if readiness == 'Ready Future' else None,
+                'strengths': 'Synthetic', 'top_skills': rng.sample(skills, skill_count), 'top_ple': rng.choice(ples),
+                'development_focus': 'Synthetic', 'talent_actions': 'Synthetic',
+            }
+
+        for number in range(plans):
+            plan_details = {
+                'critical_role': rng.random() < 0.5, 'responsibilities': f"Synthetic plan {number}",
+                'top_skills': rng.sample(skills, skill_count), 'top_ple': rng.choice(ples),
+                'sourcing_strategy': rng.sample(sourcing, rng.randint(1, 2)), 'scenario_plan': rng.choice(scenarios),
+                'role_type': rng.choice(role_types),
+            }
+            insert_plan(
+                conn, employee(rng.choice(rows)), plan_details,
+                [(employee(rng.choice(rows)), assessment()) for _ in range(rng.randint(1, 3))]
+            )
+        conn.execute("COMMIT")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return employee_db, plans_db
+
+def report_problems(results):
+    """Print regressions, unexpected scans and errors; returns the number of problems"""
+    problems = [result for result in results if result['status'] != 'ok']
+    for result in problems:
+        if result['status'] == 'error':
+            print(f"❌ {result['query']}: {result['error']}")
+        elif result['status'] == 'regression':
+            print(f"❌ {result['query']}: no longer uses {', '.join(result['missing'])}")
+        for scan in result['scans']:
+            print(f"⚠️ {result['query']}: full scan of {scan['table']} ({scan['rows']} rows) - {scan['detail']}")
+    return len(problems)
+
+def startup_check():
+    """Self-check against the live databases, printed to the server log; never raises"""
+    try:
+        return report_problems(check_query_plans())
+    except Exception as e:
+        print(f"❌ Query plan check failed: {e}")
+        return None
+
+def main(argv=None):
+    """CLI: python -m database.query_check [--live] [--employees N] [--plans N]"""
+    argv = list(sys.argv[1:] if argv is None else argv)
+    options = {}
+    for flag in ('--employees', '--plans'):
+        if flag in argv:
+            position = argv.index(flag)
+            options[flag] = int(argv[position + 1])
+            del argv[position:position + 2]
+    live = '--live' in argv
+
+    if live:
+        results = check_query_plans()
+    else:
+        with tempfile.TemporaryDirectory() as directory:
+            employee_db, plans_db = build_synthetic_databases(
+                directory, options.get('--employees', 3000), options.get('--plans', 300)
+            )
+            results = check_query_plans(employee_db, plans_db)
+
+    for result in results:
+        marker = {'ok': '✅', 'scan': '⚠️', 'regression': '❌', 'error': '❌'}[result['status']]
+        note = ' (full read by design)' if result['query'] in FULL_READS else ''
+        print(f"{marker} {result['query']} [{result['database']}]{note}")
+        for detail in result['plan']:
+            print(f"     {detail}")
+        if result['status'] == 'ok':
+            for scan in result['scans']:
+                print(f"     -> reads all of {scan['table']} ({scan['rows']} rows)")
+    problems = report_problems(results)
+    print(f"{len(results)} queries checked, {problems} problem(s)")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Successor recommendations - vectorized scoring of the whole employee population against an incumbent
+"""
+
+import re
+import sqlite3
+import threading
+import json
+import numpy as np
+import streamlit as st
+from config.loader import CONFIG, skills_list, ple_list
+from database.queries import format_query
+from database.directory import get_directory
+
+def _rank_table(categories, ranks):
+    """Map each category code to a numeric rank (-1 when unknown)"""
+    return np.asarray([ranks.get(value, -1) for value in categories], dtype=np.float32)
+
+def _job_level_rank(job_level):
+    """'E3' -> 3, 'A11' -> 11; None/unknown -> -1"""
+    match = re.search(r'(\d+)', job_level or '')
+    return int(match.group(1)) if match else -1
+
+def _decode_list(value):
+    if not value:
+        return []
+    try:
+        decoded = json.loads(value)
+        return decoded if isinstance(decoded, list) else [decoded]
+    except (TypeError, ValueError):
+        return [value]
+
+class SuccessorFeatures:
+    """Precomputed per-employee feature matrix, aligned with the employee directory rows"""
+
+    def __init__(self, directory, level_order):
+        self.directory = directory
+        self.lock = threading.Lock()
+        n = directory.size
+
+        level_ranks = {level: rank for rank, level in enumerate(level_order)}
+        level_rank = _rank_table(directory.categories['MANAGEMENT_LEVEL'], level_ranks)[directory.codes['MANAGEMENT_LEVEL']]
+        job_ranks = np.asarray([_job_level_rank(v) for v in directory.categories['JOB_LEVEL']], dtype=np.float32)
+        job_rank = job_ranks[directory.codes['JOB_LEVEL']]
+        days = np.asarray(directory.days_in_mgmt_level, dtype=np.float32)
+        days_norm = np.clip(days, 0, None) / 365.0
+
+        # Static columns: management level rank, job level rank, years in level
+        self.static = np.column_stack([level_rank, job_rank, days_norm]).astype(np.float32)
+        self.segment = np.asarray(directory.codes['SEGMENT_HIER_LEVEL_2_NAME'])
+
+        # Assessment columns (from saved plans): one-hot skills and PLE, refreshed incrementally on save
+        self.skill_index = {skill: i for i, skill in enumerate(skills_list())}
+        self.ple_index = {ple: i for i, ple in enumerate(ple_list()[1:])}
+        self.skills = np.zeros((n, len(self.skill_index)), dtype=np.float32)
+        self.ple = np.zeros((n, len(self.ple_index)), dtype=np.float32)
+
+    def skill_vector(self, skills):
+        vector = np.zeros(len(self.skill_index), dtype=np.float32)
+        for skill in skills or []:
+            if skill in self.skill_index:
+                vector[self.skill_index[skill]] = 1.0
+        return vector
+
+    def ple_vector(self, ple):
+        vector = np.zeros(len(self.ple_index), dtype=np.float32)
+        if ple in self.ple_index:
+            vector[self.ple_index[ple]] = 1.0
+        return vector
+
+    def update_assessments(self, assessments):
+        """Overwrite the skill/PLE rows for (employee_id, top_skills, top_ple) tuples"""
+        assessments = list(assessments)
+        if not assessments:
+            return
+        rows = self.directory.indices_of([a[0] for a in assessments])
+        with self.lock:
+            for row, (_, skills, ple) in zip(rows, assessments):
+                if row < 0:
+                    continue
+                self.skills[row] = self.skill_vector(skills)
+                self.ple[row] = self.ple_vector(ple)
+
+def load_assessment_history(features):
+    """Seed skill/PLE features from stored plans; later rows (by CREATED_AT) win"""
+    query = format_query('get_assessment_history')
+    conn = sqlite3.connect(CONFIG['database']['succession_plans_db'])
+    try:
+        rows = conn.execute(query).fetchall()
+    finally:
+        conn.close()
+    features.update_assessments((row[0], _decode_list(row[1]), row[2]) for row in rows)
+
+@st.cache_resource(show_spinner="Preparing successor recommendations...", max_entries=2)
+def _load_features(directory_version):
+    features = SuccessorFeatures(get_directory(), CONFIG['recommendations']['management_level_order'])
+    try:
+        load_assessment_history(features)
+    except Exception as e:
+        print(f"⚠️ Could not load assessment history for recommendations: {e}")
+    return features
+
+def get_successor_features():
+    """Shared feature matrix for the current employee directory"""
+    return _load_features(get_directory().version)
+
+def refresh_successor_features(assessments):
+    """Incrementally apply newly saved (employee_id, top_skills, top_ple) assessments"""
+    try:
+        get_successor_features().update_assessments(assessments)
+    except Exception as e:
+        print(f"⚠️ Could not refresh successor features: {e}")
+
+def score_candidates(features, incumbent_row, top_skills, top_ple):
+    """Score every employee against the incumbent in one batched pass"""
+    weights = CONFIG['recommendations']['weights']
+    level_rank, job_rank, _ = features.static[incumbent_row]
+    cand_level, cand_job, cand_years = features.static.T
+
+    # Management level: ideal candidate sits one level below the incumbent (or at the same level)
+    level_gap = level_rank - cand_level
+    level_penalty = np.where(cand_level < 0, 3.0, np.minimum(np.abs(level_gap - 0.5) - 0.5, 3.0))
+    if level_rank < 0:
+        level_penalty = np.zeros_like(level_penalty)
+    job_penalty = np.where((cand_job < 0) | (job_rank < 0), 1.0, np.minimum(np.abs(job_rank - cand_job) / 2.0, 3.0))
+    segment_match = (features.segment == features.segment[incumbent_row]).astype(np.float32)
+    years = np.minimum(cand_years, CONFIG['recommendations']['max_years_in_level']) / CONFIG['recommendations']['max_years_in_level']
+
+    with features.lock:
+        skill_overlap = features.skills @ features.skill_vector(top_skills)
+        ple_match = features.ple @ features.ple_vector(top_ple)
+
+    return (
+        - weights['management_level'] * level_penalty
+        - weights['job_level'] * job_penalty
+        + weights['segment_match'] * segment_match
+        + weights['days_in_level'] * years
+        + weights['skills_overlap'] * skill_overlap / max(CONFIG['validation']['max_skills_selection'], 1)
+        + weights['ple_match'] * ple_match
+    )
+
+def suggest_successors(incumbent_id, plan_details=None, exclude_ids=(), top_k=None):
+    """Return the top-k Employee records recommended as successors for an incumbent"""
+    directory = get_directory()
+    features = get_successor_features()
+    incumbent_row = directory.index_of(incumbent_id)
+    if incumbent_row is None:
+        return []
+
+    plan_details = plan_details or {}
+    scores = score_candidates(features, incumbent_row, plan_details.get('top_skills'), plan_details.get('top_ple'))
+
+    # Never suggest the incumbent or anyone already on the plan
+    excluded = directory.indices_of([incumbent_id, *exclude_ids])
+    scores[excluded[excluded >= 0]] = -np.inf
+
+    top_k = min(top_k or CONFIG['recommendations']['top_k'], directory.size)
+    if top_k <= 0:
+        return []
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    top = top[np.isfinite(scores[top])]
+    return directory.records(top)
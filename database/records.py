@@ -0,0 +1,69 @@
+"""
+Compact employee records - namedtuple rows and a shared, interned employee directory
+"""
+
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+
+# Column order matches the SELECT list of the employee queries in config.yaml
+EMPLOYEE_FIELDS = (
+    'SEGMENT_HIER_LEVEL_2_NAME', 'PREFERRED_NAME_FIRST_NAME',
+    'PREFERRED_NAME_LAST_NAME', 'EMPLOYEE_ID', 'POSITION_REFERENCE_ID',
+    'POSITION_NBR_DESCRIPTION', 'MANAGEMENT_LEVEL', 'JOB_LEVEL',
+    'DAYS_IN_MGMT_LEVEL', 'MGMT_LEVEL_GROUP', 'EMAIL_PRIMARY_WORK'
+)
+
+class Employee(namedtuple('Employee', EMPLOYEE_FIELDS)):
+    """Immutable employee row - a plain tuple with named fields and no per-instance dict"""
+    __slots__ = ()
+
+    @property
+    def full_name(self):
+        return f"{self.PREFERRED_NAME_FIRST_NAME} {self.PREFERRED_NAME_LAST_NAME}"
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+def employee_row_factory(cursor, row):
+    """sqlite3 row factory building Employee records with interned strings"""
+    return Employee._make(map(_intern, row))
+
+# Process-wide directory shared by every session: EMPLOYEE_ID -> Employee, for one data version.
+# Least recently used records are dropped past MAX_REGISTERED; the columnar directory holds the rest.
+MAX_REGISTERED = 10000
+_DIRECTORY = OrderedDict()
+_DIRECTORY_VERSION = None
+_DIRECTORY_LOCK = threading.Lock()
+
+def _sync_version(version):
+    """Forget every record once a newer employee extract has been loaded (call with the lock held)"""
+    global _DIRECTORY_VERSION
+    if version != _DIRECTORY_VERSION:
+        _DIRECTORY.clear()
+        _DIRECTORY_VERSION = version
+
+def register_employees(employees, version=None):
+    """Add records to the shared directory, returning the canonical instances"""
+    with _DIRECTORY_LOCK:
+        _sync_version(version)
+        registered = []
+        for employee in employees:
+            registered.append(_DIRECTORY.setdefault(employee.EMPLOYEE_ID, employee))
+            _DIRECTORY.move_to_end(employee.EMPLOYEE_ID)
+        while len(_DIRECTORY) > MAX_REGISTERED:
+            _DIRECTORY.popitem(last=False)
+        return registered
+
+def lookup_employee(employee_id, version=None):
+    """Return the directory record for an id, or None if it has not been loaded for this version"""
+    with _DIRECTORY_LOCK:
+        _sync_version(version)
+        employee = _DIRECTORY.get(employee_id)
+        if employee is not None:
+            _DIRECTORY.move_to_end(employee_id)
+        return employee
+
+def employee_to_dict(employee):
+    """Expand a record into the column dict used by JSON exports"""
+    return dict(employee._asdict()) if employee else None
@@ -0,0 +1,129 @@
+"""
+Memory-mapped employee snapshot - columnar .npy files shared by every worker through the OS page cache
+
+Layout of the snapshot directory:
+    CURRENT                     name of the published snapshot folder
+    <tag>/manifest.json         row count, category tables, source DB path, file stamp and data version
+    <tag>/<array>.npy           one file per column / index array (see directory.build_arrays)
+
+Text columns are a UTF-8 byte buffer plus an int64 offsets array, so readers map them as-is.
+"""
+
+import json
+import os
+import shutil
+import sys
+import time
+import numpy as np
+from config.loader import CONFIG
+from database.directory import (
+    EmployeeDirectory, build_arrays, load_employee_columns, employee_data_version, db_file_version
+)
+
+MANIFEST_FILE = 'manifest.json'
+CURRENT_FILE = 'CURRENT'
+SNAPSHOT_FORMAT = 1
+
+def export_snapshot(db_path, table, snapshot_dir, keep=2):
+    """Write the employee table as a new memory-mappable snapshot and publish it atomically"""
+    started = time.time()
+    version = employee_data_version(db_path)
+    # Stamp taken before the read: a write during the export makes the snapshot stale, never wrong
+    stamp = db_file_version(db_path)
+    arrays, categories = build_arrays(load_employee_columns(db_path, table))
+
+    tag = f"v{time.strftime('%Y%m%d%H%M%S')}_{os.getpid()}"
+    target = os.path.join(snapshot_dir, tag)
+    os.makedirs(target, exist_ok=False)
+
+    for name, array in arrays.items():
+        np.save(os.path.join(target, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'rows': int(len(arrays['employee_id'])),
+        'arrays': sorted(arrays),
+        'categories': categories,
+        'source_db': os.path.abspath(db_path),
+        'source_version': version,
+        'source_stamp': list(stamp) if stamp else None,
+        'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    with open(os.path.join(target, MANIFEST_FILE), 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+
+    # Publish by atomically swapping the CURRENT pointer; readers never see a half-written snapshot
+    pointer_tmp = os.path.join(snapshot_dir, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+    with open(pointer_tmp, 'w', encoding='utf-8') as file:
+        file.write(tag)
+    os.replace(pointer_tmp, os.path.join(snapshot_dir, CURRENT_FILE))
+
+    _prune_snapshots(snapshot_dir, keep)
+    print(f"✅ Exported {manifest['rows']} employees to {target} in {time.time() - started:.2f}s")
+    return target
+
+def _prune_snapshots(snapshot_dir, keep):
+    """Remove all but the newest snapshot folders (mapped files stay valid for open readers)"""
+    folders = sorted(
+        (name for name in os.listdir(snapshot_dir)
+         if os.path.isfile(os.path.join(snapshot_dir, name, MANIFEST_FILE))),
+        reverse=True
+    )
+    for name in folders[keep:]:
+        shutil.rmtree(os.path.join(snapshot_dir, name), ignore_errors=True)
+
+def _is_current(manifest, expected_version, db_path):
+    """Whether the snapshot was exported from this data version and this exact database file"""
+    if expected_version is not None and manifest.get('source_version') != expected_version:
+        return False
+    if db_path is not None:
+        stamp = db_file_version(db_path)
+        if manifest.get('source_db') != os.path.abspath(db_path) or manifest.get('source_stamp') != (list(stamp) if stamp else None):
+            return False
+    return True
+
+def load_snapshot(snapshot_dir, expected_version=None, db_path=None):
+    """Map the published snapshot zero-copy, or return None if missing or stale
+
+    Stale means exported from another data version or, when db_path is given, from another file
+    or from this file before it was last written (replaced or edited outside the importer).
+    """
+    if not snapshot_dir:
+        return None
+    try:
+        with open(os.path.join(snapshot_dir, CURRENT_FILE), encoding='utf-8') as file:
+            folder = os.path.join(snapshot_dir, file.read().strip())
+        with open(os.path.join(folder, MANIFEST_FILE), encoding='utf-8') as file:
+            manifest = json.load(file)
+    except OSError:
+        return None
+
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        return None
+    if not _is_current(manifest, expected_version, db_path):
+        print(f"⚠️ Employee snapshot in {folder} is stale - falling back to SQLite")
+        return None
+
+    try:
+        arrays = {
+            name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode='r', allow_pickle=False)
+            for name in manifest['arrays']
+        }
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not map employee snapshot {folder}: {e}")
+        return None
+    return EmployeeDirectory(arrays, manifest['categories'], version=expected_version)
+
+def main(argv=None):
+    """CLI: python -m database.snapshot [snapshot_dir]"""
+    argv = sys.argv[1:] if argv is None else argv
+    snapshot_dir = argv[0] if argv else CONFIG['database']['snapshot_dir']
+    os.makedirs(snapshot_dir, exist_ok=True)
+    export_snapshot(
+        CONFIG['database']['employee_db'],
+        CONFIG['database']['tables']['employee'],
+        snapshot_dir
+    )
+
+if __name__ == "__main__":
+    main()
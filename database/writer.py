@@ -0,0 +1,110 @@
+"""
+Single writer thread for succession_plans.sqlite - bounded queue with group commit
+
+Every save is a job (a function taking the writer connection). Jobs arriving within the batch
+window are applied in one transaction, each inside its own savepoint so one bad job does not
+sink the rest. Callers wait on a Future that resolves only after the commit; a caller that gives
+up waiting can cancel() the Future, which withdraws the job only if it has not started yet.
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+class WriterBusyError(Exception):
+    """Raised when the write queue stays full for longer than the submit timeout (back-pressure)"""
+
+class GroupCommitWriter:
+    def __init__(self, db_path, queue_size=256, batch_window_ms=5, max_batch=64, busy_timeout_ms=5000):
+        self.db_path = db_path
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max_batch
+        self.busy_timeout_ms = busy_timeout_ms
+        self._queue = queue.Queue(maxsize=queue_size)
+        self.stats = {'jobs': 0, 'batches': 0, 'failed_jobs': 0}
+        self._thread = threading.Thread(target=self._run, name="plan-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job, timeout=5.0):
+        """Queue a job and return a Future with its result; blocks while the queue is full
+
+        Cancelling the Future before the writer reaches the job skips it; once running it will commit.
+        """
+        future = Future()
+        try:
+            self._queue.put((job, future), timeout=timeout)
+        except queue.Full:
+            raise WriterBusyError("The database is busy - please try saving again in a moment.")
+        return future
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def _collect_batch(self):
+        """Block for the first job, then gather whatever arrives within the batch window"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _apply_batch(self, conn, batch):
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for job, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT job")
+                try:
+                    results.append((future, job(conn), None))
+                    conn.execute("RELEASE SAVEPOINT job")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO SAVEPOINT job")
+                    conn.execute("RELEASE SAVEPOINT job")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Acknowledge only after the commit is durable
+        self.stats['batches'] += 1
+        for future, result, error in results:
+            self.stats['jobs'] += 1
+            if error is not None:
+                self.stats['failed_jobs'] += 1
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _run(self):
+        conn = None
+        while True:
+            batch = self._collect_batch()
+            try:
+                if conn is None:
+                    conn = self._connect()
+                self._apply_batch(conn, batch)
+            except Exception as e:
+                print(f"❌ Plan writer error: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                if conn is not None:
+                    conn.close()
+                conn = None
@@ -3,7 +3,6 @@ Main app - exact copy of app_final.py but with modular imports
 """
 
 import streamlit as st
-import pandas as pd
 import sqlite3
 import json
 import random
@@ -16,13 +15,18 @@ from pptx.dml.color import RGBColor
 import io
 
 # Import from modules
-from config.loader import SKILLS_LIST, PLE_LIST, CONFIG
-from database.operations import search_employees, save_succession_plan
+from config.loader import CONFIG
+from database.directory import employee_data_version
+from database.operations import (
+    search_employees, save_succession_plans, get_employee, ensure_database_schema, get_maintenance_scheduler
+)
 from ui.components import (
-    load_css, display_sidebar_summary, display_search_box, display_search_results,
-    display_selected_incumbent_card, display_incumbent_form, display_successor_form
+    load_css, display_sidebar_summary, display_search_box, display_search_results, display_successor_suggestions,
+    display_selected_incumbent_card, display_incumbent_form, display_successor_form, display_plan_preview
+)
+from utils.helpers import (
+    force_page_reload, initialize_state, export_app_data, record_draft, discard_draft, display_name, missing_employee_ids
 )
-from utils.helpers import force_page_reload, initialize_state
 from utils.pptx_repair import auto_repair_pptx
 from pptx_gen.simple_text_generator import create_succession_plan_from_template
 
@@ -32,6 +36,10 @@ st.set_page_config(
     page_title=CONFIG['ui']['page_title']
 )
 
+# Apply schema migrations (once per employee data version)
+ensure_database_schema(employee_data_version())
+get_maintenance_scheduler()
+
 # Initialize state and load CSS
 initialize_state()
 load_css()
@@ -86,14 +94,17 @@ if st.session_state.app_data['successors'] or st.session_state.app_data['incumbe
                 for i, succ in enumerate(row_successors):
                     col = cols[i]  # Use the appropriate column
                     actual_index = row_start + i
-                    name = f"{succ['metadata']['PREFERRED_NAME_FIRST_NAME']} {succ['metadata']['PREFERRED_NAME_LAST_NAME']}"
+                    person = get_employee(succ['employee_id'])
+                    name = display_name(person, succ['employee_id'])
                     readiness = succ['assessment']['readiness']
                     assessment = succ['assessment']
                     
                     with col:
                         with st.container(border=True):
-                            st.image(f"https://rostr.disney.com/api/v2/people/{succ['metadata']['EMPLOYEE_ID']}/avatars/thumbnail_large?locale=en&token=abc4fc58f30914f6d99faa8a31f4d44c", width=80)
+                            st.image(f"https://rostr.disney.com/api/v2/people/{succ['employee_id']}/avatars/thumbnail_large?locale=en&token=abc4fc58f30914f6d99faa8a31f4d44c", width=80)
                             st.markdown(f"**{name}**")
+                            if person is None:
+                                st.caption("⚠️ No longer in the employee data - change this successor")
                             st.caption(f"Readiness: {readiness}")
                             
                             with st.expander("View Plan Details"):
@@ -136,11 +147,13 @@ if st.session_state.app_data['successors'] or st.session_state.app_data['incumbe
                             with c2:
                                 if st.button("Change Successor", key=f"remove_succ_{actual_index}", help="Select a different successor", use_container_width=True):
                                     st.session_state.app_data['successors'].pop(actual_index)
+                                    record_draft('remove_successor', index=actual_index)
                                     st.rerun()
         
         # Search for new successors - only show if incumbent exists and not editing incumbent
         if st.session_state.app_data['incumbent'] and not st.session_state.get("editing_incumbent"):
             st.info("Search for potential successors to add to the plan.")
+            display_successor_suggestions()
             display_search_box("successor")
             if st.session_state.search_term:
                 results = search_employees(st.session_state.search_term)
@@ -153,27 +166,36 @@ if st.session_state.app_data['successors'] or st.session_state.app_data['incumbe
 if st.session_state.app_data['incumbent'] and st.session_state.app_data['successors']:
     st.divider()
     
+    # Employees dropped by a newer extract cannot be saved or put on slides
+    missing_ids = missing_employee_ids(st.session_state.app_data)
+    if missing_ids:
+        st.error(f"❌ No longer in the employee data: {', '.join(map(str, missing_ids))}. "
+                 "Replace them before saving or generating the PowerPoint.")
+    else:
+        # Cheap preview of the deck, redrawn only when the plan changes
+        display_plan_preview()
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        if st.button("💾 Save to Database", type="primary", use_container_width=True):
+        if st.button("💾 Save to Database", type="primary", use_container_width=True, disabled=bool(missing_ids)):
             incumbent = st.session_state.app_data['incumbent']
             successors = st.session_state.app_data['successors']
-            success_count = 0
-            saved_record_ids = []
             
-            for successor in successors:
-                record_id = save_succession_plan(
-                    incumbent['metadata'], 
-                    successor['metadata'], 
-                    incumbent['plan_details'], 
-                    successor['assessment']
-                )
-                if record_id:
-                    success_count += 1
-                    saved_record_ids.append(record_id)
+            # One writer job per plan: all successor rows commit together
+            saved = save_succession_plans(
+                get_employee(incumbent['employee_id']),
+                incumbent['plan_details'],
+                [(get_employee(successor['employee_id']), successor['assessment']) for successor in successors]
+            )
+            saved_record_ids = saved.record_ids
+            success_count = len(saved_record_ids)
             
-            if success_count == len(successors):
+            if saved.pending:
+                st.warning("⏳ The save is taking longer than usual and will still complete - please don't save again.")
+            elif saved.unchanged:
+                st.info("ℹ️ No changes since the last saved version - nothing was saved.")
+            elif success_count == len(successors):
                 st.success(f"✅ Successfully saved {success_count} succession plan record(s) to the database!")
                 st.info(f"🆔 Record IDs: {', '.join([rid[:8] + '...' for rid in saved_record_ids[:3]])}{'...' if len(saved_record_ids) > 3 else ''}")
                 from ui.components import show_mickey_celebration
@@ -187,7 +209,7 @@ if st.session_state.app_data['incumbent'] and st.session_state.app_data['success
             st.session_state.pptx_data = None
         
         # Generate PowerPoint button (includes automatic repair)
-        if st.button("📊 Generate PowerPoint", use_container_width=True, key="generate_pptx"):
+        if st.button("📊 Generate PowerPoint", use_container_width=True, key="generate_pptx", disabled=bool(missing_ids)):
             try:
                 with st.spinner("Generating PowerPoint..."):
                     # Generate the PowerPoint
@@ -210,7 +232,9 @@ if st.session_state.app_data['incumbent'] and st.session_state.app_data['success
         
         # Download button (only shows if data exists)
         if st.session_state.pptx_data:
-            incumbent_name = st.session_state.app_data['incumbent']['metadata']['PREFERRED_NAME_LAST_NAME']
+            incumbent_id = st.session_state.app_data['incumbent']['employee_id']
+            incumbent_record = get_employee(incumbent_id)
+            incumbent_name = incumbent_record.PREFERRED_NAME_LAST_NAME if incumbent_record else incumbent_id
             st.download_button(
                 label="📥 Download PowerPoint",
                 data=st.session_state.pptx_data,
@@ -223,10 +247,11 @@ if st.session_state.app_data['incumbent'] and st.session_state.app_data['success
     col1, col2 = st.columns(2)
     with col1:
         if st.button("🔄 Start New Plan (Reload App)", use_container_width=True):
+            discard_draft()
             force_page_reload()
     with col2:
         # Keep JSON option as backup
-        final_json_string = json.dumps(st.session_state.app_data, indent=4, default=str)
+        final_json_string = json.dumps(export_app_data(st.session_state.app_data), indent=4, default=str)
         st.download_button(
             label="📄 Download as JSON", 
             data=final_json_string, 
@@ -0,0 +1,55 @@
+"""
+Plan analytics page - skill, PLE and readiness breakdowns from precomputed rollups
+"""
+
+import streamlit as st
+from config.loader import CONFIG, form_options
+from database.directory import employee_data_version
+from database.operations import ensure_database_schema
+from database.analytics import skill_counts, ple_counts, readiness_by_segment, readiness_timing_counts, segment_options
+from ui.components import load_css
+
+st.set_page_config(
+    layout=CONFIG['ui']['layout'],
+    page_title=f"{CONFIG['ui']['page_title']} - Analytics"
+)
+ensure_database_schema(employee_data_version())
+load_css()
+
+st.sidebar.image(CONFIG['ui']['logo_path'], width=CONFIG['ui']['logo_width'])
+st.title("📊 Plan Analytics")
+st.caption("Counts across each incumbent's latest plan, maintained on every save")
+
+try:
+    segments = st.sidebar.multiselect("Segment", segment_options())
+    readiness_options = [option for option in form_options().get('readiness_level', ["Ready Now", "Ready Future"]) if not option.startswith("--")]
+    readiness = st.sidebar.multiselect("Successor Readiness", readiness_options)
+
+    st.subheader("Successor Readiness by Segment")
+    st.dataframe(readiness_by_segment(segments), use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Successor Top Skills")
+        successor_skills = skill_counts('successor', segments, readiness, by='READINESS')
+        st.bar_chart(successor_skills)
+        st.dataframe(successor_skills, use_container_width=True)
+    with col2:
+        st.subheader("Incumbent Top Skills")
+        incumbent_skills = skill_counts('incumbent', segments)
+        st.bar_chart(incumbent_skills)
+        st.dataframe(incumbent_skills, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Successor Top PLE")
+        st.dataframe(ple_counts('successor', segments, readiness, by='READINESS'), use_container_width=True)
+    with col2:
+        st.subheader("Incumbent Top PLE")
+        st.dataframe(ple_counts('incumbent', segments), use_container_width=True)
+
+    st.subheader("Ready Future Timing")
+    st.dataframe(readiness_timing_counts(segments), use_container_width=True)
+
+except Exception as e:
+    st.error(f"Could not load plan analytics: {e}")
@@ -0,0 +1,58 @@
+"""
+Bench strength dashboard - Ready Now coverage per segment and management level from the bench rollups
+"""
+
+import streamlit as st
+from config.loader import CONFIG
+from database.directory import employee_data_version
+from database.operations import ensure_database_schema
+from database.analytics import load_bench_strength
+from ui.components import load_css
+
+st.set_page_config(
+    layout=CONFIG['ui']['layout'],
+    page_title=f"{CONFIG['ui']['page_title']} - Bench Strength"
+)
+ensure_database_schema(employee_data_version())
+load_css()
+
+st.sidebar.image(CONFIG['ui']['logo_path'], width=CONFIG['ui']['logo_width'])
+st.title("🪑 Bench Strength")
+st.caption("Latest plan per incumbent, updated on every save")
+
+try:
+    bench = load_bench_strength()
+    if bench.empty:
+        st.info("No succession plans saved yet.")
+    else:
+        segments = st.sidebar.multiselect("Segment", sorted(bench['SEGMENT'].unique()))
+        critical_only = st.sidebar.toggle("Critical roles only", value=True)
+        if segments:
+            bench = bench[bench['SEGMENT'].isin(segments)]
+        if critical_only:
+            bench = bench[bench['CRITICAL_ROLE']]
+
+        totals = bench[['ROLES', 'READY_NOW_NONE', 'READY_NOW_ONE', 'READY_NOW_MULTIPLE', 'READY_FUTURE_ONLY']].sum()
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Roles with Plans", int(totals['ROLES']))
+        col2.metric("No Ready Now", int(totals['READY_NOW_NONE']))
+        col3.metric("One Ready Now", int(totals['READY_NOW_ONE']))
+        col4.metric("2+ Ready Now", int(totals['READY_NOW_MULTIPLE']))
+        col5.metric("Ready Future Only", int(totals['READY_FUTURE_ONLY']))
+
+        st.subheader("By Segment and Management Level")
+        st.dataframe(
+            bench.rename(columns={
+                'SEGMENT': 'Segment', 'MANAGEMENT_LEVEL': 'Management Level', 'CRITICAL_ROLE': 'Critical Role',
+                'ROLES': 'Roles', 'READY_NOW_NONE': 'No Ready Now', 'READY_NOW_ONE': 'One Ready Now',
+                'READY_NOW_MULTIPLE': '2+ Ready Now', 'READY_FUTURE_ONLY': 'Ready Future Only'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+
+        st.subheader("Ready Now Coverage by Segment")
+        st.bar_chart(bench.groupby('SEGMENT')[['READY_NOW_NONE', 'READY_NOW_ONE', 'READY_NOW_MULTIPLE']].sum())
+
+except Exception as e:
+    st.error(f"Could not load bench strength: {e}")
@@ -0,0 +1,258 @@
+"""
+Slide preview - PNGs of the deck drawn with PIL straight from app_data, without building a PPTX
+
+The template is read once (per file version) for its geometry: text boxes with their placeholder
+runs, the successor table's columns, rows and cell text boxes, and the photo frames. Each preview
+then only substitutes the plan's text - with the generator's own placeholder rules and the same
+text fitting - and draws it. Photos are shown as initials rather than fetched.
+
+Previews are cached on the plan content hash and the employee data version (names, titles and
+levels come from the employee data), so reruns that change neither cost nothing.
+"""
+
+import io
+import os
+from functools import lru_cache
+import streamlit as st
+from PIL import Image, ImageDraw
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from config.loader import CONFIG
+from database.directory import employee_data_version
+from database.operations import get_employee
+from database.plan_content import plan_content_hash
+from pptx_gen.text_fit import EMU_PER_POINT, fit_text, font_metrics, line_height, load_font, wrap_text
+from pptx_gen.simple_text_generator import (
+    PLACEHOLDER, cell_text_box, incumbent_placeholder_text, successor_cell_text, successor_heading_text
+)
+
+TEXT_COLOR = (33, 33, 33)
+HEADER_COLOR = (0, 61, 121)
+GRID_COLOR = (180, 180, 180)
+HEADING_FILL = (235, 241, 248)
+PHOTO_FILL = (210, 215, 222)
+
+CELL_CONTENT = {1: 'strengths', 2: 'development', 3: 'actions'}
+
+def _paragraphs(text_frame, default_size):
+    """[[(run text, point size)]] for each paragraph of a text frame"""
+    return [
+        [(run.text, run.font.size.pt if run.font.size else default_size) for run in paragraph.runs]
+        for paragraph in text_frame.paragraphs
+    ]
+
+def _box(shape):
+    return (shape.left, shape.top, shape.width, shape.height)
+
+@lru_cache(maxsize=4)
+def template_geometry(template_file, mtime):
+    """Slide size and the placeholder geometry of the template's first slide (EMU throughout)"""
+    default_size = CONFIG['powerpoint']['content_font_size']
+    prs = Presentation(template_file)
+    shapes = list(prs.slides[0].shapes)
+    geometry = {'width': prs.slide_width, 'height': prs.slide_height, 'text_boxes': [], 'table': None, 'photos': []}
+
+    # Same shape positions the generator fills: the table third, photos sixth to ninth
+    photo_shapes = shapes[5:9] if len(shapes) > 8 else []
+    for shape in shapes:
+        if shape in photo_shapes:
+            geometry['photos'].append(_box(shape))
+        elif shape.has_text_frame:
+            frame = shape.text_frame
+            geometry['text_boxes'].append({
+                'box': _box(shape),
+                'insets': (frame.margin_left, frame.margin_top, frame.margin_right),
+                'paragraphs': _paragraphs(frame, default_size),
+            })
+    if len(shapes) > 2 and shapes[2].shape_type == MSO_SHAPE_TYPE.TABLE:
+        table = shapes[2].table
+        cells = {}
+        for row_idx, row in enumerate(table.rows):
+            for col_idx, cell in enumerate(row.cells):
+                width, height = table.columns[col_idx].width, row.height
+                box_width, box_height = cell_text_box(cell, width, height)
+                paragraphs = _paragraphs(cell.text_frame, default_size)
+                placeholder_sizes = [size for runs in paragraphs for text, size in runs if text.strip() == PLACEHOLDER]
+                cells[row_idx, col_idx] = {
+                    'margins': (cell.margin_left, cell.margin_top),
+                    'headers': [runs for runs in paragraphs if not any(text.strip() == PLACEHOLDER for text, _ in runs)],
+                    'box': (box_width, box_height),
+                    'content_size': placeholder_sizes[0] if placeholder_sizes else default_size,
+                }
+        geometry['table'] = {
+            'box': _box(shapes[2]),
+            'columns': [column.width for column in table.columns],
+            'rows': [row.height for row in table.rows],
+            'cells': cells,
+        }
+    return geometry
+
+@lru_cache(maxsize=64)
+def _glyphs(size_px):
+    """Rendered glyph masks for one pixel size: char -> (mask, x offset, y offset)"""
+    return load_font(CONFIG['powerpoint']['font_family']).font_variant(size=max(1, size_px)), {}
+
+def _glyph(size_px, char):
+    font, glyphs = _glyphs(size_px)
+    glyph = glyphs.get(char)
+    if glyph is None:
+        left, top, right, bottom = font.getbbox(char)
+        mask = Image.new('L', (max(1, right - left), max(1, bottom - top)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), char, fill=255, font=font)
+        glyph = glyphs[char] = (mask, left, top)
+    return glyph
+
+@lru_cache(maxsize=1)
+def _palette():
+    """Fixed PNG palette: white, an anti-aliasing ramp for each text color, and the fills"""
+    colors = []
+    for color in (TEXT_COLOR, HEADER_COLOR):
+        for step in range(16):
+            alpha = step / 15
+            colors.append(tuple(round(255 * (1 - alpha) + channel * alpha) for channel in color))
+    colors += [GRID_COLOR, HEADING_FILL, PHOTO_FILL]
+    palette = Image.new('P', (1, 1))
+    palette.putpalette([channel for color in colors for channel in color])
+    return palette
+
+class _Canvas:
+    """A slide-sized PIL image addressed in EMU
+
+    Text is drawn by pasting cached glyph masks, which is several times faster than laying out
+    every line with FreeType; glyphs are placed on the same unkerned advances the fitting measures.
+    """
+
+    def __init__(self, geometry, width_px):
+        self.scale = width_px / geometry['width']
+        self.image = Image.new('RGB', (width_px, round(geometry['height'] * self.scale)), 'white')
+        self.draw = ImageDraw.Draw(self.image)
+
+    def px(self, emu):
+        return round(emu * self.scale)
+
+    def rect(self, left, top, width, height, outline=None, fill=None):
+        self.draw.rectangle(
+            (self.px(left), self.px(top), self.px(left + width), self.px(top + height)), outline=outline, fill=fill
+        )
+
+    def text(self, text, x, y, size, color):
+        """Paste text at size points with its top-left at pixel (x, y)"""
+        size_px = round(size * EMU_PER_POINT * self.scale)
+        # Unhinted advances, exactly as fit_text measured the line
+        metrics, scale = font_metrics(CONFIG['powerpoint']['font_family']), size * self.scale
+        for char in text:
+            if not char.isspace():
+                mask, left, top = _glyph(size_px, char)
+                self.image.paste(color, (round(x) + left, y + top), mask)
+            x += metrics.char_width(char) * scale
+
+    def lines(self, lines, left, top, size, color=TEXT_COLOR, bottom=None):
+        """Draw lines at size points from top; returns the EMU y below the last line"""
+        step = line_height(size)
+        for line in lines:
+            if bottom is not None and top + step > bottom:
+                break
+            self.text(line, self.px(left), self.px(top), size, color)
+            top += step
+        return top
+
+    def png(self):
+        # A fixed palette keeps encoding to a few milliseconds; previews are redrawn, never archived
+        buffer = io.BytesIO()
+        self.image.quantize(palette=_palette(), dither=Image.Dither.NONE).save(buffer, format='PNG', compress_level=1)
+        return buffer.getvalue()
+
+def _replaced(text, incumbent, incumbent_data):
+    replacement = incumbent_placeholder_text(text, incumbent, incumbent_data, incumbent_data['plan_details'])
+    return text if replacement is None else replacement
+
+def _draw_text_box(canvas, text_box, incumbent, incumbent_data):
+    left, top, width, _ = text_box['box']
+    inset_left, inset_top, inset_right = text_box['insets']
+    text_width = width - inset_left - inset_right
+    y = top + inset_top
+    for runs in text_box['paragraphs']:
+        text = ''.join(_replaced(text, incumbent, incumbent_data) for text, _ in runs)
+        size = runs[0][1] if runs else CONFIG['powerpoint']['content_font_size']
+        y = canvas.lines(wrap_text(text, text_width, size), left + inset_left, y, size)
+
+def _draw_table(canvas, table, successor_group):
+    left, top, _, _ = table['box']
+    successors_per_slide = CONFIG['powerpoint']['successors_per_slide']
+    y = top
+    for row_idx, row_height in enumerate(table['rows']):
+        x = left
+        for col_idx, column_width in enumerate(table['columns']):
+            cell = table['cells'][row_idx, col_idx]
+            margin_left, margin_top = cell['margins']
+            fill = HEADING_FILL if row_idx == 0 else None
+            canvas.rect(x, y, column_width, row_height, outline=GRID_COLOR, fill=fill)
+            successor = successor_group[col_idx] if col_idx < min(len(successor_group), successors_per_slide) else None
+            text_left, text_top = x + margin_left, y + margin_top
+            if row_idx == 0:
+                if successor:
+                    heading = successor_heading_text(get_employee(successor['employee_id']), successor['assessment'])
+                    fitted = fit_text(heading, *cell['box'], size=cell['content_size'])
+                    canvas.lines(fitted.lines, text_left, text_top, fitted.size, HEADER_COLOR)
+            else:
+                for runs in cell['headers']:
+                    size = runs[0][1] if runs else cell['content_size']
+                    text = ''.join(text for text, _ in runs)
+                    text_top = canvas.lines(wrap_text(text, cell['box'][0], size), text_left, text_top, size, HEADER_COLOR)
+                if successor and row_idx in CELL_CONTENT:
+                    content = successor_cell_text(successor['assessment'], CELL_CONTENT[row_idx])
+                    fitted = fit_text(content, *cell['box'], size=cell['content_size'])
+                    canvas.lines(fitted.lines, text_left, text_top, fitted.size, bottom=y + row_height)
+            x += column_width
+        y += row_height
+
+def _draw_photos(canvas, photos, people):
+    for (left, top, width, height), person in zip(photos, people):
+        canvas.draw.ellipse(
+            (canvas.px(left), canvas.px(top), canvas.px(left + width), canvas.px(top + height)), fill=PHOTO_FILL
+        )
+        initials = f"{(person.PREFERRED_NAME_FIRST_NAME or ' ')[0]}{(person.PREFERRED_NAME_LAST_NAME or ' ')[0]}"
+        size = height * 0.4 / EMU_PER_POINT
+        text_width = font_metrics(CONFIG['powerpoint']['font_family']).text_width(initials) * size
+        canvas.text(
+            initials, canvas.px(left + (width - text_width) / 2), canvas.px(top + height / 2 - line_height(size) / 2), size,
+            HEADER_COLOR
+        )
+
+def render_slide(geometry, incumbent_data, successor_group, width_px):
+    """One slide of the plan as PNG bytes"""
+    canvas = _Canvas(geometry, width_px)
+    incumbent = get_employee(incumbent_data['employee_id'])
+    for text_box in geometry['text_boxes']:
+        _draw_text_box(canvas, text_box, incumbent, incumbent_data)
+    if geometry['table']:
+        _draw_table(canvas, geometry['table'], successor_group)
+    people = [incumbent] + [get_employee(successor['employee_id']) for successor in successor_group]
+    _draw_photos(canvas, geometry['photos'], people)
+    return canvas.png()
+
+def render_plan_preview(incumbent_data, successors_data, width_px=None):
+    """PNG bytes for each slide the deck would have, in order"""
+    template_file = CONFIG['powerpoint']['template_file']
+    geometry = template_geometry(template_file, os.path.getmtime(template_file))
+    width_px = width_px or CONFIG['powerpoint']['preview_width_px']
+    successors_per_slide = CONFIG['powerpoint']['successors_per_slide']
+    groups = [successors_data[i:i + successors_per_slide] for i in range(0, len(successors_data), successors_per_slide)]
+    return [render_slide(geometry, incumbent_data, group, width_px) for group in groups or [[]]]
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _cached_preview(content_hash, data_version, template_version, width_px, _incumbent_data, _successors_data):
+    # Underscored arguments are not hashed - the plan is keyed by its content hash instead
+    return render_plan_preview(_incumbent_data, _successors_data, width_px)
+
+def get_plan_preview(incumbent_data, successors_data):
+    """Slide PNGs for the plan in app_data, cached on its content hash, the data and template versions"""
+    template_file = CONFIG['powerpoint']['template_file']
+    content_hash = plan_content_hash(
+        incumbent_data['employee_id'], incumbent_data['plan_details'],
+        [(successor['employee_id'], successor['assessment']) for successor in successors_data]
+    )
+    return _cached_preview(
+        content_hash, employee_data_version(), (template_file, os.path.getmtime(template_file)), CONFIG['powerpoint']['preview_width_px'],
+        incumbent_data, successors_data
+    )
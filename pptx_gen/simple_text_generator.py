@@ -5,14 +5,28 @@ Simple PowerPoint generator - add plain text after headers, left-aligned, no exp
 from pptx import Presentation
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from pptx.enum.text import PP_ALIGN
+from pptx.util import Pt
+import copy
 import io
 from urllib.request import urlopen
 from PIL import Image, ImageDraw
 from config.loader import CONFIG
+from database.operations import get_employee
+from pptx_gen.text_fit import fit_text, line_height, wrap_text
 from utils.pptx_repair import auto_repair_pptx
+from utils.pptx_package import package_pptx
+
+PLACEHOLDER = "<This area you can add text>"
+RESPONSIBILITIES_PLACEHOLDER = (
+    "<you can edit this too> Focus on \"make or break\" descriptors (responsibilities, typical challenges, "
+    "unique capabilities, qualities, and track record required for success in the role)"
+)
 
 def create_succession_plan_from_template(incumbent_data, successors_data):
-    """Create PowerPoint with multiple slides if needed (configurable successors per slide)"""
+    """Create PowerPoint with multiple slides if needed (configurable successors per slide)
+    
+    incumbent_data and successors_data are the app_data entries holding employee ids.
+    """
     
     # Load the template
     prs = Presentation(CONFIG['powerpoint']['template_file'])
@@ -62,6 +76,8 @@ def create_succession_plan_from_template(incumbent_data, successors_data):
         return repaired_buffer
     else:
         print("⚠️ Auto-repair disabled - returning original file")
+        if CONFIG['powerpoint']['packaging'].get('enabled', True):
+            return package_pptx(pptx_buffer)
         return pptx_buffer
 
 def copy_slide_elements(source_slide, target_slide):
@@ -104,7 +120,7 @@ def copy_slide_elements(source_slide, target_slide):
 def fill_template_simple_text(slide, incumbent_data, successors_data):
     """Fill template by replacing carrot placeholders only, FORCE LEFT ALIGNMENT"""
     
-    incumbent_name = f"{incumbent_data['metadata']['PREFERRED_NAME_FIRST_NAME']} {incumbent_data['metadata']['PREFERRED_NAME_LAST_NAME']}"
+    incumbent = get_employee(incumbent_data['employee_id'])
     plan = incumbent_data['plan_details']
     
     shapes = list(slide.shapes)
@@ -118,25 +134,9 @@ def fill_template_simple_text(slide, incumbent_data, successors_data):
                 
                 for run in paragraph.runs:
                     # Only replace specific placeholders
-                    if "POSITION" == run.text.strip():
-                        run.text = incumbent_data['metadata'].get('POSITION_NBR_DESCRIPTION', 'POSITION')
-                    elif "NAME" == run.text.strip():
-                        run.text = incumbent_name
-                    elif "Insert role information summary" in run.text:
-                        # Replace with proper incumbent summary like app_final.py
-                        incumbent_summary = get_incumbent_summary_like_app_final(incumbent_data, plan)
-                        run.text = incumbent_summary
-                    elif run.text.strip() == "<you can edit this too> Focus on \"make or break\" descriptors (responsibilities, typical challenges, unique capabilities, qualities, and track record required for success in the role)":
-                        # Replace with actual responsibilities
-                        responsibilities = plan.get('responsibilities', 'Role responsibilities not specified')
-                        run.text = responsibilities
-                    elif run.text.strip() == "<This area you can add text>":
-                        # Replace individual carrot placeholders with incumbent details
-                        incumbent_details = get_incumbent_details_list(plan)
-                        if incumbent_details:
-                            run.text = incumbent_details.pop(0)
-                        else:
-                            run.text = ""  # Remove placeholder if no content
+                    replacement = incumbent_placeholder_text(run.text, incumbent, incumbent_data, plan)
+                    if replacement is not None:
+                        run.text = replacement
     
     # Fill the main table, FORCE LEFT ALIGNMENT
     if len(shapes) > 2 and shapes[2].shape_type == MSO_SHAPE_TYPE.TABLE:
@@ -146,18 +146,36 @@ def fill_template_simple_text(slide, incumbent_data, successors_data):
     photo_shapes = shapes[5:9] if len(shapes) > 8 else []
     replace_with_circular_faces(slide, photo_shapes, incumbent_data, successors_data)
 
+def incumbent_placeholder_text(text, incumbent, incumbent_data, plan):
+    """Replacement for an incumbent placeholder run's text, or None when the run is not a placeholder"""
+    if "POSITION" == text.strip():
+        return incumbent.POSITION_NBR_DESCRIPTION or 'POSITION'
+    if "NAME" == text.strip():
+        return incumbent.full_name
+    if "Insert role information summary" in text:
+        # Replace with proper incumbent summary like app_final.py
+        return get_incumbent_summary_like_app_final(incumbent_data, plan)
+    if text.strip() == RESPONSIBILITIES_PLACEHOLDER:
+        # Replace with actual responsibilities
+        return plan.get('responsibilities', 'Role responsibilities not specified')
+    if text.strip() == PLACEHOLDER:
+        # Replace individual carrot placeholders with incumbent details
+        incumbent_details = get_incumbent_details_list(plan)
+        return incumbent_details.pop(0) if incumbent_details else ""  # Remove placeholder if no content
+    return None
+
 def get_incumbent_summary_like_app_final(incumbent_data, plan):
     """Get incumbent summary exactly like app_final.py display"""
     
-    person = incumbent_data['metadata']
-    full_name = f"{person['PREFERRED_NAME_FIRST_NAME']} {person['PREFERRED_NAME_LAST_NAME']}"
+    person = get_employee(incumbent_data['employee_id'])
+    full_name = person.full_name
     
     # Build summary like app_final.py lines 552-565
     summary_parts = []
     
     # Name and position
     summary_parts.append(f"INCUMBENT: {full_name}")
-    summary_parts.append(f"Position: {person['POSITION_NBR_DESCRIPTION']}")
+    summary_parts.append(f"Position: {person.POSITION_NBR_DESCRIPTION}")
     
     # Critical role
     critical_text = "Yes" if plan.get('critical_role') else "No"
@@ -218,19 +236,13 @@ def fill_table_carrot_placeholders_only(table, successors_data):
         if col_idx >= len(table.columns):
             break
             
-        succ_name = f"{successor['metadata']['PREFERRED_NAME_FIRST_NAME']} {successor['metadata']['PREFERRED_NAME_LAST_NAME']}"
-        succ_title = successor['metadata'].get('POSITION_NBR_DESCRIPTION', '')
         assessment = successor['assessment']
         
         # Row 0: Replace template placeholders with name/title/readiness
         if len(table.rows) > 0 and col_idx < len(table.rows[0].cells):
             cell = table.rows[0].cells[col_idx]
-            readiness_text = f"{succ_name}\n{succ_title}\nReadiness: {assessment.get('readiness', '')}"
-            if assessment.get('future_readiness_timing'):
-                readiness_text += f" ({assessment.get('future_readiness_timing')})"
-            
             # Replace all content (this cell doesn't have carrot placeholders)
-            cell.text = readiness_text
+            cell.text = successor_heading_text(get_employee(successor['employee_id']), assessment)
             # FORCE LEFT ALIGNMENT on successor names/positions/readiness
             if cell.text_frame:
                 for paragraph in cell.text_frame.paragraphs:
@@ -239,17 +251,23 @@ def fill_table_carrot_placeholders_only(table, successors_data):
         # Row 1: Replace ONLY carrot placeholders in strengths section - DON'T TOUCH HEADERS
         if len(table.rows) > 1 and col_idx < len(table.rows[1].cells):
             cell = table.rows[1].cells[col_idx]
-            replace_carrot_placeholders_simple(cell, assessment, 'strengths')
+            replace_carrot_placeholders_simple(
+                cell, assessment, 'strengths', table.columns[col_idx].width, table.rows[1].height
+            )
         
         # Row 2: Replace ONLY carrot placeholders in development section - DON'T TOUCH HEADERS
         if len(table.rows) > 2 and col_idx < len(table.rows[2].cells):
             cell = table.rows[2].cells[col_idx]
-            replace_carrot_placeholders_simple(cell, assessment, 'development')
+            replace_carrot_placeholders_simple(
+                cell, assessment, 'development', table.columns[col_idx].width, table.rows[2].height
+            )
         
         # Row 3: Replace ONLY carrot placeholders in talent actions section - DON'T TOUCH HEADERS
         if len(table.rows) > 3 and col_idx < len(table.rows[3].cells):
             cell = table.rows[3].cells[col_idx]
-            replace_carrot_placeholders_simple(cell, assessment, 'actions')
+            replace_carrot_placeholders_simple(
+                cell, assessment, 'actions', table.columns[col_idx].width, table.rows[3].height
+            )
     
     # Clear unused columns - FORCE LEFT ALIGNMENT on Row 0
     max_successors = CONFIG['powerpoint']['successors_per_slide']
@@ -268,13 +286,15 @@ def fill_table_carrot_placeholders_only(table, successors_data):
                         # Just clear carrot placeholders, DON'T TOUCH HEADER ALIGNMENT
                         clear_carrot_placeholders_keep_headers(cell)
 
-def replace_carrot_placeholders_simple(cell, assessment, content_type):
-    """Replace carrot placeholders simply - FORCE LEFT ALIGNMENT"""
-    
-    if not cell.text_frame:
-        return
-    
-    # Get content based on type
+def successor_heading_text(succ_person, assessment):
+    """Name, title and readiness shown above a successor's column"""
+    readiness_text = f"{succ_person.full_name}\n{succ_person.POSITION_NBR_DESCRIPTION or ''}\nReadiness: {assessment.get('readiness', '')}"
+    if assessment.get('future_readiness_timing'):
+        readiness_text += f" ({assessment.get('future_readiness_timing')})"
+    return readiness_text
+
+def successor_cell_text(assessment, content_type):
+    """Text for one successor table cell - 'strengths', 'development' or 'actions'"""
     if content_type == 'strengths':
         content_text = assessment.get('strengths', '')
         # Add skills if we have them
@@ -282,47 +302,67 @@ def replace_carrot_placeholders_simple(cell, assessment, content_type):
         if top_skills:
             skills_text = f"Skills: {', '.join(top_skills[:3])}"
             content_text = f"{content_text}\n{skills_text}" if content_text else skills_text
-    elif content_type == 'development':
-        content_text = assessment.get('development_focus', '')
-    elif content_type == 'actions':
-        content_text = assessment.get('talent_actions', '')
-    else:
-        content_text = ""
-    
-    # Split content into lines if needed
-    if content_text:
-        # Simple line splitting - don't overcomplicate
-        lines = content_text.split('\n')
-        # If single long line, break it up
-        if len(lines) == 1 and len(content_text) > 80:
-            words = content_text.split()
-            lines = []
-            current_line = ""
-            for word in words:
-                if len(current_line + " " + word) <= 80:
-                    current_line += (" " + word) if current_line else word
-                else:
-                    if current_line:
-                        lines.append(current_line)
-                    current_line = word
-            if current_line:
-                lines.append(current_line)
-    else:
-        lines = []
-    
-    # Replace carrot placeholders with content lines - FORCE LEFT ALIGNMENT
-    line_index = 0
+        return content_text
+    if content_type == 'development':
+        return assessment.get('development_focus', '')
+    if content_type == 'actions':
+        return assessment.get('talent_actions', '')
+    return ""
+
+def _is_placeholder(run):
+    return run.text.strip() == PLACEHOLDER
+
+def cell_text_box(cell, width, height):
+    """EMU width and height left for content in a cell after its margins and header paragraphs"""
+    settings = CONFIG['powerpoint']
+    width -= cell.margin_left + cell.margin_right
+    height -= cell.margin_top + cell.margin_bottom
     for paragraph in cell.text_frame.paragraphs:
+        if any(_is_placeholder(run) for run in paragraph.runs):
+            continue
+        size = next((run.font.size.pt for run in paragraph.runs if run.font.size), settings['content_font_size'])
+        height -= len(wrap_text(paragraph.text.replace('\v', '\n'), width, size)) * line_height(size)
+    return width, max(height, 0)
+
+def replace_carrot_placeholders_simple(cell, assessment, content_type, width, height):
+    """Replace carrot placeholders with the content wrapped and shrunk to fit the cell - FORCE LEFT ALIGNMENT
+    
+    width and height are the cell's EMU size (its column width and row height).
+    """
+    
+    if not cell.text_frame:
+        return
+    
+    slots = [(paragraph, run) for paragraph in cell.text_frame.paragraphs for run in paragraph.runs if _is_placeholder(run)]
+    if not slots:
+        return
+    
+    # Start from the template's placeholder size and shrink only as far as the text needs
+    content_text = successor_cell_text(assessment, content_type)
+    box_width, box_height = cell_text_box(cell, width, height)
+    template_size = slots[0][1].font.size
+    fitted = fit_text(content_text, box_width, box_height, size=template_size.pt if template_size else None)
+    if fitted.truncated:
+        print(f"⚠️ {content_type} text cut to fit its cell at {fitted.size}pt")
+    
+    # One placeholder paragraph per line: repeat the last one for extra lines, drop unused ones
+    last_paragraph = slots[-1][0]._p
+    for _ in range(len(fitted.lines) - len(slots)):
+        new_paragraph = copy.deepcopy(last_paragraph)
+        last_paragraph.addnext(new_paragraph)
+        last_paragraph = new_paragraph
+    slots = [(paragraph, run) for paragraph in cell.text_frame.paragraphs for run in paragraph.runs if _is_placeholder(run)]
+    
+    for index, (paragraph, run) in enumerate(slots):
         # FORCE LEFT ALIGNMENT
         paragraph.alignment = PP_ALIGN.LEFT
-        
-        for run in paragraph.runs:
-            if run.text.strip() == "<This area you can add text>":
-                if line_index < len(lines):
-                    run.text = lines[line_index]
-                    line_index += 1
-                else:
-                    run.text = ""  # Remove extra placeholders
+        if index < len(fitted.lines):
+            run.text = fitted.lines[index]
+            run.font.size = Pt(fitted.size)
+        elif len(paragraph.runs) == 1 and len(cell.text_frame.paragraphs) > 1:
+            paragraph._p.getparent().remove(paragraph._p)
+        else:
+            run.text = ""  # Remove extra placeholders
 
 def clear_carrot_placeholders_keep_headers(cell):
     """Clear carrot placeholders but keep headers and FORCE LEFT ALIGNMENT"""
@@ -347,7 +387,7 @@ def replace_with_circular_faces(slide, photo_shapes, incumbent_data, successors_
     for i, shape in enumerate(photo_shapes[:len(employees)]):
         if i < len(employees):
             employee = employees[i]
-            employee_id = employee['metadata']['EMPLOYEE_ID']
+            employee_id = employee['employee_id']
             
             try:
                 # Use URL from config
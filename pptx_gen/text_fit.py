@@ -0,0 +1,207 @@
+"""
+Text fitting for slide content - word wrap and shrink-to-fit measured with real font metrics
+
+Glyph advance widths come from the TrueType font (PIL ImageFont) and are cached per font, along
+with whole-word widths. Advances scale linearly with point size, so one table serves every size:
+a box w EMU wide at s points is a box w / s wide at 1 point. Each paragraph's word widths are
+summed once into running totals, and every line break is then a bisect into them - trying
+another size during shrink-to-fit costs one bisect per line. All lengths are EMU, the unit of
+slide and table geometry.
+
+Fonts are found by family name (<family>.ttf in the system font folders) or powerpoint.font_file;
+when neither exists, powerpoint.fallback_font is measured instead. The default fallback is wider
+than Calibri, so fitted text errs on the side of fitting.
+"""
+
+from bisect import bisect_right
+from collections import namedtuple
+from functools import lru_cache
+from itertools import accumulate
+from PIL import ImageFont
+from config.loader import CONFIG
+
+EMU_PER_POINT = 12700
+ELLIPSIS = "…"
+
+# Fonts are loaded once at a large size for precise advances, then scaled down to 1 point
+REFERENCE_SIZE = 1000
+
+FittedText = namedtuple('FittedText', ['lines', 'size', 'truncated'])
+
+@lru_cache(maxsize=None)
+def load_font(family):
+    """PIL font for a family name, falling back to the configured font, then Pillow's default"""
+    settings = CONFIG['powerpoint']
+    candidates = [settings.get('font_file'), f"{family}.ttf", f"{family.lower()}.ttf", settings.get('fallback_font')]
+    for candidate in filter(None, candidates):
+        try:
+            font = ImageFont.truetype(candidate, REFERENCE_SIZE)
+            if candidate == settings.get('fallback_font'):
+                print(f"⚠️ Font {family} not found - measuring slide text with {candidate}")
+            return font
+        except OSError:
+            continue
+    print(f"⚠️ Font {family} not found - measuring slide text with Pillow's default font")
+    return ImageFont.load_default(REFERENCE_SIZE)
+
+class FontMetrics:
+    """Advance widths and line height of one font at 1 point, in EMU"""
+
+    def __init__(self, family):
+        self.family = family
+        self._font = load_font(family)
+        self._scale = EMU_PER_POINT / REFERENCE_SIZE
+        ascent, descent = self._font.getmetrics()
+        self.line_height = (ascent + descent) * self._scale
+        self._chars = {}
+        self._words = {}
+        self.spaced_widths = {}
+        self.space = self.char_width(' ')
+
+    def char_width(self, char):
+        width = self._chars.get(char)
+        if width is None:
+            width = self._chars[char] = self._font.getlength(char) * self._scale
+        return width
+
+    def text_width(self, text):
+        """Width of a word or line (advances summed, no kerning - as PowerPoint lays out table text)"""
+        width = self._words.get(text)
+        if width is None:
+            chars = self._chars
+            width = sum(chars[char] if char in chars else self.char_width(char) for char in text)
+            self._words[text] = width
+        return width
+
+    def spaced_width(self, word):
+        """Width of a word plus the space after it (the unit line breaking sums)"""
+        width = self.spaced_widths.get(word)
+        if width is None:
+            width = self.spaced_widths[word] = self.text_width(word) + self.space
+        return width
+
+@lru_cache(maxsize=None)
+def font_metrics(family):
+    return FontMetrics(family)
+
+def _measure(text, metrics):
+    """Per paragraph: (words, running end of each word plus its trailing space) at 1 point"""
+    spaced = metrics.spaced_widths
+    paragraphs = []
+    for paragraph in text.split('\n'):
+        words = paragraph.split()
+        try:
+            ends = list(accumulate(map(spaced.__getitem__, words)))
+        except KeyError:
+            ends = list(accumulate(map(metrics.spaced_width, words)))
+        paragraphs.append((words, ends))
+    return paragraphs
+
+def _break_word(word, width, metrics):
+    """Split a word wider than the line into pieces that fit"""
+    pieces, piece, piece_width = [], '', 0
+    for char in word:
+        char_width = metrics.char_width(char)
+        if piece and piece_width + char_width > width:
+            pieces.append(piece)
+            piece, piece_width = '', 0
+        piece += char
+        piece_width += char_width
+    return pieces + [piece]
+
+def _wrap(paragraphs, width, metrics, max_lines=None):
+    """Greedy wrap of measured paragraphs into lines no wider than width (1-point EMU)
+
+    Lines are (words, start, end) slices, or strings for the pieces of a broken word. Wrapping
+    stops once there are more than max_lines, when the text can no longer fit anyway.
+    """
+    space = metrics.space
+    lines = []
+    for words, ends in paragraphs:
+        if not words:
+            lines.append('')
+        start = 0
+        while start < len(words):
+            offset = ends[start - 1] if start else 0
+            # Words start..end-1 fit when the last one ends (less its trailing space) within width
+            end = bisect_right(ends, offset + width + space, start)
+            if end == start:
+                lines.extend(_break_word(words[start], width, metrics))
+                end = start + 1
+            else:
+                lines.append((words, start, end))
+            start = end
+            if max_lines is not None and len(lines) > max_lines:
+                return lines
+    return lines
+
+def _line_text(line):
+    return line if isinstance(line, str) else ' '.join(line[0][line[1]:line[2]])
+
+def wrap_text(text, width, size, family=None):
+    """Lines of text wrapped to width EMU at size points"""
+    metrics = font_metrics(family or CONFIG['powerpoint']['font_family'])
+    return [_line_text(line) for line in _wrap(_measure(text, metrics), width / size, metrics)]
+
+def line_height(size, family=None):
+    """EMU height of one line at size points"""
+    return font_metrics(family or CONFIG['powerpoint']['font_family']).line_height * size
+
+def _truncate(line, width, metrics):
+    """line cut to fit width (1-point EMU) with a trailing ellipsis"""
+    limit = width - metrics.char_width(ELLIPSIS)
+    used = 0
+    for position, char in enumerate(line):
+        used += metrics.char_width(char)
+        if used > limit:
+            line = line[:position]
+            break
+    return line.rstrip() + ELLIPSIS
+
+def fit_text(text, width, height, family=None, size=None, min_size=None):
+    """Wrap text into a width x height EMU box, shrinking the font until it fits
+
+    Sizes step down by half a point from size (powerpoint.content_font_size) to min_size
+    (powerpoint.min_font_size); the largest that fits is used. Text that still does not fit at
+    min_size is cut to the lines that do, the last ending in an ellipsis.
+    Returns FittedText(lines, size, truncated).
+    """
+    settings = CONFIG['powerpoint']
+    metrics = font_metrics(family or settings['font_family'])
+    size = size or settings['content_font_size']
+    min_size = min(min_size or settings['min_font_size'], size)
+    if not text:
+        return FittedText([], size, False)
+
+    paragraphs = _measure(text, metrics)
+
+    def layout(candidate):
+        max_lines = int(height // (metrics.line_height * candidate))
+        lines = _wrap(paragraphs, width / candidate, metrics, max_lines)
+        return lines, len(lines) <= max_lines
+
+    lines, fits = layout(size)
+    if fits:
+        return FittedText([_line_text(line) for line in lines], size, False)
+
+    # Too long even at min_size: keep the lines that fit, the last ending in an ellipsis
+    lines, fits = layout(min_size)
+    if not fits:
+        keep = max(1, int(height // (metrics.line_height * min_size)))
+        lines = [_line_text(line) for line in lines[:keep]]
+        lines[-1] = _truncate(lines[-1], width / min_size, metrics)
+        return FittedText(lines, min_size, True)
+
+    # Fit only improves as the size drops: binary search the half-point steps between the two
+    sizes = [size - 0.5 * step for step in range(1, int((size - min_size) * 2))]
+    best = FittedText([_line_text(line) for line in lines], min_size, False)
+    low, high = 0, len(sizes) - 1
+    while low <= high:
+        middle = (low + high) // 2
+        candidate_lines, fits = layout(sizes[middle])
+        if fits:
+            best = FittedText([_line_text(line) for line in candidate_lines], sizes[middle], False)
+            high = middle - 1
+        else:
+            low = middle + 1
+    return best
@@ -0,0 +1,192 @@
+"""
+HTTP API tests - the asyncio server on an ephemeral port, over copies of the repo databases
+"""
+
+import asyncio
+import http.client
+import io
+import json
+import shutil
+import socket
+import threading
+from pathlib import Path
+import pytest
+from pptx import Presentation
+from pptx.util import Inches
+from config.loader import CONFIG
+from database.migrations import run_migrations
+from api.server import start_server
+from pptx_gen.simple_text_generator import PLACEHOLDER
+
+ROOT = Path(__file__).resolve().parents[1]
+INCUMBENT_ID = 256863
+SUCCESSOR_ID = 787443
+
+PLAN_DETAILS = {
+    'critical_role': True,
+    'responsibilities': 'Leads the legal team',
+    'top_skills': CONFIG['skills'][:3],
+    'top_ple': CONFIG['ple_options'][1],
+    'sourcing_strategy': ['Build (Internal hire)'],
+    'scenario_plan': 'Direct Backfill',
+}
+ASSESSMENT = {
+    'readiness': 'Ready Now',
+    'strengths': 'Trusted advisor',
+    'top_skills': CONFIG['skills'][3:6],
+    'top_ple': CONFIG['ple_options'][2],
+    'development_focus': 'Enterprise exposure',
+    'talent_actions': 'Stretch assignment',
+}
+
+def _template(path):
+    """A one-slide template with the name, position and successor table placeholders"""
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_textbox(Inches(0.5), Inches(0.3), Inches(4), Inches(0.5)).text_frame.text = "NAME"
+    slide.shapes.add_textbox(Inches(0.5), Inches(0.8), Inches(4), Inches(0.5)).text_frame.text = "POSITION"
+    table = slide.shapes.add_table(4, 3, Inches(0.5), Inches(1.5), Inches(9), Inches(5)).table
+    for row in range(1, 4):
+        for col in range(3):
+            table.cell(row, col).text_frame.text = PLACEHOLDER
+    prs.save(path)
+    return path
+
+@pytest.fixture(scope='module')
+def api_port(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('api')
+    monkeypatch = pytest.MonkeyPatch()
+    for key in ('employee_db', 'succession_plans_db'):
+        copy = directory / Path(CONFIG['database'][key]).name
+        shutil.copy(ROOT / CONFIG['database'][key], copy)
+        monkeypatch.setitem(CONFIG['database'], key, str(copy))
+    monkeypatch.setitem(CONFIG['powerpoint'], 'template_file', str(_template(directory / 'template.pptx')))
+    run_migrations()
+
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(start_server('127.0.0.1', 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield server.sockets[0].getsockname()[1]
+    loop.call_soon_threadsafe(server.close)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    monkeypatch.undo()
+
+def request(port, method, path, body=None, headers=None):
+    """(status, headers, body bytes) for one request on a fresh connection"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        payload = json.dumps(body).encode('utf-8') if body is not None and not isinstance(body, bytes) else body
+        conn.request(method, path, body=payload, headers=headers or {})
+        response = conn.getresponse()
+        return response.status, dict(response.getheaders()), response.read()
+    finally:
+        conn.close()
+
+def request_json(port, method, path, body=None):
+    status, _, data = request(port, method, path, body)
+    return status, json.loads(data)
+
+def test_health(api_port):
+    assert request_json(api_port, 'GET', '/health') == (200, {'status': 'ok'})
+
+def test_search_by_id_and_name(api_port):
+    status, body = request_json(api_port, 'GET', f'/employees?q={INCUMBENT_ID}')
+    assert status == 200
+    assert [e['EMPLOYEE_ID'] for e in body['employees']] == [INCUMBENT_ID]
+
+    status, body = request_json(api_port, 'GET', '/employees?q=michael%20johnson')
+    assert status == 200
+    assert INCUMBENT_ID in [e['EMPLOYEE_ID'] for e in body['employees']]
+
+def test_search_digits_too_long_for_an_id(api_port):
+    assert request_json(api_port, 'GET', '/employees?q=' + '9' * 30) == (200, {'employees': []})
+
+def test_search_term_too_short(api_port):
+    assert request_json(api_port, 'GET', '/employees?q=j')[0] == 400
+
+def test_employee_lookup(api_port):
+    status, body = request_json(api_port, 'GET', f'/employees/{INCUMBENT_ID}')
+    assert status == 200 and body['PREFERRED_NAME_LAST_NAME'] == 'Johnson'
+    assert request_json(api_port, 'GET', '/employees/999999999')[0] == 404
+    assert request_json(api_port, 'GET', '/employees/abc')[0] == 400
+
+def test_save_plans_then_prepopulate(api_port):
+    plan = {
+        'incumbent_id': INCUMBENT_ID, 'plan_details': PLAN_DETAILS,
+        'successors': [{'employee_id': SUCCESSOR_ID, 'assessment': ASSESSMENT}],
+    }
+    status, body = request_json(api_port, 'POST', '/plans', {'plans': [plan]})
+    assert status == 200
+    assert len(body['results'][0]['record_ids']) == 1
+
+    status, repeat = request_json(api_port, 'POST', '/plans', {'plans': [plan]})
+    assert status == 200 and repeat['results'][0]['unchanged']
+    assert repeat['results'][0]['record_ids'] == body['results'][0]['record_ids']
+
+    status, body = request_json(api_port, 'GET', f'/prepopulate/incumbent/{INCUMBENT_ID}')
+    assert status == 200 and body['plan_details']['responsibilities'] == PLAN_DETAILS['responsibilities']
+    status, body = request_json(api_port, 'GET', f'/prepopulate/successor/{SUCCESSOR_ID}')
+    assert status == 200 and body['assessment']['strengths'] == ASSESSMENT['strengths']
+
+def test_save_plans_reports_invalid_plans(api_port):
+    valid = {
+        'incumbent_id': INCUMBENT_ID, 'plan_details': PLAN_DETAILS,
+        'successors': [{'employee_id': SUCCESSOR_ID, 'assessment': ASSESSMENT}],
+    }
+    invalid = {'incumbent_id': 999999999, 'plan_details': {}, 'successors': []}
+    status, body = request_json(api_port, 'POST', '/plans', {'plans': [valid, invalid]})
+    assert status == 400
+    assert 'record_ids' in body['results'][0]
+    assert any('incumbent_id' in error for error in body['results'][1]['errors'])
+
+@pytest.mark.parametrize('body', [b'[1, 2]', b'"plans"', b'{not json', b'{"plans": []}'])
+def test_save_plans_rejects_bad_bodies(api_port, body):
+    status, payload = request_json(api_port, 'POST', '/plans', body)
+    assert status == 400 and payload['error']
+
+def test_invalid_content_length(api_port):
+    with socket.create_connection(('127.0.0.1', api_port), timeout=10) as sock:
+        sock.sendall(b"POST /plans HTTP/1.1\r\nHost: test\r\nContent-Length: abc\r\n\r\n")
+        response = b''
+        while chunk := sock.recv(65536):
+            response += chunk
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"Content-Length" in response
+
+def test_unknown_route_and_method(api_port):
+    assert request_json(api_port, 'GET', '/nowhere')[0] == 404
+    assert request_json(api_port, 'DELETE', '/plans')[0] == 405
+
+def test_deck_streams_a_presentation(api_port):
+    body = {
+        'incumbent': {'employee_id': INCUMBENT_ID, 'plan_details': PLAN_DETAILS},
+        'successors': [{'employee_id': SUCCESSOR_ID, 'assessment': ASSESSMENT}],
+    }
+    status, headers, data = request(api_port, 'POST', '/decks', body)
+    assert status == 200
+    assert headers['Transfer-Encoding'] == 'chunked'
+    slide = Presentation(io.BytesIO(data)).slides[0]
+    assert 'Michael Johnson' in [shape.text_frame.text for shape in slide.shapes if shape.has_text_frame]
+
+def test_deck_rejects_unknown_employees(api_port):
+    body = {
+        'incumbent': {'employee_id': 999999999, 'plan_details': PLAN_DETAILS},
+        'successors': [{'employee_id': SUCCESSOR_ID, 'assessment': ASSESSMENT}],
+    }
+    assert request_json(api_port, 'POST', '/decks', body)[0] == 400
+    assert request_json(api_port, 'POST', '/decks', b'[]')[0] == 400
+
+@pytest.mark.parametrize('incumbent_details, assessment', [
+    ({'critical_role': True}, ASSESSMENT),
+    (PLAN_DETAILS, 'Ready Now'),
+    (PLAN_DETAILS, {**ASSESSMENT, 'top_skills': 'Courage'}),
+])
+def test_deck_rejects_invalid_plans(api_port, incumbent_details, assessment):
+    body = {
+        'incumbent': {'employee_id': INCUMBENT_ID, 'plan_details': incumbent_details},
+        'successors': [{'employee_id': SUCCESSOR_ID, 'assessment': assessment}],
+    }
+    status, payload = request_json(api_port, 'POST', '/decks', body)
+    assert status == 400 and payload['errors']
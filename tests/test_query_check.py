@@ -0,0 +1,35 @@
+"""
+Query plan tests - every configured query planned against the synthetic databases
+"""
+
+import pytest
+from config.loader import CONFIG
+from database.query_check import (
+    EXPECTED_INDEXES, FULL_READS, WRITE_QUERIES, build_synthetic_databases, check_query_plans
+)
+
+@pytest.fixture(scope='module')
+def results(tmp_path_factory):
+    employee_db, plans_db = build_synthetic_databases(str(tmp_path_factory.mktemp('query_check')))
+    return {result['query']: result for result in check_query_plans(employee_db, plans_db)}
+
+def test_every_read_query_is_planned(results):
+    expected = [name for name in CONFIG['queries'] if name not in WRITE_QUERIES]
+    assert sorted(results) == sorted(expected)
+    errors = {name: result['error'] for name, result in results.items() if result['status'] == 'error'}
+    assert not errors
+
+def test_expected_indexes_are_configured_queries():
+    assert not set(EXPECTED_INDEXES) - set(CONFIG['queries'])
+
+@pytest.mark.parametrize('query_name', sorted(EXPECTED_INDEXES))
+def test_query_uses_expected_index(results, query_name):
+    result = results[query_name]
+    assert not result['missing'], f"{query_name} plan no longer uses {result['missing']}: {result['plan']}"
+
+def test_no_unexpected_full_scans(results):
+    scans = {
+        name: [scan['detail'] for scan in result['scans']]
+        for name, result in results.items() if result['scans'] and name not in FULL_READS
+    }
+    assert not scans
@@ -3,11 +3,13 @@ Card display components for incumbents and successors
 """
 
 import streamlit as st
+from database.operations import get_employee
+from utils.helpers import display_name
 
 def display_selected_incumbent_card(incumbent, show_button=True):
-    person = incumbent['metadata']
+    person = get_employee(incumbent['employee_id'])
     plan = incumbent['plan_details']
-    full_name = f"{person['PREFERRED_NAME_FIRST_NAME']} {person['PREFERRED_NAME_LAST_NAME']}"
+    full_name = display_name(person, incumbent['employee_id'])
 
     if show_button:
         st.subheader("Selected Incumbent")
@@ -15,10 +17,13 @@ def display_selected_incumbent_card(incumbent, show_button=True):
     with st.container(border=True):
         c1, c2 = st.columns([1, 5])
         with c1:
-            st.image(f"https://rostr.disney.com/api/v2/people/{person['EMPLOYEE_ID']}/avatars/thumbnail_large?locale=en&token=abc4fc58f30914f6d99faa8a31f4d44c", width=100)
+            st.image(f"https://rostr.disney.com/api/v2/people/{incumbent['employee_id']}/avatars/thumbnail_large?locale=en&token=abc4fc58f30914f6d99faa8a31f4d44c", width=100)
         with c2:
             st.markdown(f"### {full_name}")
-            st.markdown(f"**Position:** {person['POSITION_NBR_DESCRIPTION']}")
+            if person:
+                st.markdown(f"**Position:** {person.POSITION_NBR_DESCRIPTION}")
+            else:
+                st.warning("⚠️ No longer in the employee data - start over to plan for another incumbent.")
             critical_text = "Yes" if plan.get('critical_role') else "No"
             st.markdown(f"**Critical Role?** `{critical_text}` | **Sourcing Strategy:** `{plan.get('sourcing_strategy', 'N/A')}`")
             st.markdown(f"**Scenario:** `{plan.get('scenario_plan', 'N/A')}`")
@@ -60,7 +65,8 @@ def display_selected_incumbent_card(incumbent, show_button=True):
         b_col1, b_col2 = st.columns(2)
         with b_col1:
             if st.button("🔄 Start Over", use_container_width=True, help="Start a new succession plan from the beginning."):
-                from utils.helpers import force_page_reload
+                from utils.helpers import force_page_reload, discard_draft
+                discard_draft()
                 force_page_reload()
         with b_col2:
             if st.button("Edit Details", use_container_width=True, help="Edit the plan details for the current incumbent."):
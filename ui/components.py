@@ -12,7 +12,7 @@ from .styling import load_css
 from .sidebar import display_sidebar_summary
 
 # Import search components
-from .search import display_search_box, display_search_results
+from .search import display_search_box, display_search_results, display_successor_suggestions
 
 # Import card components
 from .cards import display_selected_incumbent_card
@@ -20,6 +20,9 @@ from .cards import display_selected_incumbent_card
 # Import form components
 from .forms import display_incumbent_form, display_successor_form
 
+# Import slide preview
+from .preview import display_plan_preview
+
 # Re-export all functions for backward compatibility
 __all__ = [
     'show_mickey_celebration',
@@ -28,7 +31,9 @@ __all__ = [
     'display_sidebar_summary',
     'display_search_box',
     'display_search_results',
+    'display_successor_suggestions',
     'display_selected_incumbent_card',
     'display_incumbent_form',
-    'display_successor_form'
+    'display_successor_form',
+    'display_plan_preview'
 ]
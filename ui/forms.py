@@ -5,24 +5,38 @@ Form components for incumbent and successor data entry
 import streamlit as st
 import datetime
 import json
-from config.loader import SKILLS_LIST, PLE_LIST, FORM_OPTIONS
-from database.operations import get_latest_incumbent_values, get_latest_successor_values
+from config.loader import skills_list, ple_list, form_options
+from database.operations import get_latest_incumbent_values, get_latest_successor_values, get_employee
+from utils.validation import validate_plan_details, validate_assessment
+from utils.helpers import record_draft
+from database.drafts import changed_fields
 
 @st.dialog("Incumbent Plan Details", width="large")
 def display_incumbent_form():
     is_editing = st.session_state.get("editing_incumbent", False)
     
     if is_editing:
-        person = st.session_state.app_data['incumbent']['metadata']
+        person = get_employee(st.session_state.app_data['incumbent']['employee_id'])
+    else:
+        person = get_employee(st.session_state.selected_person)
+    if person is None:
+        # Removed by a newer employee extract since it was picked (or since the draft was saved)
+        st.error("❌ This employee is no longer in the employee data.")
+        st.session_state.selected_person = None
+        st.session_state.editing_incumbent = False
+        return
+    # Option lists from the current config, so edits to config.yaml show up on the next open
+    skills, ple_options, options = skills_list(), ple_list(), form_options()
+    
+    if is_editing:
         plan_details = st.session_state.app_data['incumbent']['plan_details']
-        st.subheader(f"✏️ Edit: {person['PREFERRED_NAME_FIRST_NAME']} {person['PREFERRED_NAME_LAST_NAME']}")
+        st.subheader(f"✏️ Edit: {person.full_name}")
     else: 
-        person = st.session_state.selected_person
         plan_details = {}
-        st.subheader(f"📝 New Plan: {person['PREFERRED_NAME_FIRST_NAME']} {person['PREFERRED_NAME_LAST_NAME']}")
+        st.subheader(f"📝 New Plan: {person.full_name}")
         
         # Try to get previous values for this person
-        previous_values = get_latest_incumbent_values(person['EMPLOYEE_ID'])
+        previous_values = get_latest_incumbent_values(person.EMPLOYEE_ID)
         if previous_values:
             st.info(f"💡 Found previous submission. Fields pre-filled with latest values.")
             plan_details = previous_values
@@ -36,7 +50,7 @@ def display_incumbent_form():
     contract_end_date_val = datetime.datetime.strptime(contract_end_date_str, "%Y-%m-%d").date() if contract_end_date_str else None
     
     # Use session state to manage contract date clearing
-    contract_date_key = f"inc_contract_date_{person['EMPLOYEE_ID']}_{is_editing}"
+    contract_date_key = f"inc_contract_date_{person.EMPLOYEE_ID}_{is_editing}"
     if contract_date_key not in st.session_state:
         st.session_state[contract_date_key] = contract_end_date_val
     
@@ -59,19 +73,19 @@ def display_incumbent_form():
     responsibilities = st.text_area("Role Responsibilities & Key Attributes:", value=plan_details.get("responsibilities", ""))
     
     # 4. Top Demonstrated People Leader Expectation
-    top_ple = st.selectbox("Top Demonstrated People Leader Expectation:", PLE_LIST, index=PLE_LIST.index(plan_details.get("top_ple")) if plan_details.get("top_ple") in PLE_LIST else 0)
+    top_ple = st.selectbox("Top Demonstrated People Leader Expectation:", ple_options, index=ple_options.index(plan_details.get("top_ple")) if plan_details.get("top_ple") in ple_options else 0)
     
     # 5. Top Leadership Skills (select three)
     # Safety check for top_skills
     default_skills = plan_details.get("top_skills", [])
     if isinstance(default_skills, str):
         default_skills = [skill.strip() for skill in default_skills.split(',') if skill.strip()]
-    valid_default_skills = [skill for skill in default_skills if skill in SKILLS_LIST]
+    valid_default_skills = [skill for skill in default_skills if skill in skills]
     
-    top_skills = st.multiselect("Top Leadership Skills (select three):", SKILLS_LIST, default=valid_default_skills, max_selections=3)
+    top_skills = st.multiselect("Top Leadership Skills (select three):", skills, default=valid_default_skills, max_selections=3)
     
     # 6. Talent Sourcing Strategy (multiselect)
-    sourcing_options = FORM_OPTIONS.get('sourcing_strategy', ["Build (Internal hire)", "External"])
+    sourcing_options = options.get('sourcing_strategy', ["Build (Internal hire)", "External"])
     # Handle existing data - convert string to list if needed
     default_sourcing = plan_details.get("sourcing_strategy", [])
     if isinstance(default_sourcing, str):
@@ -88,11 +102,11 @@ def display_incumbent_form():
     sourcing_strategy = st.multiselect("Talent Sourcing Strategy:", sourcing_options, default=valid_default_sourcing)
     
     # 7. Scenario Plan
-    scenario_options = FORM_OPTIONS.get('scenario_plan', ["-- Select an Option --", "Direct Backfill", "Split Position/New Position"])
+    scenario_options = options.get('scenario_plan', ["-- Select an Option --", "Direct Backfill", "Split Position/New Position"])
     scenario_plan = st.selectbox("Scenario Plan:", scenario_options, index=scenario_options.index(plan_details.get("scenario_plan")) if plan_details.get("scenario_plan") in scenario_options else 0)
     
     # 8. Type of Role (optional)
-    role_type_options = FORM_OPTIONS.get('role_type', ["Not Applicable", "Succession Plan", "External"])
+    role_type_options = options.get('role_type', ["Not Applicable", "Succession Plan", "External"])
     role_type = st.selectbox("Type of Role (optional):", role_type_options, index=role_type_options.index(plan_details.get("role_type")) if plan_details.get("role_type") in role_type_options else 0)
     
     # New Position Title (conditional)
@@ -104,32 +118,30 @@ def display_incumbent_form():
     col1, col2 = st.columns(2)
     with col1:
         button_label = "Update Plan" if is_editing else "Save Plan"
-        if st.button(button_label, type="primary", use_container_width=True, key=f"inc_submit_{person['EMPLOYEE_ID']}_{is_editing}"):
-            errors = []
-            if critical_role is None: errors.append("Please select if this is a Critical Role.")
-            if not responsibilities: errors.append("Please enter Role Responsibilities.")
-            if not top_skills: errors.append("Please select exactly 3 Top Leadership Skills.")
-            elif len(top_skills) != 3: errors.append("Please select exactly 3 Top Leadership Skills.")
-            if top_ple == "-- Select an Option --": errors.append("Please select a Top Demonstrated People Leader Expectation.")
-            if not sourcing_strategy: errors.append("Please select at least one Talent Sourcing Strategy.")
-            if scenario_plan == "-- Select an Option --": errors.append("Please select a Scenario Plan.")
+        if st.button(button_label, type="primary", use_container_width=True, key=f"inc_submit_{person.EMPLOYEE_ID}_{is_editing}"):
+            updated_plan = {
+                "critical_role": None if critical_role is None else critical_role == "Yes",
+                "responsibilities": responsibilities,
+                "top_skills": top_skills,
+                "top_ple": top_ple,
+                "contract_end_date": contract_end_date.strftime("%Y-%m-%d") if contract_end_date else None,
+                "sourcing_strategy": sourcing_strategy,  # Now stores as list
+                "role_type": role_type if role_type != "Not Applicable" else None,
+                "scenario_plan": scenario_plan,
+                "new_position_title": new_position_title if scenario_plan == 'Split Position/New Position' else None
+            }
+            errors = validate_plan_details(updated_plan)
             
             if errors:
                 for error in errors:
                     st.error(error)
             else:
-                updated_plan = {
-                    "critical_role": True if critical_role == "Yes" else False,
-                    "responsibilities": responsibilities,
-                    "top_skills": top_skills,
-                    "top_ple": top_ple,
-                    "contract_end_date": contract_end_date.strftime("%Y-%m-%d") if contract_end_date else None,
-                    "sourcing_strategy": sourcing_strategy,  # Now stores as list
-                    "role_type": role_type if role_type != "Not Applicable" else None,
-                    "scenario_plan": scenario_plan,
-                    "new_position_title": new_position_title if scenario_plan == 'Split Position/New Position' else None
-                }
-                st.session_state.app_data['incumbent'] = {"metadata": person, "plan_details": updated_plan}
+                previous = st.session_state.app_data['incumbent']
+                st.session_state.app_data['incumbent'] = {"employee_id": person.EMPLOYEE_ID, "plan_details": updated_plan}
+                if previous and previous['employee_id'] == person.EMPLOYEE_ID:
+                    record_draft('update_incumbent', changes=changed_fields(previous['plan_details'], updated_plan))
+                else:
+                    record_draft('set_incumbent', employee_id=person.EMPLOYEE_ID, plan_details=updated_plan)
                 
                 # Clean up session state
                 if contract_date_key in st.session_state:
@@ -141,7 +153,7 @@ def display_incumbent_form():
                 st.rerun()
     
     with col2:
-        if st.button("Cancel", use_container_width=True, key=f"inc_cancel_{person['EMPLOYEE_ID']}_{is_editing}"):
+        if st.button("Cancel", use_container_width=True, key=f"inc_cancel_{person.EMPLOYEE_ID}_{is_editing}"):
             # Clean up session state
             if contract_date_key in st.session_state:
                 del st.session_state[contract_date_key]
@@ -155,16 +167,27 @@ def display_successor_form():
     is_editing = st.session_state.editing_successor_index is not None
     
     if is_editing:
-        person = st.session_state.app_data['successors'][st.session_state.editing_successor_index]['metadata']
+        person = get_employee(st.session_state.app_data['successors'][st.session_state.editing_successor_index]['employee_id'])
+    else:
+        person = get_employee(st.session_state.selected_person)
+    if person is None:
+        # Removed by a newer employee extract since it was picked (or since the draft was saved)
+        st.error("❌ This employee is no longer in the employee data.")
+        st.session_state.selected_person = None
+        st.session_state.editing_successor_index = None
+        return
+    # Current option lists, as in the incumbent form
+    skills, ple_options, options = skills_list(), ple_list(), form_options()
+    
+    if is_editing:
         assessment = st.session_state.app_data['successors'][st.session_state.editing_successor_index]['assessment']
-        st.subheader(f"✏️ Edit: {person['PREFERRED_NAME_FIRST_NAME']} {person['PREFERRED_NAME_LAST_NAME']}")
+        st.subheader(f"✏️ Edit: {person.full_name}")
     else:
-        person = st.session_state.selected_person
         assessment = {} 
-        st.subheader(f"Add: {person['PREFERRED_NAME_FIRST_NAME']} {person['PREFERRED_NAME_LAST_NAME']}")
+        st.subheader(f"Add: {person.full_name}")
         
         # Try to get previous values for this person
-        previous_values = get_latest_successor_values(person['EMPLOYEE_ID'])
+        previous_values = get_latest_successor_values(person.EMPLOYEE_ID)
         if previous_values:
             st.info(f"💡 Found previous submission. Fields pre-filled with latest values.")
             assessment = previous_values
@@ -175,7 +198,7 @@ def display_successor_form():
     contract_end_date_val = datetime.datetime.strptime(contract_end_date_str, "%Y-%m-%d").date() if contract_end_date_str else None
     
     # Use session state to manage contract date clearing
-    contract_date_key = f"contract_date_{person['EMPLOYEE_ID']}_{is_editing}"
+    contract_date_key = f"contract_date_{person.EMPLOYEE_ID}_{is_editing}"
     if contract_date_key not in st.session_state:
         st.session_state[contract_date_key] = contract_end_date_val
     
@@ -195,13 +218,13 @@ def display_successor_form():
     contract_end_date = st.session_state[contract_date_key]
     
     # 2. Readiness Level
-    readiness_options = FORM_OPTIONS.get('readiness_level', ["-- Select an Option --", "Ready Now", "Ready Future"])
+    readiness_options = options.get('readiness_level', ["-- Select an Option --", "Ready Now", "Ready Future"])
     readiness = st.selectbox("Readiness Level:", readiness_options, index=readiness_options.index(assessment.get("readiness")) if assessment.get("readiness") in readiness_options else 0)
     
     # 3. Future Readiness Timing (optional) - Dynamic based on readiness
     future_readiness_timing = None
     if readiness == "Ready Future":
-        timing_options = FORM_OPTIONS.get('future_readiness_timing', ["-- Select an Option --", "+1 to < 2 years", "+2 to < 3 years", "+3 to < 5 years"])
+        timing_options = options.get('future_readiness_timing', ["-- Select an Option --", "+1 to < 2 years", "+2 to < 3 years", "+3 to < 5 years"])
         # Only preserve previous timing if readiness was already "Ready Future"
         previous_timing = assessment.get("future_readiness_timing") if assessment.get("readiness") == "Ready Future" else "-- Select an Option --"
         timing_index = timing_options.index(previous_timing) if previous_timing in timing_options else 0
@@ -211,16 +234,16 @@ def display_successor_form():
     strengths = st.text_area("Strengths:", value=assessment.get("strengths", ""))
     
     # 5. Top Demonstrated People Leader Expectations
-    top_ple = st.selectbox("Top Demonstrated People Leader Expectations:", PLE_LIST, index=PLE_LIST.index(assessment.get("top_ple")) if assessment.get("top_ple") in PLE_LIST else 0)
+    top_ple = st.selectbox("Top Demonstrated People Leader Expectations:", ple_options, index=ple_options.index(assessment.get("top_ple")) if assessment.get("top_ple") in ple_options else 0)
     
     # 6. Top Leadership Skills
     # Safety check for top_skills
     default_skills = assessment.get("top_skills", [])
     if isinstance(default_skills, str):
         default_skills = [skill.strip() for skill in default_skills.split(',') if skill.strip()]
-    valid_default_skills = [skill for skill in default_skills if skill in SKILLS_LIST]
+    valid_default_skills = [skill for skill in default_skills if skill in skills]
     
-    top_skills = st.multiselect("Top Leadership Skills (select three):", SKILLS_LIST, default=valid_default_skills, max_selections=3)
+    top_skills = st.multiselect("Top Leadership Skills (select three):", skills, default=valid_default_skills, max_selections=3)
     
     # 7. Development Focus & Opportunities
     development_focus = st.text_area("Development Focus & Opportunities:", value=assessment.get("development_focus", ""))
@@ -232,37 +255,33 @@ def display_successor_form():
     col1, col2 = st.columns(2)
     with col1:
         button_label = "Update Successor" if is_editing else "Add Successor"
-        if st.button(button_label, type="primary", use_container_width=True, key=f"submit_{person['EMPLOYEE_ID']}_{is_editing}"):
-            errors = []
-            if readiness == "-- Select an Option --": errors.append("Please select a Readiness Level.")
-            if not strengths: errors.append("Please enter Successor Strengths.")
-            if not top_skills: errors.append("Please select exactly 3 Top Leadership Skills for the Successor.")
-            elif len(top_skills) != 3: errors.append("Please select exactly 3 Top Leadership Skills for the Successor.")
-            if top_ple == "-- Select an Option --": errors.append("Please select a Top Demonstrated People Leader Expectation for the Successor.")
-            if not development_focus: errors.append("Please enter Development Focus & Opportunities.")
-            if not talent_actions: errors.append("Please enter Talent Development Actions.")
+        if st.button(button_label, type="primary", use_container_width=True, key=f"submit_{person.EMPLOYEE_ID}_{is_editing}"):
+            successor_data = {
+                "readiness": readiness,
+                "future_readiness_timing": future_readiness_timing if readiness == "Ready Future" and future_readiness_timing != "-- Select an Option --" else None,
+                "contract_end_date": contract_end_date.strftime("%Y-%m-%d") if contract_end_date else None,
+                "strengths": strengths,
+                "top_skills": top_skills,
+                "top_ple": top_ple,
+                "development_focus": development_focus,
+                "talent_actions": talent_actions
+            }
+            errors = validate_assessment(successor_data)
             
             if errors:
                 for error in errors:
                     st.error(error)
             else:
-                successor_data = {
-                    "readiness": readiness,
-                    "future_readiness_timing": future_readiness_timing if readiness == "Ready Future" and future_readiness_timing != "-- Select an Option --" else None,
-                    "contract_end_date": contract_end_date.strftime("%Y-%m-%d") if contract_end_date else None,
-                    "strengths": strengths,
-                    "top_skills": top_skills,
-                    "top_ple": top_ple,
-                    "development_focus": development_focus,
-                    "talent_actions": talent_actions
-                }
-                
                 if is_editing:
-                    st.session_state.app_data['successors'][st.session_state.editing_successor_index]['assessment'] = successor_data
-                    st.success(f"{person['PREFERRED_NAME_FIRST_NAME']}'s details have been updated.")
+                    index = st.session_state.editing_successor_index
+                    previous = st.session_state.app_data['successors'][index]['assessment']
+                    st.session_state.app_data['successors'][index]['assessment'] = successor_data
+                    record_draft('update_successor', index=index, changes=changed_fields(previous, successor_data))
+                    st.success(f"{person.PREFERRED_NAME_FIRST_NAME}'s details have been updated.")
                 else:
-                    st.session_state.app_data['successors'].append({"metadata": person, "assessment": successor_data})
-                    st.success(f"{person['PREFERRED_NAME_FIRST_NAME']} has been added as a successor.")
+                    st.session_state.app_data['successors'].append({"employee_id": person.EMPLOYEE_ID, "assessment": successor_data})
+                    record_draft('add_successor', employee_id=person.EMPLOYEE_ID, assessment=successor_data)
+                    st.success(f"{person.PREFERRED_NAME_FIRST_NAME} has been added as a successor.")
                 
                 # Clean up session state
                 if contract_date_key in st.session_state:
@@ -273,7 +292,7 @@ def display_successor_form():
                 st.rerun()
     
     with col2:
-        if st.button("Cancel", use_container_width=True, key=f"cancel_{person['EMPLOYEE_ID']}_{is_editing}"):
+        if st.button("Cancel", use_container_width=True, key=f"cancel_{person.EMPLOYEE_ID}_{is_editing}"):
             # Clean up session state
             if contract_date_key in st.session_state:
                 del st.session_state[contract_date_key]
@@ -0,0 +1,21 @@
+"""
+Slide preview component - what the generated deck will look like, before building it
+"""
+
+import streamlit as st
+from pptx.exc import PackageNotFoundError
+from pptx_gen.preview import get_plan_preview
+
+def display_plan_preview():
+    """Shows a PNG preview of each slide for the plan in progress."""
+    incumbent = st.session_state.app_data['incumbent']
+    successors = st.session_state.app_data['successors']
+    with st.expander("🖼️ Slide Preview", expanded=True):
+        try:
+            slides = get_plan_preview(incumbent, successors)
+        except (FileNotFoundError, PackageNotFoundError) as e:
+            # No template on this server; anything else is a rendering bug and should surface
+            st.warning(f"⚠️ Preview unavailable: {e}")
+            return
+        for number, png in enumerate(slides, 1):
+            st.image(png, caption=f"Slide {number} of {len(slides)}" if len(slides) > 1 else None)
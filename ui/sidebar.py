@@ -3,6 +3,8 @@ Sidebar display components
 """
 
 import streamlit as st
+from database.operations import get_employee
+from utils.helpers import display_name
 
 def display_sidebar_summary():
     """Displays a summary of the current plan in the sidebar."""
@@ -10,8 +12,8 @@ def display_sidebar_summary():
         st.sidebar.divider()
         st.sidebar.subheader("Plan Summary")
 
-        incumbent_meta = st.session_state.app_data['incumbent']['metadata']
-        incumbent_name = f"{incumbent_meta['PREFERRED_NAME_FIRST_NAME']} {incumbent_meta['PREFERRED_NAME_LAST_NAME']}"
+        incumbent_id = st.session_state.app_data['incumbent']['employee_id']
+        incumbent_name = display_name(get_employee(incumbent_id), incumbent_id)
         st.sidebar.markdown("💼 **Incumbent**")
         st.sidebar.markdown(f'<div class="name-card-sidebar">{incumbent_name}</div>', unsafe_allow_html=True)
 
@@ -19,8 +21,7 @@ def display_sidebar_summary():
         successors = st.session_state.app_data['successors']
         if successors:
             for succ in successors:
-                succ_meta = succ['metadata']
-                succ_name = f"{succ_meta['PREFERRED_NAME_FIRST_NAME']} {succ_meta['PREFERRED_NAME_LAST_NAME']}"
+                succ_name = display_name(get_employee(succ['employee_id']), succ['employee_id'])
                 st.sidebar.markdown(f'<div class="name-card-sidebar">{succ_name}</div>', unsafe_allow_html=True)
         else:
             st.sidebar.caption("No successors added yet.")
@@ -2,16 +2,58 @@
 Helper functions from app_final.py
 """
 
+import uuid
 import streamlit as st
 from streamlit.components.v1 import html
+from config.loader import CONFIG
+from database.operations import get_employee, get_draft_journal
+from database.records import employee_to_dict
 
 def force_page_reload():
     """Forces a full browser reload of the page using an HTML trick."""
     html_code = '<img src="non-existent-image.png" onerror="window.parent.location.reload()">'
     html(html_code, height=0, width=0)
 
+def draft_key():
+    """Draft journal key: the signed-in user when a user header is configured, else the ?draft= URL token"""
+    user_header = CONFIG['drafts'].get('user_header')
+    user = st.context.headers.get(user_header) if user_header else None
+    if user:
+        return f"user:{user}"
+    token = st.query_params.get("draft")
+    if not token:
+        token = uuid.uuid4().hex
+        st.query_params["draft"] = token
+    return f"session:{token}"
+
+def record_draft(op, **payload):
+    """Journal one form commit for the current draft (see database.drafts for the ops)"""
+    try:
+        get_draft_journal().append(draft_key(), op, payload)
+    except Exception as e:
+        print(f"❌ Draft journal write failed: {e}")
+
+def discard_draft():
+    """Forget the current draft (Start Over)"""
+    try:
+        get_draft_journal().discard(draft_key())
+    except Exception as e:
+        print(f"❌ Draft journal discard failed: {e}")
+
+def _restore_draft():
+    try:
+        return get_draft_journal().load(draft_key())
+    except Exception as e:
+        print(f"❌ Draft journal restore failed: {e}")
+        return None
+
 def initialize_state():
-    """Initializes session state variables if they don't exist."""
+    """Initializes session state variables if they don't exist; a new session picks up its saved draft."""
+    if "app_data" not in st.session_state:
+        restored = _restore_draft()
+        if restored:
+            st.session_state.app_data = restored
+            st.toast("Restored your unsaved plan.", icon="📝")
     defaults = {
         "app_data": {"incumbent": None, "successors": []},
         "selected_person": None,
@@ -22,3 +64,26 @@ def initialize_state():
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
+
+def display_name(person, employee_id):
+    """Full name, or a label for an id the current employee data no longer has (e.g. in a restored draft)"""
+    return person.full_name if person else f"Unknown employee ({employee_id})"
+
+def missing_employee_ids(app_data):
+    """Ids in the plan that are no longer in the employee data, incumbent first"""
+    people = ([app_data['incumbent']] if app_data['incumbent'] else []) + app_data['successors']
+    return [person['employee_id'] for person in people if get_employee(person['employee_id']) is None]
+
+def export_app_data(app_data):
+    """Expands the employee ids held in app_data into full metadata for JSON download."""
+    incumbent = app_data['incumbent']
+    return {
+        "incumbent": {
+            "metadata": employee_to_dict(get_employee(incumbent['employee_id'])),
+            "plan_details": incumbent['plan_details']
+        } if incumbent else None,
+        "successors": [
+            {"metadata": employee_to_dict(get_employee(succ['employee_id'])), "assessment": succ['assessment']}
+            for succ in app_data['successors']
+        ]
+    }
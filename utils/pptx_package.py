@@ -0,0 +1,143 @@
+"""
+PowerPoint packaging - rewrite a finished .pptx archive in one pass with tuned compression
+
+python-pptx and the repair functions deflate every part at default settings, including media
+that is already compressed. This pass rewrites the archive so that:
+  - media in powerpoint.packaging.store_extensions (PNG, JPEG, ...) is stored, not re-deflated
+  - XML and other parts are deflated at powerpoint.packaging.compress_level
+  - relationships of explicitly referenced types (images, media, hyperlinks, ...) that no r:
+    attribute in their source part uses are removed, and parts no relationship reaches are
+    dropped along with their [Content_Types].xml overrides
+  - entries are written in a fixed order with fixed timestamps and attributes, so the same
+    deck always produces the same bytes
+"""
+
+import io
+import posixpath
+import re
+import zipfile
+from lxml import etree
+from config.loader import CONFIG
+
+CONTENT_TYPES = '[Content_Types].xml'
+ROOT_RELS = '_rels/.rels'
+RELS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+CONTENT_TYPES_NS = 'http://schemas.openxmlformats.org/package/2006/content-types'
+OFFICE_RELS_NS = b'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+# Relationship types that are only ever used through an r:id / r:embed / r:link in the source part
+# (layouts, masters, themes and properties are implied and always kept)
+EXPLICIT_REL_TYPES = ('/image', '/media', '/video', '/audio', '/hyperlink', '/oleObject', '/chart', '/package')
+
+# Every entry gets the same timestamp and attributes so output is byte-stable
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+def _rels_name(part_name):
+    directory, name = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', f"{name}.rels")
+
+def _resolve(part_name, target):
+    """Archive name of a relationship target relative to its source part"""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part_name), target))
+
+def _referenced_ids(xml):
+    """Values of every attribute in the relationships namespace (r:id, r:embed, r:link, ...)"""
+    ids = set()
+    for prefix in re.findall(rb'xmlns:(\w+)="' + re.escape(OFFICE_RELS_NS) + b'"', xml):
+        ids.update(value.decode('utf-8') for value in re.findall(rb'\b' + prefix + rb':\w+="([^"]*)"', xml))
+    return ids
+
+def _serialize(root):
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+def _plan_parts(archive, names, strip_unused):
+    """Walk relationships from the package root
+
+    Returns (kept part names, {rels name: rewritten bytes}) - rels files are only rewritten
+    when a relationship was removed.
+    """
+    rewritten = {}
+    if not strip_unused:
+        return set(names), rewritten
+    kept = {CONTENT_TYPES, ROOT_RELS}
+    pending = [('', ROOT_RELS)]
+    while pending:
+        part_name, rels_name = pending.pop()
+        root = etree.fromstring(archive.read(rels_name))
+        used = _referenced_ids(archive.read(part_name)) if part_name else None
+        removed = False
+        for relationship in list(root):
+            if relationship.get('TargetMode') == 'External':
+                target = None
+            else:
+                target = _resolve(part_name, relationship.get('Target'))
+            if used is not None and relationship.get('Type', '').endswith(EXPLICIT_REL_TYPES) and relationship.get('Id') not in used:
+                root.remove(relationship)
+                removed = True
+                continue
+            if target and target in names and target not in kept:
+                kept.add(target)
+                target_rels = _rels_name(target)
+                if target_rels in names:
+                    kept.add(target_rels)
+                    pending.append((target, target_rels))
+        if removed:
+            rewritten[rels_name] = _serialize(root)
+    return kept, rewritten
+
+def _content_types(data, kept):
+    """[Content_Types].xml without overrides for dropped parts (None when unchanged)"""
+    root = etree.fromstring(data)
+    removed = False
+    for override in root.findall(f'{{{CONTENT_TYPES_NS}}}Override'):
+        if override.get('PartName', '').lstrip('/') not in kept:
+            root.remove(override)
+            removed = True
+    return _serialize(root) if removed else None
+
+def package_pptx(pptx_buffer):
+    """Rewrite a .pptx buffer with the configured packaging; returns a new BytesIO
+
+    Falls back to the original buffer if the archive cannot be processed.
+    """
+    settings = CONFIG['powerpoint']['packaging']
+    store_extensions = {extension.lower().lstrip('.') for extension in settings['store_extensions']}
+    try:
+        pptx_buffer.seek(0)
+        source = pptx_buffer.getvalue()
+        with zipfile.ZipFile(io.BytesIO(source)) as archive:
+            # A name written twice resolves to its last entry, as when the archive is read
+            entries = {info.filename: info for info in archive.infolist()}
+            names = set(entries)
+            kept, rewritten = _plan_parts(archive, names, settings['strip_unused'])
+            if CONTENT_TYPES in kept:
+                content_types = _content_types(archive.read(entries[CONTENT_TYPES]), kept)
+                if content_types is not None:
+                    rewritten[CONTENT_TYPES] = content_types
+
+            # [Content_Types].xml first, as Office writes it, then the rest by name
+            order = [CONTENT_TYPES] + sorted(name for name in kept if name != CONTENT_TYPES and name in names)
+            output = io.BytesIO()
+            with zipfile.ZipFile(output, 'w') as packaged:
+                for name in order:
+                    data = rewritten[name] if name in rewritten else archive.read(entries[name])
+                    info = zipfile.ZipInfo(name, date_time=FIXED_DATE_TIME)
+                    info.create_system = 0
+                    info.external_attr = 0
+                    if posixpath.splitext(name)[1].lower().lstrip('.') in store_extensions:
+                        packaged.writestr(info, data, compress_type=zipfile.ZIP_STORED)
+                    else:
+                        packaged.writestr(
+                            info, data, compress_type=zipfile.ZIP_DEFLATED, compresslevel=settings['compress_level']
+                        )
+        dropped = len(names) - len(order)
+        print(f"📦 Packaged deck: {len(source):,} -> {output.tell():,} bytes"
+              f"{f', {dropped} unused part(s) removed' if dropped else ''}")
+        output.seek(0)
+        return output
+    except (zipfile.BadZipFile, KeyError, etree.XMLSyntaxError) as e:
+        print(f"❌ PowerPoint packaging failed: {e}")
+        pptx_buffer.seek(0)
+        return pptx_buffer
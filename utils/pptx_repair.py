@@ -6,6 +6,8 @@ import io
 from pptx import Presentation
 import tempfile
 import os
+from config.loader import CONFIG
+from utils.pptx_package import package_pptx
 
 def repair_pptx_buffer(pptx_buffer):
     """
@@ -185,12 +187,17 @@ def auto_repair_pptx(pptx_buffer, method="standard"):
         method: "standard", "temp_file", or "deep_clean"
     
     Returns:
-        Repaired BytesIO buffer
+        Repaired (and packaged, if powerpoint.packaging.enabled) BytesIO buffer
     """
     
     if method == "temp_file":
-        return repair_pptx_with_temp_file(pptx_buffer)
+        repaired_buffer = repair_pptx_with_temp_file(pptx_buffer)
     elif method == "deep_clean":
-        return repair_pptx_deep_clean(pptx_buffer)
+        repaired_buffer = repair_pptx_deep_clean(pptx_buffer)
     else:
-        return repair_pptx_buffer(pptx_buffer)
+        repaired_buffer = repair_pptx_buffer(pptx_buffer)
+    
+    # Every repair re-saves with default compression - finish with the packaging pass
+    if CONFIG['powerpoint']['packaging'].get('enabled', True):
+        return package_pptx(repaired_buffer)
+    return repaired_buffer
@@ -0,0 +1,62 @@
+"""
+Name matching helpers - normalization, Soundex keys and bounded edit distance
+"""
+
+import unicodedata
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys('bfpv', '1'),
+    **dict.fromkeys('cgjkqsxz', '2'),
+    **dict.fromkeys('dt', '3'),
+    'l': '4',
+    **dict.fromkeys('mn', '5'),
+    'r': '6',
+}
+
+def normalize_name(name):
+    """Lowercase, strip diacritics and drop everything but letters and digits ('O’Brién' -> 'obrien')"""
+    if not name:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(ch for ch in decomposed if ch.isalnum() and not unicodedata.combining(ch)).lower()
+
+def soundex(name):
+    """American Soundex key ('MacDonald' and 'Mcdonald' -> 'M235', 'Jon' and 'John' -> 'J500')"""
+    name = ''.join(ch for ch in normalize_name(name) if ch.isalpha())
+    if not name:
+        return ''
+    first = name[0]
+    digits = []
+    previous = _SOUNDEX_CODES.get(first, '')
+    for ch in name[1:]:
+        code = _SOUNDEX_CODES.get(ch, '')
+        if code and code != previous:
+            digits.append(code)
+            if len(digits) == 3:
+                break
+        # 'h' and 'w' do not separate letters with the same code; vowels do
+        if ch not in 'hw':
+            previous = code
+    return (first.upper() + ''.join(digits)).ljust(4, '0')
+
+def bounded_edit_distance(a, b, max_distance):
+    """Levenshtein distance, or max_distance + 1 as soon as the bound is exceeded"""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for i, ch_b in enumerate(b, 1):
+        current = [i]
+        row_min = i
+        for j, ch_a in enumerate(a, 1):
+            cost = previous[j - 1] + (ch_a != ch_b)
+            value = min(previous[j] + 1, current[j - 1] + 1, cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
@@ -0,0 +1,60 @@
+"""
+Plan validation rules - shared by the entry forms and the bulk plan importer
+"""
+
+from config.loader import CONFIG, skills_list, ple_list, form_options
+
+SELECT_PLACEHOLDER = "-- Select an Option --"
+
+def _skill_errors(top_skills, subject=""):
+    required = CONFIG.get('validation', {}).get('max_skills_selection', 3)
+    if not isinstance(top_skills, list) or len(top_skills) != required:
+        return [f"Please select exactly {required} Top Leadership Skills{subject}."]
+    unknown = [skill for skill in top_skills if skill not in skills_list()]
+    if unknown:
+        return [f"Unknown Top Leadership Skills{subject}: {', '.join(map(str, unknown))}."]
+    return []
+
+def _ple_missing(top_ple):
+    return not isinstance(top_ple, str) or top_ple == SELECT_PLACEHOLDER or top_ple not in ple_list()
+
+def _sourcing_errors(sourcing_strategy):
+    if not isinstance(sourcing_strategy, list) or not sourcing_strategy:
+        return ["Please select at least one Talent Sourcing Strategy."]
+    options = form_options().get('sourcing_strategy', ["Build (Internal hire)", "External"])
+    unknown = [strategy for strategy in sourcing_strategy if strategy not in options]
+    if unknown:
+        return [f"Unknown Talent Sourcing Strategy: {', '.join(map(str, unknown))}."]
+    return []
+
+def validate_plan_details(plan_details):
+    """Error messages for an incumbent plan_details dict (empty list when valid)"""
+    if not isinstance(plan_details, dict):
+        return ["Plan details are missing."]
+    errors = []
+    if plan_details.get("critical_role") is None: errors.append("Please select if this is a Critical Role.")
+    if not plan_details.get("responsibilities"): errors.append("Please enter Role Responsibilities.")
+    errors.extend(_skill_errors(plan_details.get("top_skills")))
+    if _ple_missing(plan_details.get("top_ple")):
+        errors.append("Please select a Top Demonstrated People Leader Expectation.")
+    errors.extend(_sourcing_errors(plan_details.get("sourcing_strategy")))
+    scenario_options = form_options().get('scenario_plan', [SELECT_PLACEHOLDER, "Direct Backfill", "Split Position/New Position"])
+    if plan_details.get("scenario_plan") in (None, SELECT_PLACEHOLDER) or plan_details.get("scenario_plan") not in scenario_options:
+        errors.append("Please select a Scenario Plan.")
+    return errors
+
+def validate_assessment(assessment):
+    """Error messages for a successor assessment dict (empty list when valid)"""
+    if not isinstance(assessment, dict):
+        return ["Successor assessment is missing."]
+    errors = []
+    readiness_options = form_options().get('readiness_level', [SELECT_PLACEHOLDER, "Ready Now", "Ready Future"])
+    if assessment.get("readiness") in (None, SELECT_PLACEHOLDER) or assessment.get("readiness") not in readiness_options:
+        errors.append("Please select a Readiness Level.")
+    if not assessment.get("strengths"): errors.append("Please enter Successor Strengths.")
+    errors.extend(_skill_errors(assessment.get("top_skills"), " for the Successor"))
+    if _ple_missing(assessment.get("top_ple")):
+        errors.append("Please select a Top Demonstrated People Leader Expectation for the Successor.")
+    if not assessment.get("development_focus"): errors.append("Please enter Development Focus & Opportunities.")
+    if not assessment.get("talent_actions"): errors.append("Please enter Talent Development Actions.")
+    return errors